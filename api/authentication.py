@@ -7,6 +7,8 @@ from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from rest_framework.request import Request
 
+from authentication.credentials import get_request_api_key, verify_api_key
+
 if TYPE_CHECKING:  # pragma: no cover
     # Python doesn't have great handling of circular imports for type checking
     # purposes. Because View is only required for type checking, we can lock
@@ -38,16 +40,11 @@ class AdminApiKeyCustomCheck(rfperms.BasePermission):
 
         if not isinstance(request.user, AnonymousUser):
             if request.user.api_key:
-                # Retrieve the contents of the "Authorization" key from either
-                # the META or the headers of the request.
-                request_key = request.META.get(
-                    "Authorization", request.headers.get("Authorization", "").split()
-                )
-                if len(request_key) >= 2:
+                # Retrieve the key from the "Authorization" header of the request.
+                if request_key := get_request_api_key(request):
                     return all(
                         [
-                            request_key[0] == "Api-Key",
-                            request.user.api_key.is_valid(request_key[1]),
+                            verify_api_key(request.user.api_key, request_key),
                             request.user.is_grafeas_staff or request.user.is_staff,
                         ]
                     )
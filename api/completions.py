@@ -0,0 +1,230 @@
+"""
+Statistics about completed submissions, served from the completion rollups.
+
+Every completed submission is counted in exactly one `CompletionRollup` bucket,
+keyed by the completing user, the source and the hour of completion. Queries
+over a time range read the buckets that are fully covered by the range and
+only fall back to the raw submissions for the (at most two) partially covered
+hours at its edges. Their cost therefore depends on the number of buckets, not
+on the number of submissions.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Expression, Q, QuerySet, Sum
+from django.db.models.functions import TruncHour
+from django.utils.timezone import is_naive, make_aware
+
+from api.models import CompletionKey, CompletionRollup, Submission, truncate_to_hour
+
+# A time bound of a range, with whether the bound itself is included.
+TimeBound = Tuple[datetime, bool]
+# Builds the annotations to group by, given the name of the time field.
+GroupBy = Callable[[str], Dict[str, Expression]]
+
+HOUR = timedelta(hours=1)
+RESOLUTION = timedelta(microseconds=1)
+BULK_CREATE_BATCH_SIZE = 1000
+
+
+def _as_aware(time: datetime) -> datetime:
+    """Treat naive times as UTC, just like the database does."""
+    return make_aware(time, dt_timezone.utc) if is_naive(time) else time
+
+
+def _first_full_bucket(lower: TimeBound) -> datetime:
+    """Get the first bucket that is entirely above the lower bound."""
+    time, inclusive = lower
+    time = _as_aware(time if inclusive else time + RESOLUTION)
+    start = truncate_to_hour(time)
+    return start if start >= time else start + HOUR
+
+
+def _end_of_full_buckets(upper: TimeBound) -> datetime:
+    """Get the end of the last bucket that is entirely below the upper bound."""
+    time, inclusive = upper
+    return truncate_to_hour(time + RESOLUTION if inclusive else time)
+
+
+def _split_querysets(
+    completed_by: Optional[int],
+    source: Optional[str],
+    lower: Optional[TimeBound],
+    upper: Optional[TimeBound],
+) -> Tuple[QuerySet, QuerySet]:
+    """Split the requested completions into full buckets and raw edge submissions.
+
+    :return: the rollups of the full buckets and the submissions that are not
+        covered by them.
+    """
+    rollups = CompletionRollup.objects.all()
+    submissions = Submission.objects.filter(
+        completed_by__isnull=False, complete_time__isnull=False
+    )
+    if completed_by is not None:
+        rollups = rollups.filter(user_id=completed_by)
+        submissions = submissions.filter(completed_by_id=completed_by)
+    if source is not None:
+        rollups = rollups.filter(source_id=source)
+        submissions = submissions.filter(source_id=source)
+
+    if lower is not None:
+        lookup = "complete_time__gte" if lower[1] else "complete_time__gt"
+        submissions = submissions.filter(**{lookup: lower[0]})
+    if upper is not None:
+        lookup = "complete_time__lte" if upper[1] else "complete_time__lt"
+        submissions = submissions.filter(**{lookup: upper[0]})
+
+    start = _first_full_bucket(lower) if lower is not None else None
+    end = _end_of_full_buckets(upper) if upper is not None else None
+    if start is not None and end is not None and start >= end:
+        # The range does not cover a single full hour
+        return rollups.none(), submissions
+
+    edges = Q()
+    if start is not None:
+        rollups = rollups.filter(bucket_start__gte=start)
+        edges |= Q(complete_time__lt=start)
+    if end is not None:
+        rollups = rollups.filter(bucket_start__lt=end)
+        edges |= Q(complete_time__gte=end)
+
+    return rollups, submissions.filter(edges) if edges else submissions.none()
+
+
+def count_completions(
+    *,
+    completed_by: Optional[int] = None,
+    source: Optional[str] = None,
+    lower: Optional[TimeBound] = None,
+    upper: Optional[TimeBound] = None,
+) -> int:
+    """Count the completed submissions matching the given filters.
+
+    :param completed_by: The ID of the user who completed the submissions.
+    :param source: The name of the source of the submissions.
+    :param lower: The lower bound of the completion time.
+    :param upper: The upper bound of the completion time.
+    """
+    rollups, submissions = _split_querysets(completed_by, source, lower, upper)
+    from_rollups = rollups.aggregate(total=Sum("count"))["total"] or 0
+    return from_rollups + submissions.count()
+
+
+def count_completions_by(
+    group_by: GroupBy,
+    *,
+    completed_by: Optional[int] = None,
+    source: Optional[str] = None,
+    lower: Optional[TimeBound] = None,
+    upper: Optional[TimeBound] = None,
+) -> List[Dict[str, Any]]:
+    """Count the completed submissions matching the given filters per group.
+
+    The groups are defined by `group_by`, which is called with the name of the
+    time field to build the annotations from. For example, passing
+    `lambda field: {"date": TruncDay(field)}` counts the completions per day.
+    The groups must not be finer than an hour.
+
+    :return: one dictionary per group with its keys and its "count", ordered
+        by the keys of the groups.
+    """
+    rollups, submissions = _split_querysets(completed_by, source, lower, upper)
+
+    counts = defaultdict(int)
+    for queryset, time_field, total in [
+        (rollups, "bucket_start", Sum("count")),
+        (submissions, "complete_time", Count("id")),
+    ]:
+        annotations = group_by(time_field)
+        rows = (
+            queryset.annotate(**annotations)
+            .values(*annotations)
+            .annotate(total=total)
+            .order_by()
+        )
+        for row in rows:
+            counts[tuple(row[name] for name in annotations)] += row["total"]
+
+    names = list(group_by("complete_time"))
+    return [
+        {**dict(zip(names, key)), "count": count}
+        for key, count in sorted(counts.items())
+        if count > 0
+    ]
+
+
+def _count_raw_buckets(submissions: QuerySet) -> Iterable[Tuple[CompletionKey, int]]:
+    """Count the given submissions per rollup bucket, straight from the table."""
+    rows = (
+        submissions.filter(completed_by__isnull=False, complete_time__isnull=False)
+        .annotate(bucket_start=TruncHour("complete_time", tzinfo=dt_timezone.utc))
+        .values("completed_by", "source", "bucket_start")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    for row in rows.iterator():
+        yield (row["completed_by"], row["source"], row["bucket_start"]), row["total"]
+
+
+def rebuild_completion_rollups(user_ids: Optional[List[int]] = None) -> int:
+    """Rebuild the completion rollups from the submissions.
+
+    :param user_ids: The users to rebuild the rollups for. Defaults to all users.
+    :return: The number of buckets that have been created.
+    """
+    # prevent circular import
+    from api.leaderboard import invalidate_leaderboards
+
+    rollups = CompletionRollup.objects.all()
+    submissions = Submission.objects.all()
+    if user_ids is not None:
+        rollups = rollups.filter(user_id__in=user_ids)
+        submissions = submissions.filter(completed_by_id__in=user_ids)
+
+    buckets = (
+        CompletionRollup(
+            user_id=user_id, source_id=source_id, bucket_start=start, count=count
+        )
+        for (user_id, source_id, start), count in _count_raw_buckets(submissions)
+    )
+    created = 0
+    with transaction.atomic():
+        rollups.delete()
+        while batch := list(islice(buckets, BULK_CREATE_BATCH_SIZE)):
+            CompletionRollup.objects.bulk_create(batch)
+            created += len(batch)
+        invalidate_leaderboards()
+
+    return created
+
+
+def find_rollup_drift(
+    user_ids: Optional[List[int]] = None,
+) -> List[Tuple[CompletionKey, int, int]]:
+    """Compare the completion rollups against the submissions.
+
+    :param user_ids: The users to check the rollups of. Defaults to all users.
+    :return: the buckets that are out of sync, with the number of submissions
+        and the count in the rollup.
+    """
+    rollups = CompletionRollup.objects.all()
+    submissions = Submission.objects.all()
+    if user_ids is not None:
+        rollups = rollups.filter(user_id__in=user_ids)
+        submissions = submissions.filter(completed_by_id__in=user_ids)
+
+    expected = dict(_count_raw_buckets(submissions))
+    actual = {
+        (rollup.user_id, rollup.source_id, rollup.bucket_start): rollup.count
+        for rollup in rollups.iterator()
+    }
+    return [
+        (key, expected.get(key, 0), actual.get(key, 0))
+        for key in sorted(expected.keys() | actual.keys())
+        if expected.get(key, 0) != actual.get(key, 0)
+    ]
@@ -1,13 +1,27 @@
-import threading
 from functools import wraps
-from typing import Any, Callable, Dict, Set, Tuple, Union
+from typing import Any, Callable, Dict, List, Set, Tuple, Union
 
 import pytz
+from django.conf import settings
+from django.db import connections
+from django.db.models import Model, QuerySet
+from django.db.models.sql import UpdateQuery
+from django.http import Http404
 from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from api.models import Source, get_source
+from utils.workers import WorkerPool
+
+# The threads that run the functions decorated with `fire_and_forget`
+executor = WorkerPool(
+    name="fire-and-forget",
+    size=settings.FIRE_AND_FORGET_POOL_SIZE,
+    max_queue_size=settings.FIRE_AND_FORGET_QUEUE_SIZE,
+)
+
 
 def _retrieve_keys(data: Dict, keys: Set, name: str) -> Dict[str, str]:
     """
@@ -92,12 +106,13 @@ def fire_and_forget(
     func: Callable[[Any], Any], *args: Tuple, **kwargs: Dict
 ) -> Callable[[Any], Any]:
     """
-    Decorate functions to build a thread for a given function and trigger it.
+    Decorate functions to run them in the background and move on right away.
 
-    Originally from https://stackoverflow.com/a/59043636, this function
-    prepares a thread for a given function and then starts it, intentionally
-    severing communication with the thread so that we can continue moving
-    on.
+    Originally from https://stackoverflow.com/a/59043636, this function hands
+    the given function to a shared pool of threads, intentionally severing
+    communication with it so that we can continue moving on. The pool caps
+    the number of threads and database connections, no matter how many calls
+    come in at once; the rest wait in its queue.
 
     This should be used sparingly and only when we are 100% sure that
     the function we are passing does not need to communicate with the main
@@ -105,7 +120,46 @@ def fire_and_forget(
     care).
     """
 
+    @wraps(func)
     def wrapped(*args: Tuple, **kwargs: Dict) -> None:
-        threading.Thread(target=func, args=(args), kwargs=kwargs).start()
+        executor.submit(func, *args, **kwargs)
 
     return wrapped
+
+
+def get_source_or_404(name: str) -> Source:
+    """
+    Get the source with the given name from the registry, like get_object_or_404.
+
+    :param name: the name of the source
+    :return: the source with the given name
+    :raise Http404: when the source does not exist
+    """
+    try:
+        return get_source(name)
+    except Source.DoesNotExist:
+        raise Http404("No Source matches the given query.")
+
+
+def update_returning(queryset: QuerySet, **values: Any) -> List[Model]:  # noqa: ANN401
+    """
+    Update the rows of the queryset and load them in the same statement.
+
+    This is like `queryset.update(**values)`, but appends a RETURNING clause,
+    so that the updated rows do not have to be loaded again afterwards. It is
+    only supported by PostgreSQL and SQLite 3.35 or newer.
+
+    :param queryset: the rows to update
+    :param values: the new values of the fields, by their name
+    :return: the updated rows, as they are after the update
+    """
+    query = queryset.query.chain(UpdateQuery)
+    query.add_update_values(values)
+    connection = connections[queryset.db]
+    sql, params = query.get_compiler(connection=connection).as_sql()
+    columns = ", ".join(
+        connection.ops.quote_name(field.column)
+        for field in queryset.model._meta.concrete_fields
+    )
+    manager = queryset.model._default_manager.db_manager(queryset.db)
+    return list(manager.raw(f"{sql} RETURNING {columns}", params))
@@ -0,0 +1,168 @@
+"""
+Creation of many submissions at once.
+
+The bots sweep entire subreddits, so most of the posts they send are already
+known. Instead of checking and creating the posts one by one, a batch is
+compared to the existing submissions with a single query and the new ones are
+inserted with another. Their OCR is queued as jobs rather than run inline.
+
+Ingesting the same batch again creates nothing new, so a bot can simply retry
+a request that failed halfway. Every creation of submissions locks their source
+first, see `lock_source`, so that none of them can slip in between the check
+for the existing submissions and the insertion of the new ones.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Q, QuerySet
+
+from api.models import Source, Submission
+from ocr.jobs import enqueue_ocr_jobs
+
+# The results of the submissions of an ingestion
+CREATED = "created"
+EXISTS = "exists"
+
+# The text fields that can be set when ingesting a submission
+TEXT_FIELDS = ["original_id", "url", "tor_url", "content_url", "title"]
+# The flags that can be set when ingesting a submission
+FLAG_FIELDS = ["cannot_ocr", "nsfw"]
+# The number of values that are looked up with a single query
+LOOKUP_CHUNK_SIZE = 500
+
+
+def parse_submission(data: Any) -> Optional[Dict[str, Any]]:  # noqa: ANN401
+    """Get the fields of a submission to ingest from the request data.
+
+    Like for the creation of a single submission, the original ID and the
+    content URL are required.
+
+    :param data: the submission in the request data
+    :return: the fields of the submission, or None if the data is invalid
+    """
+    if not isinstance(data, dict):
+        return None
+    if not data.get("original_id") or not data.get("content_url"):
+        return None
+
+    fields = {}
+    for name in TEXT_FIELDS:
+        value = data.get(name)
+        max_length = Submission._meta.get_field(name).max_length
+        if value is not None and (
+            not isinstance(value, str) or len(value) > max_length
+        ):
+            return None
+        fields[name] = value
+    for name in FLAG_FIELDS:
+        # Form data sends the flags as strings
+        fields[name] = data.get(name, False) in (True, "True")
+    return fields
+
+
+def lock_source(source: Source) -> None:
+    """Wait for the other creations of submissions in the source to finish.
+
+    This has to be called in a transaction, the lock is held until it ends.
+    A unique constraint is not used instead, as the submissions created one by
+    one have never been deduplicated, so the existing ones can violate it.
+
+    :param source: the source to create submissions in
+    """
+    Source.objects.select_for_update().get(pk=source.pk)
+
+
+def find_new(queryset: QuerySet, field: str, values: List[str]) -> List[str]:
+    """Find the values of the field that no submission of the queryset has.
+
+    The values are looked up in chunks, so that the queries stay small no
+    matter how many values there are.
+
+    :param queryset: the submissions to compare the values to
+    :param field: the field to compare the values to, e.g. "url"
+    :param values: the values to look for
+    :return: the new values without duplicates, in the given order
+    """
+    unique = list(dict.fromkeys(values))
+    known = set()
+    for start in range(0, len(unique), LOOKUP_CHUNK_SIZE):
+        chunk = unique[start : start + LOOKUP_CHUNK_SIZE]
+        known.update(
+            queryset.filter(**{f"{field}__in": chunk})
+            .order_by()
+            .values_list(field, flat=True)
+        )
+    return [value for value in unique if value not in known]
+
+
+def ingest_submissions(
+    source: Source, submissions: List[Dict[str, Any]]
+) -> List[Tuple[int, str]]:
+    """Create the given submissions, skipping the ones that already exist.
+
+    A submission already exists if there is one with the same original ID in
+    the source or one with the same URL. Duplicates within the batch are only
+    created once.
+
+    :param source: the source of the submissions
+    :param submissions: the fields of the submissions, see `parse_submission`
+    :return: the ID and the result of every submission, in the given order
+    """
+    original_ids = {fields["original_id"] for fields in submissions}
+    urls = {fields["url"] for fields in submissions if fields["url"]}
+
+    with transaction.atomic():
+        # Concurrent ingestions of the same source wait for each other, so
+        # that they cannot both create the same submission
+        lock_source(source)
+
+        existing = Submission.objects.filter(
+            Q(source=source, original_id__in=original_ids) | Q(url__in=urls)
+        ).values_list("id", "source_id", "original_id", "url")
+        by_original_id = {
+            original_id: submission_id
+            for submission_id, source_id, original_id, _ in existing
+            if source_id == source.pk
+        }
+        by_url = {url: submission_id for submission_id, _, _, url in existing if url}
+
+        new: Dict[str, Submission] = {}
+        new_urls = set()
+        new_indices = set()
+        for index, fields in enumerate(submissions):
+            if (
+                fields["original_id"] in by_original_id
+                or fields["original_id"] in new
+                or fields["url"] in by_url
+                or fields["url"] in new_urls
+            ):
+                continue
+            submission = Submission(source=source, **fields)
+            # The creation in bulk does not call `save`
+            submission.update_parsed_fields()
+            new[fields["original_id"]] = submission
+            if fields["url"]:
+                new_urls.add(fields["url"])
+            new_indices.add(index)
+
+        # The IDs are not set by every database, so only the IDs of the
+        # created submissions are looked up again
+        Submission.objects.bulk_create(new.values())
+        created = Submission.objects.filter(
+            source=source, original_id__in=new
+        ).values_list("id", "original_id")
+        for submission_id, original_id in created:
+            submission = new[original_id]
+            submission.id = submission_id
+            by_original_id[original_id] = submission_id
+            if submission.url:
+                by_url[submission.url] = submission_id
+        enqueue_ocr_jobs(new.values())
+
+    return [
+        (
+            by_original_id.get(fields["original_id"]) or by_url[fields["url"]],
+            CREATED if index in new_indices else EXISTS,
+        )
+        for index, fields in enumerate(submissions)
+    ]
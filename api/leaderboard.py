@@ -0,0 +1,317 @@
+"""
+Rankings of the volunteers by their gamma.
+
+Volunteers are ranked by their gamma, then by the date they joined (newest
+first) and finally by their ID, so that every entry has a unique position.
+The neighbours of a volunteer are read with a keyset query starting at their
+position. For the all-time ranking this is answered from the index on the
+denormalized gamma counter, which is kept up to date whenever a submission is
+completed or reverted.
+
+On PostgreSQL, the rank of a volunteer is numbered with the `RANK()` window
+function in a single pass over the ranking. Other databases, i.e. SQLite
+locally and in the tests, count the entries ranked ahead of the volunteer
+instead, which takes time in proportion to the rank.
+
+The named leaderboards (all-time, monthly and weekly, optionally limited to a
+source) are computed from the gamma counters and the completion rollups and
+are cached as a whole, so that reading them does not touch the submissions.
+They are kept in the cache shared by all worker processes, under a version
+that is replaced whenever the gamma of any volunteer changes, which
+invalidates all of them at once. The `precompute_leaderboards` command
+computes them again in the background, so that requests rarely have to.
+"""
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Type
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.db.models import Count, F, OuterRef, Q, QuerySet, Subquery, Sum, Window
+from django.db.models.functions import Rank
+from django.utils import timezone
+
+from api.models import CompletionRollup
+from authentication.models import BlossomUser
+
+Entry = Dict[str, Any]
+
+# The names of the leaderboards that are precomputed and cached
+LEADERBOARDS = ["all_time", "month", "week"]
+# The cache key of the current version of the leaderboards
+VERSION_CACHE_KEY = "leaderboard:version"
+
+RANK_ORDERING = [F("gamma").desc(), F("date_joined").desc(), F("id").desc()]
+REVERSE_RANK_ORDERING = [F("gamma").asc(), F("date_joined").asc(), F("id").asc()]
+
+
+def gamma_ranking() -> QuerySet:
+    """Get the all-time ranking of all volunteers with gamma."""
+    return (
+        BlossomUser.objects.filter(gamma_count__gt=0)
+        .values("id", "username", "date_joined")
+        .annotate(gamma=F("gamma_count"))
+    )
+
+
+def submission_ranking(submissions: QuerySet) -> QuerySet:
+    """Get the ranking of the volunteers who completed the given submissions.
+
+    The submissions are counted per volunteer, so only the volunteers who
+    completed any of them are looked at.
+    """
+    gamma = (
+        submissions.filter(completed_by=OuterRef("id"))
+        .order_by()
+        .values("completed_by")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    return (
+        BlossomUser.objects.filter(id__in=submissions.values("completed_by"))
+        .values("id", "username", "date_joined")
+        .annotate(gamma=Subquery(gamma))
+    )
+
+
+def _ranked_ahead_of(entry: Entry) -> Q:
+    """Get the condition for the entries ranked ahead of the given entry."""
+    gamma, date_joined = entry["gamma"], entry["date_joined"]
+    return (
+        Q(gamma__gt=gamma)
+        | Q(gamma=gamma, date_joined__gt=date_joined)
+        | Q(gamma=gamma, date_joined=date_joined, id__gt=entry["id"])
+    )
+
+
+def _ranked_behind(entry: Entry) -> Q:
+    """Get the condition for the entries ranked behind the given entry."""
+    gamma, date_joined = entry["gamma"], entry["date_joined"]
+    return (
+        Q(gamma__lt=gamma)
+        | Q(gamma=gamma, date_joined__lt=date_joined)
+        | Q(gamma=gamma, date_joined=date_joined, id__lt=entry["id"])
+    )
+
+
+def get_top(ranking: QuerySet, count: int) -> List[Entry]:
+    """Get the top entries of the ranking."""
+    entries = ranking.order_by(*RANK_ORDERING)[:count]
+    return [{**entry, "rank": rank} for rank, entry in enumerate(entries, start=1)]
+
+
+def get_window_rank(ranking: QuerySet, user_id: int) -> Optional[int]:
+    """Get the rank of the user with the `RANK()` window function.
+
+    The window function is applied to the whole ranking, so the ranking is
+    wrapped in a query that only keeps the row of the user afterwards.
+
+    :return: the rank, or None if the user is not part of the ranking.
+    """
+    ranked = ranking.annotate(rank=Window(Rank(), order_by=RANK_ORDERING)).values(
+        "id", "rank"
+    )
+    sql, params = ranked.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT "rank" FROM ({sql}) AS "ranking" WHERE "id" = %s',
+            [*params, user_id],
+        )
+        row = cursor.fetchone()
+    return row[0] if row is not None else None
+
+
+def get_entry(ranking: QuerySet, user: BlossomUser) -> Entry:
+    """Get the entry of the given user in the ranking.
+
+    Users who are not part of the ranking are placed behind everyone with gamma.
+    """
+    entry = ranking.filter(id=user.id).first()
+    if entry is not None and connection.vendor == "postgresql":
+        return {**entry, "rank": get_window_rank(ranking, user.id)}
+
+    entry = entry or {
+        "id": user.id,
+        "username": user.username,
+        "gamma": 0,
+        "date_joined": user.date_joined,
+    }
+    rank = ranking.filter(_ranked_ahead_of(entry)).count() + 1
+    return {**entry, "rank": rank}
+
+
+def get_above(ranking: QuerySet, entry: Entry, count: int) -> List[Entry]:
+    """Get the entries directly ranked ahead of the given entry.
+
+    :param entry: The ranked entry, as returned by `get_entry`.
+    :return: the entries, ordered by their rank.
+    """
+    if count <= 0:
+        return []
+    entries = ranking.filter(_ranked_ahead_of(entry)).order_by(*REVERSE_RANK_ORDERING)
+    return [
+        {**above, "rank": entry["rank"] - offset}
+        for offset, above in reversed(list(enumerate(entries[:count], start=1)))
+    ]
+
+
+def get_below(ranking: QuerySet, entry: Entry, count: int) -> List[Entry]:
+    """Get the entries directly ranked behind the given entry.
+
+    :param entry: The ranked entry, as returned by `get_entry`.
+    :return: the entries, ordered by their rank.
+    """
+    if count <= 0:
+        return []
+    entries = ranking.filter(_ranked_behind(entry)).order_by(*RANK_ORDERING)
+    return [
+        {**below, "rank": entry["rank"] + offset}
+        for offset, below in enumerate(entries[:count], start=1)
+    ]
+
+
+def get_leaderboard_start(
+    name: str, now: Optional[datetime] = None
+) -> Optional[datetime]:
+    """Get the start of the current period of the named leaderboard.
+
+    The periods start at midnight UTC, weeks start on Monday.
+
+    :return: the start of the period, or None for the all-time leaderboard.
+    """
+    now = (now or timezone.now()).astimezone(timezone.utc)
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if name == "week":
+        return midnight - timedelta(days=midnight.weekday())
+    if name == "month":
+        return midnight.replace(day=1)
+    return None
+
+
+def _get_version() -> str:
+    """Get the current version of the cached leaderboards."""
+    cache = caches["shared"]
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_CACHE_KEY)
+    return version
+
+
+def _leaderboard_cache_key(name: str, source: Optional[str], version: str) -> str:
+    """Get the cache key of the current period of the named leaderboard."""
+    start = get_leaderboard_start(name)
+    period = start.date().isoformat() if start is not None else "all"
+    return f"leaderboard:{version}:{name}:{source or '*'}:{period}"
+
+
+class NamedLeaderboard:
+    """A precomputed leaderboard, ranking every volunteer with gamma."""
+
+    def __init__(self, entries: List[Entry]) -> None:
+        """Rank the given entries, which have to be in the order of the ranking."""
+        self.entries = [
+            {**entry, "rank": rank} for rank, entry in enumerate(entries, start=1)
+        ]
+        self.ranks = {entry["id"]: entry["rank"] for entry in self.entries}
+
+    @classmethod
+    def compute(
+        cls: Type["NamedLeaderboard"], name: str, source: Optional[str] = None
+    ) -> "NamedLeaderboard":
+        """Compute the current period of the named leaderboard."""
+        start = get_leaderboard_start(name)
+        if start is None and source is None:
+            return cls(list(gamma_ranking().order_by(*RANK_ORDERING)))
+
+        rollups = CompletionRollup.objects.all()
+        if start is not None:
+            rollups = rollups.filter(bucket_start__gte=start)
+        if source is not None:
+            rollups = rollups.filter(source_id=source)
+        rows = (
+            rollups.values("user", "user__username", "user__date_joined")
+            .annotate(gamma=Sum("count"))
+            .filter(gamma__gt=0)
+            .order_by("-gamma", "-user__date_joined", "-user")
+        )
+        return cls(
+            [
+                {
+                    "id": row["user"],
+                    "username": row["user__username"],
+                    "gamma": row["gamma"],
+                    "date_joined": row["user__date_joined"],
+                }
+                for row in rows
+            ]
+        )
+
+    def top(self, count: int) -> List[Entry]:
+        """Get the top entries of the leaderboard."""
+        return self.entries[: max(count, 0)]
+
+    def entry(self, user: BlossomUser) -> Entry:
+        """Get the entry of the given user.
+
+        Users who are not on the leaderboard are placed behind everyone on it.
+        """
+        rank = self.ranks.get(user.id)
+        if rank is not None:
+            return self.entries[rank - 1]
+        return {
+            "id": user.id,
+            "username": user.username,
+            "gamma": 0,
+            "date_joined": user.date_joined,
+            "rank": len(self.entries) + 1,
+        }
+
+    def above(self, entry: Entry, count: int) -> List[Entry]:
+        """Get the entries directly ranked ahead of the given entry."""
+        index = entry["rank"] - 1
+        return self.entries[max(index - max(count, 0), 0) : index]
+
+    def below(self, entry: Entry, count: int) -> List[Entry]:
+        """Get the entries directly ranked behind the given entry."""
+        return self.entries[entry["rank"] : entry["rank"] + max(count, 0)]
+
+
+def get_named_leaderboard(name: str, source: Optional[str] = None) -> NamedLeaderboard:
+    """Get the named leaderboard from the cache, computing it if necessary.
+
+    :param name: The name of the leaderboard, one of `LEADERBOARDS`.
+    :param source: The source to limit the leaderboard to, if any.
+    """
+    cache = caches["shared"]
+    key = _leaderboard_cache_key(name, source, _get_version())
+    leaderboard = cache.get(key)
+    if leaderboard is None:
+        leaderboard = NamedLeaderboard.compute(name, source)
+        cache.set(key, leaderboard, settings.LEADERBOARD_CACHE_TIMEOUT)
+    return leaderboard
+
+
+def precompute_leaderboards() -> None:
+    """Compute the named leaderboards of all sources and cache them."""
+    cache = caches["shared"]
+    version = _get_version()
+    cache.set_many(
+        {
+            _leaderboard_cache_key(name, None, version): NamedLeaderboard.compute(name)
+            for name in LEADERBOARDS
+        },
+        settings.LEADERBOARD_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_leaderboards() -> None:
+    """Invalidate all cached named leaderboards, in every worker process.
+
+    This should be called whenever the gamma of a volunteer changes. Within a
+    transaction, the leaderboards are only invalidated once it is committed.
+    """
+    transaction.on_commit(
+        lambda: caches["shared"].set(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+    )
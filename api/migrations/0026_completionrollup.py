@@ -0,0 +1,98 @@
+# Generated by Django 3.2.25 on 2026-10-18 04:29
+
+from datetime import timezone
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+
+
+def backfill_completion_rollups(apps, schema_editor):  # noqa: ANN001,ANN201
+    CompletionRollup = apps.get_model("api", "CompletionRollup")  # noqa: N806
+    Submission = apps.get_model("api", "Submission")  # noqa: N806
+
+    rows = (
+        Submission.objects.filter(
+            completed_by__isnull=False, complete_time__isnull=False
+        )
+        .annotate(bucket_start=TruncHour("complete_time", tzinfo=timezone.utc))
+        .values("completed_by", "source", "bucket_start")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    CompletionRollup.objects.bulk_create(
+        (
+            CompletionRollup(
+                user_id=row["completed_by"],
+                source_id=row["source"],
+                bucket_start=row["bucket_start"],
+                count=row["total"],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("api", "0025_accountmigration"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CompletionRollup",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket_start", models.DateTimeField()),
+                ("count", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="submission",
+            index=models.Index(
+                fields=["completed_by", "complete_time"],
+                name="api_submiss_complet_c9861c_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="completionrollup",
+            name="source",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to="api.source"
+            ),
+        ),
+        migrations.AddField(
+            model_name="completionrollup",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="completionrollup",
+            index=models.Index(
+                fields=["user", "bucket_start"], name="api_complet_user_id_ee60ff_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="completionrollup",
+            constraint=models.UniqueConstraint(
+                fields=("user", "source", "bucket_start"),
+                name="unique_completion_bucket",
+            ),
+        ),
+        migrations.RunPython(backfill_completion_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 3.2.25 on 2026-10-18 04:50
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0026_completionrollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEvent",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("submission_done", "Submission Done"),
+                            ("check_message", "Check Message"),
+                            ("rank_up_message", "Rank Up Message"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                ("payload", models.JSONField(default=dict)),
+                (
+                    "create_time",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "available_time",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "complete_time",
+                    models.DateTimeField(blank=True, default=None, null=True),
+                ),
+                ("attempts", models.IntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default=None, null=True)),
+                ("failed", models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="outboxevent",
+            index=models.Index(
+                condition=models.Q(("complete_time__isnull", True), ("failed", False)),
+                fields=["available_time"],
+                name="outbox_pending_idx",
+            ),
+        ),
+    ]
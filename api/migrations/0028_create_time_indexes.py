@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-18 06:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0027_outboxevent"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="submission",
+            index=models.Index(
+                fields=["create_time", "id"], name="api_submiss_create__ffba88_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transcription",
+            index=models.Index(fields=["create_time", "id"], name="create_time_idx"),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 3.2.25 on 2026-10-18 06:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0028_create_time_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="submission",
+            index=models.Index(
+                condition=models.Q(
+                    ("archived", False),
+                    ("claimed_by__isnull", True),
+                    ("completed_by__isnull", True),
+                    ("removed_from_queue", False),
+                ),
+                fields=["source", "create_time", "id"],
+                name="submission_expired_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="submission",
+            index=models.Index(
+                condition=models.Q(
+                    ("archived", False),
+                    ("claimed_by__isnull", False),
+                    ("completed_by__isnull", True),
+                    ("removed_from_queue", False),
+                ),
+                fields=["source", "claim_time", "id"],
+                name="submission_in_progress_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="submission",
+            index=models.Index(
+                condition=models.Q(
+                    ("archived", False), ("completed_by__isnull", False)
+                ),
+                fields=["source", "complete_time", "id"],
+                name="submission_unarchived_idx",
+            ),
+        ),
+    ]
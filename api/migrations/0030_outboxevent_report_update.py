@@ -0,0 +1,26 @@
+# Generated by Django 3.2.25 on 2026-10-18 06:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0029_queue_feed_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="outboxevent",
+            name="kind",
+            field=models.CharField(
+                choices=[
+                    ("submission_done", "Submission Done"),
+                    ("check_message", "Check Message"),
+                    ("rank_up_message", "Rank Up Message"),
+                    ("report_update", "Report Update"),
+                ],
+                max_length=50,
+            ),
+        ),
+    ]
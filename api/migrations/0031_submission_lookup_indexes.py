@@ -0,0 +1,19 @@
+# Generated by Django 3.2.25 on 2026-10-18 06:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0030_outboxevent_report_update"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="submission",
+            index=models.Index(
+                fields=["original_id", "source"], name="api_submiss_origina_3b8273_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from api.search import install_search, uninstall_search
+
+
+def install(apps, schema_editor):  # noqa: ANN001,ANN201
+    """Create the full-text search index of the transcriptions."""
+    install_search(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):  # noqa: ANN001,ANN201
+    """Remove the full-text search index of the transcriptions."""
+    uninstall_search(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0031_submission_lookup_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,107 @@
+# Generated by Django 3.2.25 on 2026-10-18 06:54
+
+from django.db import migrations, models
+
+from api.reddit import parse_reddit_url
+
+BATCH_SIZE = 1000
+
+
+def backfill_reddit_ids(apps, schema_editor):  # noqa: ANN001,ANN201
+    """Parse the Reddit IDs of the existing submissions and transcriptions."""
+    Submission = apps.get_model("api", "Submission")  # noqa: N806
+    Transcription = apps.get_model("api", "Transcription")  # noqa: N806
+
+    submissions = []
+    for submission in (
+        Submission.objects.exclude(url__isnull=True, tor_url__isnull=True)
+        .only("url", "tor_url")
+        .iterator(chunk_size=BATCH_SIZE)
+    ):
+        ids = parse_reddit_url(submission.url)
+        tor_ids = parse_reddit_url(submission.tor_url)
+        if ids is None and tor_ids is None:
+            continue
+        submission.subreddit = ids.subreddit if ids else None
+        submission.reddit_id = ids.post_id if ids else None
+        submission.tor_reddit_id = tor_ids.post_id if tor_ids else None
+        submissions.append(submission)
+        if len(submissions) == BATCH_SIZE:
+            Submission.objects.bulk_update(
+                submissions, ["subreddit", "reddit_id", "tor_reddit_id"]
+            )
+            submissions = []
+    Submission.objects.bulk_update(
+        submissions, ["subreddit", "reddit_id", "tor_reddit_id"]
+    )
+
+    transcriptions = []
+    for transcription in (
+        Transcription.objects.filter(url__isnull=False)
+        .only("url")
+        .iterator(chunk_size=BATCH_SIZE)
+    ):
+        ids = parse_reddit_url(transcription.url)
+        if ids is None or ids.comment_id is None:
+            continue
+        transcription.reddit_id = ids.comment_id
+        transcriptions.append(transcription)
+        if len(transcriptions) == BATCH_SIZE:
+            Transcription.objects.bulk_update(transcriptions, ["reddit_id"])
+            transcriptions = []
+    Transcription.objects.bulk_update(transcriptions, ["reddit_id"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0032_transcription_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="submission",
+            name="reddit_id",
+            field=models.CharField(
+                blank=True, editable=False, max_length=16, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="subreddit",
+            field=models.CharField(
+                blank=True, editable=False, max_length=32, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="tor_reddit_id",
+            field=models.CharField(
+                blank=True, editable=False, max_length=16, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="transcription",
+            name="reddit_id",
+            field=models.CharField(
+                blank=True, editable=False, max_length=16, null=True
+            ),
+        ),
+        migrations.RunPython(backfill_reddit_ids, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="submission",
+            index=models.Index(
+                fields=["reddit_id"], name="api_submiss_reddit__fcaae1_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="submission",
+            index=models.Index(
+                fields=["tor_reddit_id"], name="api_submiss_tor_red_bc0dcc_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transcription",
+            index=models.Index(fields=["reddit_id"], name="reddit_id_idx"),
+        ),
+    ]
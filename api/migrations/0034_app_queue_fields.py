@@ -0,0 +1,65 @@
+# Generated by Django 3.2.25 on 2026-10-18 07:09
+
+from urllib.parse import urlparse
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def backfill_queue_fields(apps, schema_editor):  # noqa: ANN001,ANN201
+    """Parse the content hosts and flag the placeholder submissions."""
+    Submission = apps.get_model("api", "Submission")  # noqa: N806
+
+    # The posts created by `gamma_plusone` to award gamma by hand
+    Submission.objects.filter(source="gamma_plus_one").update(transcribable=False)
+
+    submissions = []
+    for submission in (
+        Submission.objects.filter(content_url__isnull=False)
+        .only("content_url")
+        .iterator(chunk_size=BATCH_SIZE)
+    ):
+        submission.content_host = urlparse(submission.content_url).netloc or None
+        submissions.append(submission)
+        if len(submissions) == BATCH_SIZE:
+            Submission.objects.bulk_update(submissions, ["content_host"])
+            submissions = []
+    Submission.objects.bulk_update(submissions, ["content_host"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0033_reddit_ids"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="submission",
+            name="content_host",
+            field=models.CharField(
+                blank=True, editable=False, max_length=253, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="transcribable",
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.RunPython(backfill_queue_fields, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="submission",
+            index=models.Index(
+                condition=models.Q(
+                    ("archived", False),
+                    ("claimed_by__isnull", True),
+                    ("completed_by__isnull", True),
+                    ("removed_from_queue", False),
+                    ("transcribable", True),
+                ),
+                fields=["content_host", "create_time", "id"],
+                name="submission_app_queue_idx",
+            ),
+        ),
+    ]
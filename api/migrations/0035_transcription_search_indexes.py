@@ -0,0 +1,27 @@
+from django.db import migrations
+
+from api.search import install_search_indexes, uninstall_search_indexes
+
+
+def install(apps, schema_editor):  # noqa: ANN001,ANN201
+    """Build the indexes of the full-text search without blocking writes."""
+    install_search_indexes(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):  # noqa: ANN001,ANN201
+    """Drop the indexes of the full-text search."""
+    uninstall_search_indexes(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    # The indexes are built concurrently, which cannot be done in a transaction
+    atomic = False
+
+    dependencies = [
+        ("api", "0034_app_queue_fields"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from api.search import install_search
+
+
+def reinstall(apps, schema_editor):  # noqa: ANN001,ANN201
+    """Install the full-text search again after the table has been recreated.
+
+    SQLite cannot add the columns of 0033_reddit_ids in place, so it recreates
+    the transcription table, which drops the triggers keeping the index of the
+    search up to date. On PostgreSQL, this does nothing new.
+    """
+    install_search(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0035_transcription_search_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(reinstall, migrations.RunPython.noop),
+    ]
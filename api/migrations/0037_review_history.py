@@ -0,0 +1,55 @@
+# Generated by Django 3.2.25 on 2026-10-18 08:32
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("api", "0036_reinstall_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReviewHistory",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "create_time",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "reviewer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "transcription",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="api.transcription",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="reviewhistory",
+            index=models.Index(
+                fields=["reviewer", "create_time"], name="review_history_recent_idx"
+            ),
+        ),
+    ]
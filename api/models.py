@@ -1,17 +1,26 @@
 """Specification of classes used within the API."""
 import logging
+import time
 import uuid
-from typing import Any, Optional
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from typing import Any, Dict, Optional, Tuple, Type
 from urllib.parse import urlparse
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.core.cache import caches
+from django.db import IntegrityError, models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 
+from api.reddit import parse_reddit_url
 from api.slack import client
+from ocr.cache import get_ocr_text
 from ocr.errors import OCRError
 from ocr.helpers import escape_reddit_links, process_image, replace_shortlinks
+from ocr.jobs import enqueue_ocr
 
 
 def create_id() -> uuid.UUID:  # pragma: no cover
@@ -44,6 +53,103 @@ class Source(models.Model):
         return self.name
 
 
+# The sources by name, loaded once per process so that looking a source up
+# does not need a query. Sources are hardly ever added or removed; whenever that
+# happens, the version in the shared cache is replaced, which makes every
+# process load them again. Each process compares its version to the shared one
+# at most every `SOURCE_REGISTRY_CHECK_INTERVAL` seconds.
+SOURCE_REGISTRY_VERSION_KEY = "source_registry:version"
+_source_registry: Optional[Dict[str, Source]] = None
+_source_registry_version: Optional[str] = None
+_source_registry_checked = 0.0
+
+
+def _remember_sources(sources: Dict[str, Source], version: Optional[str]) -> None:
+    """Add the sources to the registry, once the transaction is committed.
+
+    Sources read or created in a transaction that is rolled back are never
+    added, as they might not exist.
+    """
+
+    def remember() -> None:
+        global _source_registry, _source_registry_version, _source_registry_checked
+        registry = _source_registry
+        if registry is None or version != _source_registry_version:
+            registry = {}
+            _source_registry_checked = time.monotonic()
+        # Replaced as a whole, so that concurrent readers never see it changing
+        _source_registry = {**registry, **sources}
+        _source_registry_version = version
+
+    transaction.on_commit(remember)
+
+
+def _get_source_registry() -> Tuple[Dict[str, Source], Optional[str]]:
+    """Get the registry of the sources and the version it belongs to.
+
+    :return: the known sources and the shared version, loading them if needed.
+    """
+    global _source_registry_checked
+    registry, version = _source_registry, _source_registry_version
+    now = time.monotonic()
+    if (
+        registry is not None
+        and now - _source_registry_checked < settings.SOURCE_REGISTRY_CHECK_INTERVAL
+    ):
+        return registry, version
+
+    shared_version = caches["shared"].get(SOURCE_REGISTRY_VERSION_KEY)
+    if registry is None or shared_version != version:
+        registry = {source.name: source for source in Source.objects.all()}
+        _remember_sources(registry, shared_version)
+    else:
+        _source_registry_checked = now
+    return registry, shared_version
+
+
+def get_source(name: str, create: bool = False) -> Source:
+    """
+    Get the source with the given name from the in-process registry.
+
+    The registry is loaded with a single query on first use. Sources that
+    are not in it yet are looked up (or created) and added to it.
+
+    :param name: the name of the source
+    :param create: whether to create the source if it does not exist
+    :return: the source with the given name
+    :raise Source.DoesNotExist: when the source does not exist and is not created
+    """
+    registry, version = _get_source_registry()
+    if (source := registry.get(name)) is None:
+        if create:
+            source, _ = Source.objects.get_or_create(name=name)
+        else:
+            source = Source.objects.get(name=name)
+        _remember_sources({source.name: source}, version)
+    return source
+
+
+def clear_source_registry() -> None:
+    """Forget the known sources, so that they are loaded again on next use."""
+    global _source_registry, _source_registry_version
+    _source_registry = None
+    _source_registry_version = None
+
+
+def _invalidate_source_registry() -> None:
+    """Make every process load the sources again, including this one."""
+    caches["shared"].set(SOURCE_REGISTRY_VERSION_KEY, uuid.uuid4().hex, None)
+    clear_source_registry()
+
+
+@receiver(post_save, sender=Source)
+@receiver(post_delete, sender=Source)
+def _source_changed(**kwargs: Any) -> None:
+    """Invalidate the source registry whenever a source is added or removed."""
+    clear_source_registry()
+    transaction.on_commit(_invalidate_source_registry)
+
+
 def get_default_source() -> str:
     """
     Grabs the proper default ID for submissions and transcriptions.
@@ -57,8 +163,82 @@ def get_default_source() -> str:
 
     :return: the ID of Source record for reddit
     """
-    obj, _ = Source.objects.get_or_create(name="reddit")
-    return obj.name
+    return get_source("reddit", create=True).name
+
+
+# The user ID, source ID and hour of a completed submission.
+CompletionKey = Tuple[int, str, datetime]
+
+
+def truncate_to_hour(value: datetime) -> datetime:
+    """Truncate the given time to the start of its hour in UTC.
+
+    Naive times are treated as UTC, just like the database does.
+    """
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, dt_timezone.utc)
+    return value.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def get_completion_key(submission: "Submission") -> Optional[CompletionKey]:
+    """Get the rollup bucket that the given submission is counted in.
+
+    :return: the bucket or None if the submission has not been completed.
+    """
+    if submission.completed_by_id is None or submission.complete_time is None:
+        return None
+    return (
+        submission.completed_by_id,
+        submission.source_id,
+        truncate_to_hour(submission.complete_time),
+    )
+
+
+class CompletionRollup(models.Model):
+    """
+    The number of submissions completed by a user from a source in one hour.
+
+    These rows are maintained incrementally whenever a submission is saved or
+    deleted, so that statistics like the rate and heatmap of a volunteer can be
+    computed from a few buckets instead of every single submission.
+    """
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "source", "bucket_start"],
+                name="unique_completion_bucket",
+            )
+        ]
+        indexes = [models.Index(fields=["user", "bucket_start"])]
+
+    user = models.ForeignKey("authentication.BlossomUser", on_delete=models.CASCADE)
+    source = models.ForeignKey(Source, on_delete=models.CASCADE)
+    # The start of the hour (in UTC) that this bucket covers.
+    bucket_start = models.DateTimeField()
+    # The number of submissions completed within that hour.
+    count = models.IntegerField(default=0)
+
+
+# The fields of a submission that are parsed from other fields when it is
+# saved, and the fields they are parsed from
+PARSED_FIELDS = {
+    "subreddit",
+    "reddit_id",
+    "tor_reddit_id",
+    "content_host",
+}
+PARSED_FROM_FIELDS = {"url", "tor_url", "content_url"}
+# The fields of a submission that its completion is derived from, see
+# `get_completion_key`, by name and by the attribute holding their value
+COMPLETION_FIELDS = {
+    "completed_by",
+    "completed_by_id",
+    "complete_time",
+    "source",
+    "source_id",
+}
+COMPLETION_ATTNAMES = {"completed_by_id", "complete_time", "source_id"}
 
 
 class Submission(models.Model):
@@ -72,7 +252,52 @@ class Submission(models.Model):
     """
 
     class Meta:
-        indexes = [models.Index(fields=["url", "tor_url"])]
+        indexes = [
+            models.Index(fields=["url", "tor_url"]),
+            models.Index(fields=["completed_by", "complete_time"]),
+            models.Index(fields=["create_time", "id"]),
+            models.Index(fields=["original_id", "source"]),
+            models.Index(fields=["reddit_id"]),
+            models.Index(fields=["tor_reddit_id"]),
+            # The partial indexes of the queue feeds, matching their filters
+            models.Index(
+                fields=["source", "create_time", "id"],
+                condition=models.Q(
+                    completed_by__isnull=True,
+                    claimed_by__isnull=True,
+                    archived=False,
+                    removed_from_queue=False,
+                ),
+                name="submission_expired_idx",
+            ),
+            models.Index(
+                fields=["source", "claim_time", "id"],
+                condition=models.Q(
+                    completed_by__isnull=True,
+                    claimed_by__isnull=False,
+                    archived=False,
+                    removed_from_queue=False,
+                ),
+                name="submission_in_progress_idx",
+            ),
+            models.Index(
+                fields=["source", "complete_time", "id"],
+                condition=models.Q(completed_by__isnull=False, archived=False),
+                name="submission_unarchived_idx",
+            ),
+            # The partial index of the queue of the transcription app
+            models.Index(
+                fields=["content_host", "create_time", "id"],
+                condition=models.Q(
+                    completed_by__isnull=True,
+                    claimed_by__isnull=True,
+                    archived=False,
+                    removed_from_queue=False,
+                    transcribable=True,
+                ),
+                name="submission_app_queue_idx",
+            ),
+        ]
 
     # The ID of the Submission on the "source" platform.
     # Note that this field is not used as a primary key; an underlying
@@ -129,12 +354,31 @@ class Submission(models.Model):
     # The URL to the Submission on /r/TranscribersOfReddit.
     tor_url = models.URLField(null=True, blank=True)
 
+    # The subreddit and the base36 ID of the post in `url` and the ID of the
+    # post in `tor_url`, in lower case. They are parsed from the URLs whenever
+    # the submission is saved, so that the posts can be found by exact match.
+    subreddit = models.CharField(max_length=32, null=True, blank=True, editable=False)
+    reddit_id = models.CharField(max_length=16, null=True, blank=True, editable=False)
+    tor_reddit_id = models.CharField(
+        max_length=16, null=True, blank=True, editable=False
+    )
+
     # Whether the post has been archived, for example by /u/tor_archivist.
     archived = models.BooleanField(default=False)
 
     # A link to the content that the submission is about. An image, audio, video, etc.
     # If this is an image, it is sent to ocr.space for automatic transcription.
     content_url = models.URLField(null=True, blank=True)
+    # The host of `content_url`, parsed whenever the submission is saved, so
+    # that the queue can be limited to the image hosts within the query.
+    content_host = models.CharField(
+        max_length=253, null=True, blank=True, editable=False
+    )
+
+    # Whether the submission is a post that can be transcribed, rather than a
+    # placeholder, e.g. one created to adjust the gamma of a volunteer. This has
+    # to be set to False wherever such placeholders are created.
+    transcribable = models.BooleanField(default=True, editable=False)
 
     # If this is from Reddit, then it mirrors the status on Reddit's side that we get
     # from PRAW. Otherwise it can be set manually to mark something that shouldn't be
@@ -166,6 +410,58 @@ class Submission(models.Model):
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.original_id}"
 
+    @classmethod
+    def from_db(cls: Type["Submission"], *args: Any, **kwargs: Any) -> "Submission":
+        """Remember who completed the submission when it was loaded.
+
+        This is used by `save` to keep the gamma counters of the users and the
+        completion rollups in sync.
+        """
+        instance = super().from_db(*args, **kwargs)
+        instance._remember_completion()
+        return instance
+
+    def refresh_from_db(self, *args: Any, **kwargs: Any) -> None:
+        """Reload the submission and the remembered completion."""
+        super().refresh_from_db(*args, **kwargs)
+        self._remember_completion()
+
+    def _remember_completion(self) -> None:
+        """Remember the completion of the submission as it was loaded.
+
+        If any of its fields are deferred, reading them would run a query for
+        every loaded submission. Instead, nothing is remembered and `save`
+        looks the stored completion up if it needs it.
+        """
+        if COMPLETION_ATTNAMES & self.get_deferred_fields():
+            self.__dict__.pop("_loaded_completion", None)
+        else:
+            self._loaded_completion = self._get_completion()
+
+    def update_parsed_fields(self) -> None:
+        """Parse the Reddit IDs and the content host."""
+        ids = parse_reddit_url(self.url)
+        self.subreddit = ids.subreddit if ids else None
+        self.reddit_id = ids.post_id if ids else None
+        tor_ids = parse_reddit_url(self.tor_url)
+        self.tor_reddit_id = tor_ids.post_id if tor_ids else None
+        self.content_host = urlparse(self.content_url or "").netloc or None
+
+    def _get_completion(self) -> Tuple[Optional[int], Optional[CompletionKey]]:
+        """Get the completing user and the rollup bucket of the submission."""
+        return self.completed_by_id, get_completion_key(self)
+
+    def _get_stored_completion(
+        self,
+    ) -> Tuple[Optional[int], Optional[CompletionKey]]:
+        """Get the completing user and the rollup bucket in the database."""
+        stored = (
+            Submission.objects.only("completed_by", "complete_time", "source")
+            .filter(pk=self.pk)
+            .first()
+        )
+        return stored._get_completion() if stored else (None, None)
+
     @property
     def has_ocr_transcription(self) -> bool:
         """
@@ -174,17 +470,20 @@ class Submission(models.Model):
         This property is determined by checking whether a Transcription by the
         user "transcribot" exists for the Submission.
 
+        When the Submission has been loaded with the
+        `annotated_has_ocr_transcription` annotation, that is used instead of
+        running a query.
+
         :return: whether the Submission has an OCR transcription
         """
-        return (
-            False
-            if self.cannot_ocr
-            else bool(
-                Transcription.objects.filter(
-                    submission=self, author__username="transcribot"
-                )
-            )
-        )
+        if self.cannot_ocr:
+            return False
+        annotated = getattr(self, "annotated_has_ocr_transcription", None)
+        if annotated is not None:
+            return annotated
+        return Transcription.objects.filter(
+            submission=self, author__username="transcribot"
+        ).exists()
 
     @property
     def is_image(self) -> bool:
@@ -210,13 +509,16 @@ class Submission(models.Model):
         Transcription.objects.create(
             submission=self,
             author=get_user_model().objects.get(username="transcribot"),
-            source=Source.objects.get(name="blossom"),
+            source=get_source("blossom"),
             text=text,
         )
 
     def generate_ocr_transcription(self) -> None:
-        """Create automatic OCR transcriptions of images."""
-        # TODO: add @send_to_worker decorator to queue this
+        """Create automatic OCR transcriptions of images.
+
+        This blocks until the OCR API responds, use the OCR job queue instead
+        of calling this directly.
+        """
         if not settings.ENABLE_OCR:
             logging.warning("OCR is disabled; this call has been ignored.")
             return
@@ -224,24 +526,34 @@ class Submission(models.Model):
             logging.info("Submission already marked with `cannot_ocr`; skipping.")
             return
 
-        try:
-            result = process_image(self.content_url)
-        except OCRError as e:
-            logging.warning(
-                "There was an error in generating the OCR transcription: " + str(e)
-            )
-            self.cannot_ocr = True
-            return
+        escaped = self.source.name == "reddit"
 
-        if not result:
+        def _run_ocr() -> Optional[str]:
+            """Run the OCR of the image, returning the text of the transcription."""
+            try:
+                result = process_image(self.content_url)
+            except OCRError as e:
+                logging.warning(
+                    "There was an error in generating the OCR transcription: " + str(e)
+                )
+                return None
+
+            if not result:
+                return None
+
+            text = result["text"]
+            if escaped:
+                text = escape_reddit_links(text)
+                text = replace_shortlinks(text)
+            return text
+
+        # Reposts of the image reuse the text of the earlier transcription
+        text = get_ocr_text(self.content_url, escaped, _run_ocr)
+        if text is None:
             self.cannot_ocr = True
             return
 
-        if self.source.name == "reddit":
-            result["text"] = escape_reddit_links(result["text"])
-            result["text"] = replace_shortlinks(result["text"])
-
-        self._create_ocr_transcription(text=result["text"])
+        self._create_ocr_transcription(text=text)
 
     def save(self, *args: Any, skip_extras: bool = False, **kwargs: Any) -> None:
         """
@@ -253,14 +565,57 @@ class Submission(models.Model):
         sure that you save the submission before actually creating anything
         that relates to it.
 
-        If `skip_extras` is set, then it should bypass everything that is not
-        simply "save the object to the db".
+        New image submissions get an OCR job, which is processed in the
+        background. If `skip_extras` is set, then it should bypass everything
+        that is not simply "save the object to the db".
+
+        Whenever `completed_by` or `complete_time` changes, the gamma counters
+        and the completion rollups are updated in the same transaction as the
+        submission.
+
+        The fields parsed from the URLs are updated on every save, see
+        `update_parsed_fields`.
         """
-        super(Submission, self).save(*args, **kwargs)
-        if not skip_extras:
-            if self.is_image and not self.has_ocr_transcription:
-                # TODO: This is a great candidate for a basic queue system
-                self.generate_ocr_transcription()
+        self.update_parsed_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and PARSED_FROM_FIELDS & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, *PARSED_FIELDS}
+
+        adding = self._state.adding
+        # Saving other fields only cannot change the completion
+        tracks_completion = update_fields is None or bool(
+            COMPLETION_FIELDS & set(update_fields)
+        )
+
+        with transaction.atomic():
+            if not tracks_completion:
+                super(Submission, self).save(*args, **kwargs)
+            else:
+                if adding:
+                    previous_user_id, previous_key = None, None
+                elif hasattr(self, "_loaded_completion"):
+                    previous_user_id, previous_key = self._loaded_completion
+                else:
+                    previous_user_id, previous_key = self._get_stored_completion()
+                current_user_id, current_key = self._get_completion()
+
+                super(Submission, self).save(*args, **kwargs)
+                if previous_user_id != current_user_id:
+                    _adjust_gamma(previous_user_id, -1)
+                    _adjust_gamma(current_user_id, 1)
+                    if Submission.completed_by.is_cached(self) and self.completed_by:
+                        # Keep the in-memory user in sync with the database
+                        self.completed_by.gamma_count += 1
+                if previous_key != current_key:
+                    _adjust_completion_rollup(previous_key, -1)
+                    _adjust_completion_rollup(current_key, 1)
+                if previous_user_id != current_user_id or previous_key != current_key:
+                    _invalidate_leaderboards()
+                self._loaded_completion = (current_user_id, current_key)
+
+        if adding and not skip_extras:
+            # The OCR is run in the background by the `process_ocr_jobs` command
+            enqueue_ocr(self)
 
     def get_subreddit_name(self) -> str:
         """
@@ -274,6 +629,60 @@ class Submission(models.Model):
         return f'/r/{self.url.split("/r/")[1].split("/")[0]}'
 
 
+def _invalidate_leaderboards() -> None:
+    """Invalidate the cached leaderboards once the transaction is committed."""
+    # prevent circular import
+    from api.leaderboard import invalidate_leaderboards
+
+    invalidate_leaderboards()
+
+
+def _adjust_gamma(user_id: Optional[int], delta: int) -> None:
+    """Change the gamma counter of the given user by the given amount."""
+    if user_id is None:
+        return
+    get_user_model().objects.filter(id=user_id).update(
+        gamma_count=models.F("gamma_count") + delta
+    )
+
+
+def _adjust_completion_rollup(key: Optional[CompletionKey], delta: int) -> None:
+    """Change the completion count of the given rollup bucket."""
+    if key is None:
+        return
+    user_id, source_id, bucket_start = key
+    bucket = CompletionRollup.objects.filter(
+        user_id=user_id, source_id=source_id, bucket_start=bucket_start
+    )
+    if bucket.update(count=models.F("count") + delta) or delta < 0:
+        return
+    try:
+        # The savepoint makes sure that a concurrently created bucket does not
+        # break the surrounding transaction
+        with transaction.atomic():
+            CompletionRollup.objects.create(
+                user_id=user_id,
+                source_id=source_id,
+                bucket_start=bucket_start,
+                count=delta,
+            )
+    except IntegrityError:
+        bucket.update(count=models.F("count") + delta)
+
+
+@receiver(post_delete, sender=Submission)
+def _remove_deleted_completion(instance: Submission, **kwargs: Any) -> None:
+    """Take the gamma and rollup count of a deleted submission away.
+
+    This is a signal handler so that it also covers bulk deletes, for example
+    the ones made by `yeet` or by deleting a source.
+    """
+    _adjust_gamma(instance.completed_by_id, -1)
+    _adjust_completion_rollup(get_completion_key(instance), -1)
+    if instance.completed_by_id is not None:
+        _invalidate_leaderboards()
+
+
 class Transcription(models.Model):
     class Meta:
         indexes = [
@@ -281,6 +690,8 @@ class Transcription(models.Model):
             models.Index(fields=["submission"], name="submission_idx"),
             models.Index(fields=["original_id"], name="original_id_idx"),
             models.Index(fields=["url"], name="url_idx"),
+            models.Index(fields=["reddit_id"], name="reddit_id_idx"),
+            models.Index(fields=["create_time", "id"], name="create_time_idx"),
         ]
 
     # The Submission for which the Transcription is made.
@@ -315,6 +726,10 @@ class Transcription(models.Model):
     # The URL to the Transcription on the source platform.
     url = models.URLField(null=True, blank=True)
 
+    # The base36 ID of the comment in `url`, in lower case. It is parsed from
+    # the URL whenever the transcription is saved.
+    reddit_id = models.CharField(max_length=16, null=True, blank=True, editable=False)
+
     # The text of the transcription. We force the SQL longtext type, per
     # https://stackoverflow.com/a/23169977.
     text = models.TextField(max_length=4_294_000_000, null=True, blank=True)
@@ -329,6 +744,15 @@ class Transcription(models.Model):
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.submission} by {self.author.username}"
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        """Save the transcription, with the ID of the comment parsed from its URL."""
+        ids = parse_reddit_url(self.url)
+        self.reddit_id = ids.comment_id if ids else None
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "url" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "reddit_id"}
+        super().save(*args, **kwargs)
+
 
 class TranscriptionCheck(models.Model):
     class TranscriptionCheckStatus(models.TextChoices):
@@ -449,24 +873,121 @@ class AccountMigration(models.Model):
     def perform_migration(self) -> None:
         """Move all submissions attributed to one account to another."""
         existing_submissions = Submission.objects.filter(completed_by=self.old_user)
-        self.affected_submissions.add(*existing_submissions)
+        with transaction.atomic():
+            self.affected_submissions.add(*existing_submissions)
 
-        # need to process transcriptions first because the submissions they're
-        # linked to are about to change
-        transcriptions = Transcription.objects.filter(
-            submission__in=existing_submissions, author=self.old_user
-        )
-        transcriptions.update(author=self.new_user)
-        existing_submissions.update(
-            claimed_by=self.new_user, completed_by=self.new_user
-        )
+            # need to process transcriptions first because the submissions they're
+            # linked to are about to change
+            transcriptions = Transcription.objects.filter(
+                submission__in=existing_submissions, author=self.old_user
+            )
+            transcriptions.update(author=self.new_user)
+            existing_submissions.update(
+                claimed_by=self.new_user, completed_by=self.new_user
+            )
+            self._reconcile_statistics()
 
     def revert(self) -> None:
         """Undo the account migration."""
         transcriptions = Transcription.objects.filter(
             submission__in=self.affected_submissions.all(), author=self.new_user
         )
-        transcriptions.update(author=self.old_user)
-        self.affected_submissions.update(
-            claimed_by=self.old_user, completed_by=self.old_user
-        )
+        with transaction.atomic():
+            transcriptions.update(author=self.old_user)
+            self.affected_submissions.update(
+                claimed_by=self.old_user, completed_by=self.old_user
+            )
+            self._reconcile_statistics()
+
+    def _reconcile_statistics(self) -> None:
+        """Recalculate the statistics of both users after moving submissions.
+
+        The submissions are moved with `QuerySet.update`, which bypasses
+        `Submission.save`, so the gamma counters and completion rollups have
+        to be fixed up separately.
+        """
+        # prevent circular import
+        from api.completions import rebuild_completion_rollups
+        from authentication.models import reconcile_gamma
+
+        user_ids = [self.old_user_id, self.new_user_id]
+        reconcile_gamma(get_user_model().objects.filter(id__in=user_ids))
+        rebuild_completion_rollups(user_ids=user_ids)
+
+
+class OutboxEvent(models.Model):
+    """A side effect of an API call that is performed outside of the request.
+
+    Events are created in the same transaction as the change that caused them
+    and are processed by the `process_outbox` command. Failed events are
+    retried with an exponential backoff until they run out of attempts.
+    """
+
+    class OutboxEventKind(models.TextChoices):
+        # A submission has been completed. Samples the transcription check and
+        # detects rank ups.
+        SUBMISSION_DONE = "submission_done"
+        # Send a transcription check to Slack.
+        CHECK_MESSAGE = "check_message"
+        # Congratulate a volunteer for ranking up on Slack.
+        RANK_UP_MESSAGE = "rank_up_message"
+        # Bring the Slack report of a submission up to date after it has been
+        # approved or removed.
+        REPORT_UPDATE = "report_update"
+
+    class Meta:
+        indexes = [
+            # Used by the workers to find the events that are due
+            models.Index(
+                fields=["available_time"],
+                condition=models.Q(complete_time__isnull=True, failed=False),
+                name="outbox_pending_idx",
+            )
+        ]
+
+    kind = models.CharField(max_length=50, choices=OutboxEventKind.choices)
+    # The data the event is processed with, e.g. the affected IDs
+    payload = models.JSONField(default=dict)
+
+    # The time the event has been created.
+    create_time = models.DateTimeField(default=timezone.now)
+    # The time from which on the event can be (re)tried.
+    available_time = models.DateTimeField(default=timezone.now)
+    # The time the event has been processed successfully.
+    complete_time = models.DateTimeField(default=None, null=True, blank=True)
+
+    # The number of times processing the event has failed.
+    attempts = models.IntegerField(default=0)
+    # The error of the last failed attempt.
+    last_error = models.TextField(default=None, null=True, blank=True)
+    # Whether the event has run out of attempts and is not retried anymore.
+    failed = models.BooleanField(default=False)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.kind} #{self.id}"
+
+
+class ReviewHistory(models.Model):
+    """A transcription that has been served to a reviewer by the random review.
+
+    The transcriptions recently served to a reviewer are skipped when they ask
+    for the next one. Every served transcription is a row of its own, so that
+    concurrent reviews by the same user do not overwrite each other.
+    """
+
+    class Meta:
+        indexes = [
+            # Used to find the transcriptions recently served to a reviewer
+            models.Index(
+                fields=["reviewer", "create_time"], name="review_history_recent_idx"
+            )
+        ]
+
+    reviewer = models.ForeignKey("authentication.BlossomUser", on_delete=models.CASCADE)
+    transcription = models.ForeignKey(Transcription, on_delete=models.CASCADE)
+
+    # The time the transcription has been served to the reviewer.
+    create_time = models.DateTimeField(default=timezone.now)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.transcription_id} for {self.reviewer_id}"
@@ -0,0 +1,186 @@
+"""
+Side effects of API calls that are performed outside of the request.
+
+Instead of talking to Slack while the volunteer waits for a response, the
+views record an `OutboxEvent` in the same transaction as their change. The
+events are then processed by the `process_outbox` command, so a slow or
+failing Slack only delays the side effects instead of the API calls.
+
+Events are delivered at least once: a failed event is retried as a whole, so
+every handler has to be safe to run again. Handlers that make a random
+decision record it by publishing follow-up events, so that retries do not
+decide differently.
+"""
+import logging
+from datetime import timedelta
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from api.models import OutboxEvent, Submission, Transcription, TranscriptionCheck
+from api.slack import client as slack
+from api.slack.actions import ReportMessageStatus, update_submission_report
+from api.slack.transcription_check.messages import send_check_message
+
+logger = logging.getLogger("api.outbox")
+
+EventKind = OutboxEvent.OutboxEventKind
+EventHandler = Callable[[Dict[str, Any]], None]
+
+# The number of attempts after which an event is given up on
+MAX_ATTEMPTS = 8
+# The delay before the first retry, doubled for every following retry
+RETRY_DELAY = timedelta(seconds=30)
+# The time after which an event claimed by a worker that stopped is retried
+LEASE_TIME = timedelta(minutes=5)
+
+
+class OutboxError(Exception):
+    pass
+
+
+def publish_event(kind: str, **payload: Any) -> OutboxEvent:
+    """Record an event to be processed outside of the current request.
+
+    This has to be called in the same transaction as the change causing the
+    event, so that the event is only processed if the change is committed.
+    """
+    return OutboxEvent.objects.create(kind=kind, payload=payload)
+
+
+def _handle_submission_done(payload: Dict[str, Any]) -> None:
+    """Sample the transcription check and detect rank ups of a completion."""
+    submission = Submission.objects.select_related("completed_by").get(
+        id=payload["submission_id"]
+    )
+    user = submission.completed_by
+
+    transcription_id = payload.get("transcription_id")
+    if transcription_id is not None and user.should_check_transcription():
+        # Create a new check object
+        check = TranscriptionCheck.objects.create(
+            transcription=Transcription.objects.get(id=transcription_id),
+            trigger=user.transcription_check_reason(),
+        )
+        publish_event(EventKind.CHECK_MESSAGE, check_id=check.id)
+
+    # The gamma right after the completion, which may have changed since
+    gamma = payload["gamma"]
+    rank = user.get_rank(override=gamma)
+    if user.get_rank(override=gamma - 1) != rank:
+        publish_event(EventKind.RANK_UP_MESSAGE, submission_id=submission.id, rank=rank)
+
+
+def _handle_check_message(payload: Dict[str, Any]) -> None:
+    """Send a transcription check to Slack, unless it has been sent already."""
+    check = TranscriptionCheck.objects.get(id=payload["check_id"])
+    if check.slack_message_ts is not None:
+        return
+
+    if send_check_message(check) is None:
+        raise OutboxError(f"Slack did not accept check {check.id}.")
+
+
+def _handle_rank_up_message(payload: Dict[str, Any]) -> None:
+    """Congratulate a volunteer for ranking up on Slack."""
+    submission = Submission.objects.select_related("completed_by").get(
+        id=payload["submission_id"]
+    )
+    msg = (
+        f"Congrats to {submission.completed_by.username} on achieving the rank of"
+        f" {payload['rank']}!! {submission.tor_url}"
+    )
+    slack.chat_postMessage(channel=settings.SLACK_RANK_UP_CHANNEL, text=msg)
+
+
+def _handle_report_update(payload: Dict[str, Any]) -> None:
+    """Update the Slack report of an approved or removed submission.
+
+    Nothing is done if the submission has been changed back in the meantime.
+    """
+    submission = Submission.objects.get(id=payload["submission_id"])
+    report_status = ReportMessageStatus(payload["status"])
+    if report_status == ReportMessageStatus.APPROVED and not submission.approved:
+        return
+    if (
+        report_status == ReportMessageStatus.REMOVED
+        and not submission.removed_from_queue
+    ):
+        return
+    update_submission_report(submission, report_status)
+
+
+EVENT_HANDLERS: Dict[str, EventHandler] = {
+    EventKind.SUBMISSION_DONE: _handle_submission_done,
+    EventKind.CHECK_MESSAGE: _handle_check_message,
+    EventKind.RANK_UP_MESSAGE: _handle_rank_up_message,
+    EventKind.REPORT_UPDATE: _handle_report_update,
+}
+
+
+def _process_event(event: OutboxEvent) -> None:
+    """Run the handler of the event and record the outcome."""
+    try:
+        # Undo the changes of the handler if it fails
+        with transaction.atomic():
+            EVENT_HANDLERS[event.kind](event.payload)
+    except Exception as e:
+        event.attempts += 1
+        event.last_error = repr(e)
+        if event.attempts >= MAX_ATTEMPTS:
+            event.failed = True
+            logger.error(f"Giving up on event {event} after {event.attempts} attempts.")
+        else:
+            delay = RETRY_DELAY * 2 ** (event.attempts - 1)
+            event.available_time = timezone.now() + delay
+            logger.warning(f"Event {event} failed, retrying in {delay}: {e!r}")
+    else:
+        event.complete_time = timezone.now()
+
+    event.save()
+
+
+def _claim_event() -> Optional[OutboxEvent]:
+    """Lease the next due event to the current worker.
+
+    The lease is committed right away, so that no rows stay locked while the
+    event is processed. Other workers skip the event until the lease runs out,
+    after which it is retried in case the worker has stopped.
+    """
+    with transaction.atomic():
+        event = (
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(
+                complete_time__isnull=True,
+                failed=False,
+                available_time__lte=timezone.now(),
+            )
+            .order_by("available_time", "id")
+            .first()
+        )
+        if event is not None:
+            event.available_time = timezone.now() + LEASE_TIME
+            event.save(update_fields=["available_time"])
+    return event
+
+
+def process_events(limit: int = 100) -> int:
+    """Process the events that are due, oldest first.
+
+    Multiple workers can process events at the same time: every event is
+    leased to a single worker before it is processed.
+
+    :param limit: The maximum number of events to process.
+    :return: The number of processed events, including failed attempts.
+    """
+    processed = 0
+    while processed < limit:
+        event = _claim_event()
+        if event is None:
+            break
+        _process_event(event)
+        processed += 1
+
+    return processed
@@ -1,9 +1,135 @@
-from rest_framework.pagination import PageNumberPagination
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.db.models import QuerySet
+from drf_yasg.openapi import Parameter
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+# The value of the `pagination` query parameter that opts into cursors
+CURSOR = "cursor"
+
+# The query parameters of the cursor pagination, for the documentation
+CURSOR_PARAMETERS = [
+    Parameter(
+        "pagination",
+        "query",
+        type="string",
+        enum=["page", CURSOR],
+        description='Use "cursor" to scan through the results at a constant cost per'
+        ' page. The response then has no "count", follow its "next" link instead.',
+        required=False,
+    ),
+    Parameter(
+        CURSOR,
+        "query",
+        type="string",
+        description='The position of the page, taken from the "next" or "previous"'
+        " link of the previous response.",
+        required=False,
+    ),
+]
+
+
+class CursorResultsSetPagination(CursorPagination):
+    """
+    The pagination class for deep scans through the results of a query.
+
+    Instead of counting all results and skipping the previous pages with an
+    OFFSET, every page continues right after the last result of the previous
+    one. Every page therefore costs the same, no matter how deep it is, but
+    the response has no total count and pages cannot be skipped.
+    """
+
+    page_size = 25
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def __init__(
+        self, ordering_fields: Sequence[str], page_size: Optional[int] = None
+    ) -> None:
+        """
+        Create the pagination for the given orderings.
+
+        :param ordering_fields: the fields the results can be ordered by. These
+            should be backed by an index. The first field has to be unique, it
+            is used to order the results that are equal on the other fields.
+        :param page_size: the default number of results per page
+        """
+        self.ordering_fields = ordering_fields
+        if page_size is not None:
+            self.page_size = page_size
+
+    def get_ordering(
+        self, request: Request, queryset: QuerySet, view: Optional[APIView]
+    ) -> Tuple[str, ...]:
+        """
+        Get the ordering from the `ordering` query parameter.
+
+        Without the parameter, the ordering of the queryset is kept if it is
+        allowed, otherwise the results are ordered by the first field.
+        """
+        ordering = request.query_params.get("ordering")
+        if not ordering:
+            ordering = self.ordering_fields[0]
+            current = queryset.query.order_by
+            if current and current[0].lstrip("-") in self.ordering_fields:
+                ordering = current[0]
+
+        field = ordering.lstrip("-")
+        if field not in self.ordering_fields:
+            raise ValidationError(
+                {
+                    "ordering": "Cursor pagination can only be ordered by "
+                    f"{', '.join(self.ordering_fields)}."
+                }
+            )
+        unique_field = self.ordering_fields[0]
+        if field == unique_field:
+            return (ordering,)
+        direction = "-" if ordering.startswith("-") else ""
+        return ordering, f"{direction}{unique_field}"
 
 
 class StandardResultsSetPagination(PageNumberPagination):
-    """The standard pagination class to use for the queries."""
+    """
+    The standard pagination class to use for the queries.
+
+    Views that define `cursor_ordering_fields` can also be paginated with a
+    cursor, by passing `pagination=cursor` as a query parameter. See
+    `CursorResultsSetPagination` for details.
+    """
 
     page_size = 25
     page_size_query_param = "page_size"
     max_page_size = 500
+
+    def __init__(self, cursor_ordering_fields: Optional[Sequence[str]] = None) -> None:
+        """
+        Create the pagination.
+
+        :param cursor_ordering_fields: the orderings that can be used with a
+            cursor, if the view does not define them
+        """
+        self.cursor_ordering_fields = cursor_ordering_fields
+        self.cursor_pagination: Optional[CursorResultsSetPagination] = None
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Optional[APIView] = None
+    ) -> Optional[List[Any]]:
+        """Get the requested page, using a cursor if the client asked for it."""
+        ordering_fields = getattr(
+            view, "cursor_ordering_fields", self.cursor_ordering_fields
+        )
+        if ordering_fields and request.query_params.get("pagination") == CURSOR:
+            self.cursor_pagination = CursorResultsSetPagination(ordering_fields)
+            return self.cursor_pagination.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data: Any) -> Response:  # noqa: ANN401
+        """Wrap the page in the response of the pagination that was used."""
+        if self.cursor_pagination is not None:
+            return self.cursor_pagination.get_paginated_response(data)
+        return super().get_paginated_response(data)
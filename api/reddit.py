@@ -0,0 +1,41 @@
+"""
+Parsing of the IDs in the URLs of Reddit posts and comments.
+
+The URLs of the submissions and transcriptions are stored as given, in any
+variant of Reddit's URL format. To look them up by an exact match, the IDs in
+them are parsed when they are written and stored in indexed columns.
+"""
+from typing import NamedTuple, Optional
+from urllib.parse import urlparse
+
+
+class RedditIds(NamedTuple):
+    """The IDs in the URL of a Reddit post or comment, all in lower case."""
+
+    subreddit: str
+    post_id: str
+    comment_id: Optional[str]
+
+
+def parse_reddit_url(url: Optional[str]) -> Optional[RedditIds]:
+    """Get the IDs of the post or comment that the URL links to.
+
+    Both the old and the new format of comment URLs are understood:
+    https://reddit.com/r/antiwork/comments/q1tlcf/work_is_work/hfgp814/
+    https://reddit.com/r/antiwork/comments/q1tlcf/comment/hfgp814/
+
+    :param url: the URL, in any variant of the format, e.g. on Old Reddit
+    :return: the IDs in the URL, or None if it is not a link to a post
+    """
+    if not url:
+        return None
+    parse_result = urlparse(url)
+    if "reddit" not in parse_result.netloc:
+        return None
+
+    # ["r", subreddit, "comments", post ID, title or "comment", comment ID]
+    parts = [part for part in parse_result.path.split("/") if part]
+    if len(parts) < 4 or parts[0] != "r" or parts[2] != "comments":
+        return None
+    comment_id = parts[5].lower() if len(parts) > 5 else None
+    return RedditIds(parts[1].lower(), parts[3].lower(), comment_id)
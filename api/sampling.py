@@ -0,0 +1,105 @@
+"""
+Random sampling of rows without loading the whole candidate set.
+
+Picking a random element of a queryset in Python reads every candidate, and
+`ORDER BY RANDOM()` makes the database sort all of them. Instead:
+
+- If there are at most `SAMPLE_PAGE_SIZE` candidates, their IDs are read with
+  a single query, in the order of the queryset or else of the primary key, so
+  that an index covering the candidates can be walked. The rows are picked
+  from them, every candidate being equally likely.
+- Otherwise a random value is drawn between the smallest and the largest ID of
+  the candidates, and the first candidate from that ID on is picked, through
+  the index of the primary key. Every pick costs the same, no matter how many
+  candidates there are, but a candidate after a gap in the IDs is more likely
+  to be picked than one right after another candidate.
+
+For the random review of transcriptions, the transcriptions served to every
+reviewer are remembered for a while, so that they are not served the same
+transcriptions over and over.
+"""
+import random
+from datetime import timedelta
+from typing import Iterable, List
+
+from django.conf import settings
+from django.db.models import Max, Min, QuerySet
+from django.utils import timezone
+
+from api.models import ReviewHistory
+
+# The number of candidates up to which all their IDs are read at once
+SAMPLE_PAGE_SIZE = 1000
+# The number of random IDs drawn per row to pick, as some of them lead to a
+# row that has been picked already
+SAMPLE_ATTEMPTS = 3
+
+
+def sample_ids(
+    queryset: QuerySet, count: int = 1, exclude: Iterable[int] = ()
+) -> List[int]:
+    """Pick random rows of the queryset without repetition.
+
+    :param queryset: the candidates to pick from, ordered like the index that
+        covers them, if any
+    :param count: the number of rows to pick
+    :param exclude: the IDs of the rows that must not be picked
+    :return: the IDs of the picked rows, fewer if there are not enough
+    """
+    candidates = queryset.exclude(id__in=list(exclude)).values_list("id", flat=True)
+    if not candidates.ordered:
+        candidates = candidates.order_by("id")
+    page = list(candidates[: SAMPLE_PAGE_SIZE + 1])
+    if len(page) <= SAMPLE_PAGE_SIZE:
+        return random.sample(page, min(count, len(page)))
+
+    candidates = candidates.order_by("id")
+    bounds = candidates.aggregate(first=Min("id"), last=Max("id"))
+    if bounds["first"] is None:
+        # The candidates have been removed meanwhile
+        return []
+    picked: List[int] = []
+    for _ in range(count * SAMPLE_ATTEMPTS):
+        random_id = random.randint(bounds["first"], bounds["last"])
+        row_id = candidates.filter(id__gte=random_id).first()
+        if row_id is not None and row_id not in picked:
+            picked.append(row_id)
+            if len(picked) == count:
+                break
+    return picked
+
+
+def get_review_history(reviewer_id: int) -> List[int]:
+    """Get the IDs of the transcriptions recently served to the reviewer.
+
+    Only the most recent `REVIEW_HISTORY_SIZE` transcriptions served in the
+    last `REVIEW_HISTORY_TIMEOUT` seconds are returned.
+
+    :param reviewer_id: the ID of the user reviewing the transcriptions
+    :return: the IDs, the most recent first
+    """
+    since = timezone.now() - timedelta(seconds=settings.REVIEW_HISTORY_TIMEOUT)
+    return list(
+        ReviewHistory.objects.filter(reviewer_id=reviewer_id, create_time__gte=since)
+        .order_by("-create_time", "-id")
+        .values_list("transcription_id", flat=True)[: settings.REVIEW_HISTORY_SIZE]
+    )
+
+
+def add_review_history(reviewer_id: int, ids: List[int]) -> None:
+    """Remember that the transcriptions were served to the reviewer.
+
+    The transcriptions served to the reviewer before the last
+    `REVIEW_HISTORY_TIMEOUT` seconds are forgotten at the same time.
+
+    :param reviewer_id: the ID of the user reviewing the transcriptions
+    :param ids: the IDs of the served transcriptions
+    """
+    since = timezone.now() - timedelta(seconds=settings.REVIEW_HISTORY_TIMEOUT)
+    ReviewHistory.objects.filter(
+        reviewer_id=reviewer_id, create_time__lt=since
+    ).delete()
+    ReviewHistory.objects.bulk_create(
+        ReviewHistory(reviewer_id=reviewer_id, transcription_id=transcription_id)
+        for transcription_id in ids
+    )
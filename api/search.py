@@ -0,0 +1,348 @@
+"""
+Full-text search over the text of the transcriptions.
+
+Filtering with `text__icontains` has to read every transcription, which gets
+slow as soon as there are more than a few thousand of them. Instead, the text
+is indexed when it is written and searched through that index:
+
+- On PostgreSQL, a `search_vector` column holds the `tsvector` of the text. It
+  is kept up to date by a trigger and backed by a GIN index. A trigram index
+  additionally speeds up the existing `icontains` filter. It needs the
+  `pg_trgm` extension, which only a superuser can create before PostgreSQL 13,
+  so it should be created up front (see `docker/init.sql`).
+- On SQLite, which is only used locally and for the tests, an FTS5 table is
+  kept in sync with the transcriptions by triggers.
+
+Neither structure is known to the Django models, they are created by
+`install_search` from a migration. The indexes on PostgreSQL are built by
+`install_search_indexes` without blocking writes, from a separate migration.
+Rows that existed before are only indexed by `backfill_search_index`, see the
+management command of that name.
+
+SQLite recreates a table for most changes of its columns, which drops the
+triggers on it. Every migration that changes the transcription table has to be
+followed by one that runs `install_search` again, like `0036_reinstall_search`.
+
+A query consists of words, which all have to be in the text. Words ending in
+`*` match every word starting with them and words between double quotes have
+to appear as that exact phrase.
+"""
+import logging
+import re
+from typing import List, NamedTuple
+
+from django.db import DatabaseError, connection
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import BooleanField, CharField, FloatField, QuerySet
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger("api.search")
+
+# The markers around the matched words in the snippets, bold in Markdown
+HIGHLIGHT_START = "**"
+HIGHLIGHT_END = "**"
+# The number of words around the matches in the snippets
+SNIPPET_WORDS = 32
+# The text search configuration used on PostgreSQL
+POSTGRES_CONFIG = "english"
+
+TRANSCRIPTION_TABLE = "api_transcription"
+FTS_TABLE = "api_transcription_fts"
+
+TERM_PATTERN = re.compile(r'"([^"]*)"?|(\S+)')
+WORD_PATTERN = re.compile(r"\w+")
+
+POSTGRES_INSTALL = [
+    f"ALTER TABLE {TRANSCRIPTION_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    f"""
+    CREATE OR REPLACE FUNCTION {TRANSCRIPTION_TABLE}_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := to_tsvector('{POSTGRES_CONFIG}', coalesce(NEW.text, ''));
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    f"DROP TRIGGER IF EXISTS search_vector_update ON {TRANSCRIPTION_TABLE}",
+    f"""
+    CREATE TRIGGER search_vector_update
+    BEFORE INSERT OR UPDATE OF text ON {TRANSCRIPTION_TABLE}
+    FOR EACH ROW EXECUTE PROCEDURE {TRANSCRIPTION_TABLE}_search_vector()
+    """,
+]
+# Built concurrently, which cannot be done inside a transaction
+POSTGRES_SEARCH_INDEX = f"""
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS transcription_search_idx
+    ON {TRANSCRIPTION_TABLE} USING GIN (search_vector)
+"""
+POSTGRES_TRIGRAM_EXTENSION = "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+POSTGRES_TRIGRAM_INDEX = f"""
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS transcription_text_trgm_idx
+    ON {TRANSCRIPTION_TABLE} USING GIN (text gin_trgm_ops)
+"""
+POSTGRES_DROP_INDEXES = [
+    "DROP INDEX CONCURRENTLY IF EXISTS transcription_text_trgm_idx",
+    "DROP INDEX CONCURRENTLY IF EXISTS transcription_search_idx",
+]
+POSTGRES_UNINSTALL = [
+    f"DROP TRIGGER IF EXISTS search_vector_update ON {TRANSCRIPTION_TABLE}",
+    f"DROP FUNCTION IF EXISTS {TRANSCRIPTION_TABLE}_search_vector()",
+    f"ALTER TABLE {TRANSCRIPTION_TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+POSTGRES_BACKFILL = f"""
+    UPDATE {TRANSCRIPTION_TABLE}
+    SET search_vector = to_tsvector('{POSTGRES_CONFIG}', coalesce(text, ''))
+    WHERE id IN (
+        SELECT id FROM {TRANSCRIPTION_TABLE}
+        WHERE search_vector IS NULL ORDER BY id LIMIT %s
+    )
+"""
+
+SQLITE_INSTALL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        text,
+        content='{TRANSCRIPTION_TABLE}',
+        content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert
+    AFTER INSERT ON {TRANSCRIPTION_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete
+    AFTER DELETE ON {TRANSCRIPTION_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text)
+        VALUES ('delete', old.id, old.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+    AFTER UPDATE OF text ON {TRANSCRIPTION_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text)
+        VALUES ('delete', old.id, old.text);
+        INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+]
+SQLITE_UNINSTALL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+SQLITE_BACKFILL = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+
+
+class Term(NamedTuple):
+    """A word or phrase of a search query."""
+
+    words: List[str]
+    prefix: bool
+
+
+def parse_query(query: str) -> List[Term]:
+    """Split the search query into its terms.
+
+    Punctuation is ignored, so a word like "don't" is searched as the phrase
+    "don t", which is how it is indexed.
+
+    :param query: the search query of the user
+    :return: the terms of the query, empty if there is nothing to search for
+    """
+    terms = []
+    for match in TERM_PATTERN.finditer(query):
+        phrase, word = match.groups()
+        if phrase is not None:
+            words, prefix = WORD_PATTERN.findall(phrase), False
+        else:
+            words, prefix = WORD_PATTERN.findall(word), word.endswith("*")
+        if words:
+            terms.append(Term(words, prefix))
+    return terms
+
+
+def _to_tsquery(terms: List[Term]) -> str:
+    """Convert the terms to the input of `to_tsquery` on PostgreSQL."""
+    parts = []
+    for term in terms:
+        words = [f"'{word}'" for word in term.words]
+        if term.prefix:
+            words[-1] += ":*"
+        parts.append(f"({' <-> '.join(words)})")
+    return " & ".join(parts)
+
+
+def _to_fts5_query(terms: List[Term]) -> str:
+    """Convert the terms to an FTS5 query on SQLite."""
+    return " ".join(
+        f'"{" ".join(term.words)}"{"*" if term.prefix else ""}' for term in terms
+    )
+
+
+def search_transcriptions(queryset: QuerySet, terms: List[Term]) -> QuerySet:
+    """Filter the transcriptions that match the terms, from best to worst.
+
+    Every transcription is annotated with the `rank` of the match, higher is
+    better, and a `snippet` of its text with the matched words highlighted.
+
+    :param queryset: the transcriptions to search
+    :param terms: the terms to search for, see `parse_query`
+    :return: the matching transcriptions, ordered by their rank and then by
+        their ID, so that the pages of the results do not overlap
+    """
+    if connection.vendor == "postgresql":
+        tsquery = _to_tsquery(terms)
+        query = f"to_tsquery('{POSTGRES_CONFIG}', %s)"
+        matches = RawSQL(
+            f"{TRANSCRIPTION_TABLE}.search_vector @@ {query}",
+            [tsquery],
+            output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            f"ts_rank({TRANSCRIPTION_TABLE}.search_vector, {query})",
+            [tsquery],
+            output_field=FloatField(),
+        )
+        snippet = RawSQL(
+            f"ts_headline('{POSTGRES_CONFIG}', coalesce({TRANSCRIPTION_TABLE}.text, ''),"
+            f" {query}, %s)",
+            [
+                tsquery,
+                f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_END}", '
+                f"MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}",
+            ],
+            output_field=CharField(),
+        )
+    else:
+        fts5_query = _to_fts5_query(terms)
+        match = (
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+            f" AND rowid = {TRANSCRIPTION_TABLE}.id"
+        )
+        matches = RawSQL(
+            f"{TRANSCRIPTION_TABLE}.id IN "
+            f"(SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)",
+            [fts5_query],
+            output_field=BooleanField(),
+        )
+        # The BM25 score of SQLite is lower for better matches
+        rank = RawSQL(
+            f"(SELECT -bm25({FTS_TABLE}) {match})",
+            [fts5_query],
+            output_field=FloatField(),
+        )
+        snippet = RawSQL(
+            f"(SELECT snippet({FTS_TABLE}, 0, %s, %s, '...', %s) {match})",
+            [HIGHLIGHT_START, HIGHLIGHT_END, SNIPPET_WORDS, fts5_query],
+            output_field=CharField(),
+        )
+
+    return (
+        queryset.filter(matches)
+        .annotate(rank=rank, snippet=snippet)
+        .order_by("-rank", "-id")
+    )
+
+
+def install_search(db: BaseDatabaseWrapper) -> None:
+    """Create the search index and the triggers maintaining it.
+
+    Installing it again is harmless. On SQLite, the index is also filled with
+    the existing transcriptions, as the databases there are small. On
+    PostgreSQL, the GIN indexes are built by `install_search_indexes`.
+
+    :param db: the database to install the search in
+    """
+    if db.vendor == "postgresql":
+        statements = POSTGRES_INSTALL
+    elif db.vendor == "sqlite":
+        statements = SQLITE_INSTALL + [SQLITE_BACKFILL]
+    else:
+        return
+    with db.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def install_search_indexes(db: BaseDatabaseWrapper) -> None:
+    """Build the indexes of the search on PostgreSQL without blocking writes.
+
+    The indexes are built concurrently, so this has to run outside of a
+    transaction, e.g. in a migration that is not atomic. If the `pg_trgm`
+    extension is missing and cannot be created, the trigram index is skipped;
+    create the extension as a superuser and run `backfill_search_index` to
+    build it later. Building the indexes again is harmless.
+
+    :param db: the database to build the indexes in
+    """
+    if db.vendor != "postgresql":
+        return
+    with db.cursor() as cursor:
+        cursor.execute(POSTGRES_SEARCH_INDEX)
+        try:
+            cursor.execute(POSTGRES_TRIGRAM_EXTENSION)
+        except DatabaseError:
+            logger.warning(
+                "The pg_trgm extension cannot be created, skipping the trigram"
+                " index. Create the extension as a superuser to build it."
+            )
+            return
+        cursor.execute(POSTGRES_TRIGRAM_INDEX)
+
+
+def uninstall_search_indexes(db: BaseDatabaseWrapper) -> None:
+    """Drop the indexes of the search on PostgreSQL without blocking writes.
+
+    :param db: the database to drop the indexes from
+    """
+    if db.vendor != "postgresql":
+        return
+    with db.cursor() as cursor:
+        for statement in POSTGRES_DROP_INDEXES:
+            cursor.execute(statement)
+
+
+def uninstall_search(db: BaseDatabaseWrapper) -> None:
+    """Remove the search index and its triggers.
+
+    :param db: the database to remove the search from
+    """
+    if db.vendor == "postgresql":
+        statements = POSTGRES_UNINSTALL
+    elif db.vendor == "sqlite":
+        statements = SQLITE_UNINSTALL
+    else:
+        return
+    with db.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def backfill_search_index(db: BaseDatabaseWrapper, batch_size: int = 1000) -> int:
+    """Index the transcriptions that were written before the search existed.
+
+    On PostgreSQL, the rows without a search vector are updated in batches,
+    each in its own transaction, so that the table is never locked for long.
+    On SQLite, the whole index is rebuilt.
+
+    :param db: the database to fill the index of
+    :param batch_size: the number of rows to update at once on PostgreSQL
+    :return: the number of indexed transcriptions
+    """
+    indexed = 0
+    with db.cursor() as cursor:
+        if db.vendor == "postgresql":
+            while True:
+                cursor.execute(POSTGRES_BACKFILL, [batch_size])
+                if not cursor.rowcount:
+                    break
+                indexed += cursor.rowcount
+        elif db.vendor == "sqlite":
+            cursor.execute(SQLITE_BACKFILL)
+            cursor.execute(f"SELECT count(*) FROM {TRANSCRIPTION_TABLE}")
+            indexed = cursor.fetchone()[0]
+    return indexed
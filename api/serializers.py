@@ -9,6 +9,7 @@ objects through the API.
 from typing import Any
 
 from django.contrib.auth.models import User
+from django.db.models import Exists, OuterRef, Prefetch, QuerySet
 from rest_framework import serializers
 
 from api.models import Source, Submission, Transcription
@@ -83,6 +84,30 @@ class SubmissionSerializer(serializers.HyperlinkedModelSerializer):
         # WTF‽
         read_only_fields = ["transcription_set"]
 
+    @staticmethod
+    def setup_eager_loading(queryset: QuerySet) -> QuerySet:
+        """
+        Load everything the serializer needs with the submissions themselves.
+
+        Without this, every serialized submission costs two more queries: one
+        for `has_ocr_transcription` and one for `transcription_set`.
+
+        :param queryset: the submissions to serialize
+        :return: the submissions, annotated and with their transcriptions
+        """
+        return queryset.annotate(
+            annotated_has_ocr_transcription=Exists(
+                Transcription.objects.filter(
+                    submission=OuterRef("pk"), author__username="transcribot"
+                )
+            )
+        ).prefetch_related(
+            Prefetch(
+                "transcription_set",
+                queryset=Transcription.objects.only("id", "submission_id"),
+            )
+        )
+
 
 class TranscriptionSerializer(serializers.HyperlinkedModelSerializer):
     author = serializers.HyperlinkedRelatedField(
@@ -105,6 +130,16 @@ class TranscriptionSerializer(serializers.HyperlinkedModelSerializer):
         )
 
 
+class TranscriptionSearchSerializer(TranscriptionSerializer):
+    """A transcription found by the full-text search, see `api.search`."""
+
+    rank = serializers.FloatField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
+
+    class Meta(TranscriptionSerializer.Meta):
+        fields = TranscriptionSerializer.Meta.fields + ("rank", "snippet")
+
+
 class FindResponseSerializer(serializers.Serializer):
     """Serializer for the response of the /find/ endpoint.
 
@@ -0,0 +1,142 @@
+import json
+from typing import Any, Dict, List
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from rest_framework import status
+
+from api.models import OutboxEvent, Submission
+from utils.test_helpers import create_submission, setup_user_client
+
+
+def _bulk_update(client: Client, headers: Dict, endpoint: str, data: Dict) -> Any:
+    """Send a bulk update to the given endpoint."""
+    return client.patch(
+        reverse(endpoint), json.dumps(data), content_type="application/json", **headers
+    )
+
+
+class TestSubmissionBulk:
+    """Tests validating the behavior of the bulk updates of submissions."""
+
+    def test_bulk_archive(self, client: Client) -> None:
+        """Verify that the result of every submission is returned in order."""
+        client, headers, _ = setup_user_client(client)
+        unarchived = create_submission(id=3)
+        archived = create_submission(id=4, archived=True)
+
+        result = _bulk_update(
+            client, headers, "submission-bulk-archive", {"submission_ids": [4, 404, 3]}
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        assert result.json() == [
+            {"id": 4, "status": "unchanged"},
+            {"id": 404, "status": "not_found"},
+            {"id": 3, "status": "updated"},
+        ]
+        unarchived.refresh_from_db()
+        archived.refresh_from_db()
+        assert unarchived.archived
+        assert archived.archived
+
+    def test_bulk_remove(self, client: Client) -> None:
+        """Verify that only the reports of changed submissions are updated."""
+        client, headers, _ = setup_user_client(client)
+        reported = create_submission(
+            id=3,
+            approved=True,
+            report_slack_channel_id="abc",
+            report_slack_message_ts="123",
+        )
+        create_submission(id=4)
+        create_submission(
+            id=5,
+            removed_from_queue=True,
+            report_slack_channel_id="abc",
+            report_slack_message_ts="456",
+        )
+
+        result = _bulk_update(
+            client, headers, "submission-bulk-remove", {"submission_ids": [3, 4, 5]}
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        assert [item["status"] for item in result.json()] == [
+            "updated",
+            "updated",
+            "unchanged",
+        ]
+        reported.refresh_from_db()
+        assert reported.removed_from_queue
+        assert not reported.approved
+        assert Submission.objects.filter(removed_from_queue=True).count() == 3
+        events = OutboxEvent.objects.filter(
+            kind=OutboxEvent.OutboxEventKind.REPORT_UPDATE
+        )
+        assert [event.payload for event in events] == [
+            {"submission_id": 3, "status": "removed"}
+        ]
+
+    def test_bulk_approve(self, client: Client) -> None:
+        """Verify that approving submissions reverts their removal."""
+        client, headers, _ = setup_user_client(client)
+        submission = create_submission(
+            id=3,
+            removed_from_queue=True,
+            report_slack_channel_id="abc",
+            report_slack_message_ts="123",
+        )
+
+        result = _bulk_update(
+            client, headers, "submission-bulk-approve", {"submission_ids": [3]}
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        assert result.json() == [{"id": 3, "status": "updated"}]
+        submission.refresh_from_db()
+        assert submission.approved
+        assert not submission.removed_from_queue
+        event = OutboxEvent.objects.get()
+        assert event.payload == {"submission_id": 3, "status": "approved"}
+
+    def test_bulk_nsfw_revert(self, client: Client) -> None:
+        """Verify that submissions can be marked as SFW again."""
+        client, headers, _ = setup_user_client(client)
+        submission = create_submission(id=3, nsfw=True)
+
+        result = _bulk_update(
+            client,
+            headers,
+            "submission-bulk-nsfw",
+            {"submission_ids": [3], "nsfw": False},
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        assert result.json() == [{"id": 3, "status": "updated"}]
+        submission.refresh_from_db()
+        assert not submission.nsfw
+        assert not OutboxEvent.objects.exists()
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {},
+            {"submission_ids": 3},
+            {"submission_ids": ["3"]},
+            {"submission_ids": [True]},
+            {"submission_ids": list(range(501))},
+            {"submission_ids": [3], "archived": "yes"},
+        ],
+    )
+    def test_bulk_invalid_data(self, client: Client, data: Dict[str, List]) -> None:
+        """Verify that invalid bulk updates are rejected without changes."""
+        client, headers, _ = setup_user_client(client)
+        submission = create_submission(id=3)
+
+        result = _bulk_update(client, headers, "submission-bulk-archive", data)
+
+        assert result.status_code == status.HTTP_400_BAD_REQUEST
+        submission.refresh_from_db()
+        assert not submission.archived
@@ -0,0 +1,120 @@
+import json
+from typing import Dict
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from utils.test_helpers import (
+    create_submission,
+    get_default_test_source,
+    setup_user_client,
+)
+
+
+class TestSubmissionBulkcheck:
+    """Tests validating the behavior of the check for new submissions."""
+
+    def test_bulkcheck_urls(self, client: Client) -> None:
+        """Verify that only the new URLs are returned, in order."""
+        client, headers, _ = setup_user_client(client)
+        create_submission(url="https://a.com/1")
+        create_submission(url="https://a.com/3", original_id="3")
+        data = {
+            "urls": [
+                "https://a.com/4",
+                "https://a.com/3",
+                "https://a.com/2",
+                "https://a.com/1",
+                "https://a.com/4",
+            ]
+        }
+
+        result = client.post(
+            reverse("submission-bulkcheck"),
+            json.dumps(data),
+            content_type="application/json",
+            **headers,
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        assert result.json() == ["https://a.com/4", "https://a.com/2"]
+
+    def test_bulkcheck_original_ids(self, client: Client) -> None:
+        """Verify that original IDs are only compared within the given source."""
+        client, headers, _ = setup_user_client(client)
+        create_submission(original_id="a")
+        create_submission(original_id="b", source=get_default_test_source("other"))
+        data = {"original_ids": ["a", "b", "c"]}
+
+        result = client.post(
+            reverse("submission-bulkcheck"),
+            json.dumps(data),
+            content_type="application/json",
+            **headers,
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        assert result.json() == ["c"]
+
+        data["source"] = get_default_test_source().pk
+        result = client.post(
+            reverse("submission-bulkcheck"),
+            json.dumps(data),
+            content_type="application/json",
+            **headers,
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        assert result.json() == ["b", "c"]
+
+    def test_bulkcheck_chunks(self, client: Client) -> None:
+        """Verify that many URLs are looked up in chunks."""
+        client, headers, _ = setup_user_client(client)
+        create_submission(url="https://a.com/7")
+        data = {"urls": [f"https://a.com/{index}" for index in range(10)]}
+
+        with patch("api.ingestion.LOOKUP_CHUNK_SIZE", 4), CaptureQueriesContext(
+            connection
+        ) as context:
+            result = client.post(
+                reverse("submission-bulkcheck"),
+                json.dumps(data),
+                content_type="application/json",
+                **headers,
+            )
+
+        assert result.status_code == status.HTTP_200_OK
+        assert len(result.json()) == 9
+        lookups = [
+            query
+            for query in context.captured_queries
+            if 'FROM "api_submission"' in query["sql"]
+        ]
+        assert len(lookups) == 3
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {},
+            {"urls": ["https://a.com"], "original_ids": ["a"]},
+            {"urls": "https://a.com"},
+            {"original_ids": [1]},
+        ],
+    )
+    def test_bulkcheck_invalid(self, client: Client, data: Dict) -> None:
+        """Verify that exactly one list of URLs or original IDs is required."""
+        client, headers, _ = setup_user_client(client)
+
+        result = client.post(
+            reverse("submission-bulkcheck"),
+            json.dumps(data),
+            content_type="application/json",
+            **headers,
+        )
+
+        assert result.status_code == status.HTTP_400_BAD_REQUEST
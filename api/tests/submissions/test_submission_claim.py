@@ -1,9 +1,18 @@
 import json
-
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from typing import Dict, List, Tuple
+from unittest.mock import patch
+
+import pytest
+from django.db import OperationalError, connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 
+from api.models import Submission
 from authentication.models import BlossomUser
 from utils.test_helpers import create_submission, create_user, setup_user_client
 
@@ -27,6 +36,32 @@ class TestSubmissionClaim:
         assert result.json()["id"] == submission.id
         assert submission.claimed_by == user
 
+    def test_claim_single_statement(self, client: Client) -> None:
+        """Test whether the submission is claimed and loaded with one statement."""
+        client, headers, user = setup_user_client(client)
+        submission = create_submission()
+        data = {"username": user.username}
+
+        with CaptureQueriesContext(connection) as context, patch(
+            "api.views.submission.connection", vendor="postgresql"
+        ):
+            result = client.patch(
+                reverse("submission-claim", args=[submission.id]),
+                data,
+                content_type="application/json",
+                **headers,
+            )
+
+        assert result.status_code == status.HTTP_201_CREATED
+        assert result.json()["id"] == submission.id
+        queries = [query["sql"] for query in context.captured_queries]
+        start = next(i for i, sql in enumerate(queries) if sql.startswith("SAVEPOINT"))
+        end = next(i for i, sql in enumerate(queries) if sql.startswith("RELEASE"))
+        # Locking the volunteer, then the update that loads the submission
+        assert len(queries[start + 1 : end]) == 2
+        assert "RETURNING" in queries[end - 1]
+        assert not any(sql.startswith('SELECT "api_submission"') for sql in queries)
+
     def test_claim_with_other_archived_claim(self, client: Client) -> None:
         """Test whether a user can claim a submission when another claim has been archived.
 
@@ -211,3 +246,79 @@ class TestSubmissionClaim:
         submission.refresh_from_db()
         assert result.status_code == status.HTTP_423_LOCKED
         assert submission.claimed_by is None
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSubmissionClaimConcurrency:
+    """Tests that hammer the claim endpoint from many threads at once."""
+
+    THREAD_COUNT = 8
+    MAX_ATTEMPTS = 100
+
+    def _claim_concurrently(
+        self, claims: List[Tuple[Client, Dict, int, str]]
+    ) -> List[int]:
+        """Send all the given claims at the same time and return the status codes."""
+        barrier = Barrier(len(claims))
+
+        def claim(thread_client: Client, headers: Dict, pk: int, username: str) -> int:
+            barrier.wait()
+            try:
+                for _ in range(self.MAX_ATTEMPTS):
+                    try:
+                        return thread_client.patch(
+                            reverse("submission-claim", args=[pk]),
+                            {"username": username},
+                            content_type="application/json",
+                            **headers,
+                        ).status_code
+                    except OperationalError:
+                        # The in-memory SQLite test database does not queue
+                        # concurrent writers, the transaction has been rolled back
+                        time.sleep(0.01)
+                raise AssertionError("The claim kept failing.")
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=len(claims)) as executor:
+            return list(executor.map(lambda args: claim(*args), claims))
+
+    def test_concurrent_claims_of_one_submission(self, client: Client) -> None:
+        """Verify that only one of many users can claim the same submission."""
+        submission = create_submission()
+        claims = []
+        for i in range(self.THREAD_COUNT):
+            thread_client, headers, user = setup_user_client(
+                Client(), id=100 + i, username=f"user-{i}"
+            )
+            claims.append((thread_client, headers, submission.id, user.username))
+
+        status_codes = self._claim_concurrently(claims)
+
+        # A retried claim can see its own earlier claim, so only check for doubles
+        assert status_codes.count(status.HTTP_201_CREATED) <= 1
+        assert set(status_codes) <= {status.HTTP_201_CREATED, status.HTTP_409_CONFLICT}
+        submission.refresh_from_db()
+        assert submission.claimed_by is not None
+
+    def test_concurrent_claims_of_one_user(self, client: Client) -> None:
+        """Verify that concurrent claims of a user respect the claim limit."""
+        _, headers, user = setup_user_client(client)
+        claims = []
+        for _ in range(self.THREAD_COUNT):
+            thread_client = Client()
+            thread_client.force_login(user)
+            claims.append(
+                (thread_client, headers, create_submission().id, user.username)
+            )
+
+        status_codes = self._claim_concurrently(claims)
+
+        # A retried claim can see its own earlier claim, so only check for doubles
+        assert status_codes.count(status.HTTP_201_CREATED) <= 1
+        assert set(status_codes) <= {
+            status.HTTP_201_CREATED,
+            status.HTTP_409_CONFLICT,
+            460,
+        }
+        assert Submission.objects.filter(claimed_by=user).count() == 1
@@ -1,4 +1,5 @@
 import json
+from typing import Any
 from unittest.mock import patch
 
 import pytest
@@ -8,7 +9,13 @@ from pytest_django.fixtures import SettingsWrapper
 from rest_framework import status
 
 from api.models import Source, Submission, Transcription
-from utils.test_helpers import get_default_test_source, setup_user_client
+from ocr.jobs import process_jobs
+from ocr.models import OCRJob
+from utils.test_helpers import (
+    create_submission,
+    get_default_test_source,
+    setup_user_client,
+)
 
 
 class TestSubmissionCreation:
@@ -35,6 +42,34 @@ class TestSubmissionCreation:
         assert submission.source == source
         assert submission.content_url == data["content_url"]
 
+    def test_create_locks_source(self, client: Client) -> None:
+        """Test whether the creation waits for the ingestions of the source."""
+        client, headers, _ = setup_user_client(client)
+        source = get_default_test_source()
+        data = {
+            "original_id": "spaaaaace",
+            "source": source.pk,
+            "content_url": "https://a.com",
+        }
+
+        def check_locked_first(locked: Source) -> None:
+            # The submission is only created while the source is locked
+            assert locked == source
+            assert not Submission.objects.exists()
+
+        with patch(
+            "api.views.submission.lock_source", side_effect=check_locked_first
+        ) as lock:
+            result = client.post(
+                reverse("submission-list"),
+                data,
+                content_type="application/json",
+                **headers,
+            )
+
+        assert result.status_code == status.HTTP_201_CREATED
+        lock.assert_called_once()
+
     def test_submission_create_with_full_args(self, client: Client) -> None:
         """Test whether creation with all arguments is successful."""
         client, headers, _ = setup_user_client(client)
@@ -149,6 +184,10 @@ class TestSubmissionCreation:
                 content_type="application/json",
                 **headers,
             )
+            # The OCR is run in the background
+            mock.assert_not_called()
+            assert Transcription.objects.count() == 0
+            process_jobs("test")
             mock.assert_called_once()
 
         assert result.status_code == status.HTTP_201_CREATED
@@ -183,6 +222,7 @@ class TestSubmissionCreation:
                 content_type="application/json",
                 **headers,
             )
+            process_jobs("test")
             mock.assert_not_called()
 
         assert result.status_code == status.HTTP_201_CREATED
@@ -211,8 +251,137 @@ class TestSubmissionCreation:
                 content_type="application/json",
                 **headers,
             )
+            process_jobs("test")
             mock.assert_called_once()
 
         assert result.status_code == status.HTTP_201_CREATED
         assert Transcription.objects.count() == 0
-        assert result.json().get("cannot_ocr") is True
+        assert Submission.objects.get(id=result.json()["id"]).cannot_ocr is True
+
+
+class TestSubmissionBulkCreation:
+    """Tests validating the creation of many submissions at once."""
+
+    def test_bulk_create(self, client: Client, settings: SettingsWrapper) -> None:
+        """Test whether only new submissions are created and get an OCR job."""
+        settings.ENABLE_OCR = True
+        settings.IMAGE_DOMAINS = ["example.com"]
+        client, headers, _ = setup_user_client(client)
+        source = get_default_test_source()
+        known = create_submission(original_id="known", source=source)
+        reposted = create_submission(original_id="old", url="https://a.com/post")
+        data = {
+            "source": source.pk,
+            "submissions": [
+                {"original_id": "image", "content_url": "https://example.com/a.jpg"},
+                {"original_id": "known", "content_url": "https://b.com"},
+                {
+                    "original_id": "reposted",
+                    "url": "https://a.com/post",
+                    "content_url": "https://b.com",
+                },
+                {
+                    "original_id": "page",
+                    "url": "https://a.com/page",
+                    "content_url": "https://b.com",
+                    "nsfw": True,
+                },
+                {"original_id": "image", "content_url": "https://example.com/a.jpg"},
+            ],
+        }
+
+        result = client.post(
+            reverse("submission-bulk-create"),
+            json.dumps(data),
+            content_type="application/json",
+            **headers,
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        image = Submission.objects.get(original_id="image")
+        page = Submission.objects.get(original_id="page")
+        assert result.json() == [
+            {"id": image.id, "original_id": "image", "status": "created"},
+            {"id": known.id, "original_id": "known", "status": "exists"},
+            {"id": reposted.id, "original_id": "reposted", "status": "exists"},
+            {"id": page.id, "original_id": "page", "status": "created"},
+            {"id": image.id, "original_id": "image", "status": "exists"},
+        ]
+        assert page.nsfw
+        assert page.source == source
+        assert [job.submission for job in OCRJob.objects.all()] == [image]
+
+        # Sending the same submissions again does not create anything
+        result = client.post(
+            reverse("submission-bulk-create"),
+            json.dumps(data),
+            content_type="application/json",
+            **headers,
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        assert {item["status"] for item in result.json()} == {"exists"}
+        assert Submission.objects.count() == 4
+        assert OCRJob.objects.count() == 1
+
+    def test_bulk_create_queries(
+        self,
+        client: Client,
+        settings: SettingsWrapper,
+        django_assert_max_num_queries: Any,
+    ) -> None:
+        """Test whether the number of queries does not grow with the batch."""
+        settings.ENABLE_OCR = True
+        settings.IMAGE_DOMAINS = ["example.com"]
+        client, headers, _ = setup_user_client(client)
+        data = {
+            "source": get_default_test_source().pk,
+            "submissions": [
+                {
+                    "original_id": str(i),
+                    "url": f"https://a.com/{i}",
+                    "content_url": f"https://example.com/{i}.jpg",
+                }
+                for i in range(50)
+            ],
+        }
+
+        with django_assert_max_num_queries(12):
+            result = client.post(
+                reverse("submission-bulk-create"),
+                json.dumps(data),
+                content_type="application/json",
+                **headers,
+            )
+
+        assert result.status_code == status.HTTP_200_OK
+        assert Submission.objects.count() == 50
+        assert OCRJob.objects.count() == 50
+
+    @pytest.mark.parametrize(
+        "submissions",
+        [
+            {"original_id": "a", "content_url": "https://a.com"},
+            [{"original_id": "a"}],
+            [{"original_id": "a", "content_url": "https://a.com", "title": 1}],
+            [{"original_id": "a" * 37, "content_url": "https://a.com"}],
+            [
+                {"original_id": str(i), "content_url": "https://a.com"}
+                for i in range(501)
+            ],
+        ],
+    )
+    def test_bulk_create_invalid(self, client: Client, submissions: object) -> None:
+        """Test whether nothing is created if any of the submissions is invalid."""
+        client, headers, _ = setup_user_client(client)
+        data = {"source": get_default_test_source().pk, "submissions": submissions}
+
+        result = client.post(
+            reverse("submission-bulk-create"),
+            json.dumps(data),
+            content_type="application/json",
+            **headers,
+        )
+
+        assert result.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Submission.objects.exists()
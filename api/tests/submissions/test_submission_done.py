@@ -6,6 +6,7 @@ from django.test import Client
 from django.urls import reverse
 from rest_framework import status
 
+from api.outbox import process_events
 from utils.test_helpers import (
     create_submission,
     create_transcription,
@@ -24,7 +25,7 @@ class TestSubmissionDone:
         create_transcription(submission, user)
         data = {"username": user.username}
 
-        with patch("api.views.submission.send_check_message"):
+        with patch("api.outbox.send_check_message"):
             result = client.patch(
                 reverse("submission-done", args=[submission.id]),
                 json.dumps(data),
@@ -141,7 +142,7 @@ class TestSubmissionDone:
         with patch(
             "authentication.models.BlossomUser.should_check_transcription",
             return_value=should_check_transcription,
-        ), patch("api.views.submission.send_check_message") as mock:
+        ), patch("api.outbox.send_check_message") as mock:
             client, headers, user = setup_user_client(client)
             submission = create_submission(url="abc", tor_url="def", claimed_by=user)
             create_transcription(submission, user, url="ghi")
@@ -153,6 +154,9 @@ class TestSubmissionDone:
                 **headers,
             )
             assert result.status_code == status.HTTP_201_CREATED
+            # The check is sent in the background
+            assert mock.call_count == 0
+            process_events()
             if should_check_transcription:
                 assert mock.call_count == 1
             else:
@@ -190,6 +194,9 @@ class TestSubmissionDone:
                 **headers,
             )
             assert result.status_code == status.HTTP_201_CREATED
+            # The rank up message is sent in the background
+            assert mock.call_count == 0
+            process_events()
 
             if expected:
                 assert mock.call_count == 1
@@ -99,6 +99,39 @@ class TestSubmissionExpired:
         assert len(result.json()) == 1
         assert result.json()[0]["id"] == submission3.id
 
+    def test_expired_with_cursor(self, client: Client) -> None:
+        """Check that the expired submissions can be paged through, oldest first."""
+        client, headers, _ = setup_user_client(client)
+        reddit, _ = Source.objects.get_or_create(name="reddit")
+        submissions = [
+            create_submission(
+                create_time=timezone.now() - timezone.timedelta(days=days),
+                source=reddit,
+            )
+            for days in [2, 4, 3]
+        ]
+
+        result = client.get(
+            reverse("submission-expired") + "?source=reddit",
+            content_type="application/json",
+            **headers,
+        )
+        assert result.status_code == status.HTTP_200_OK
+        expected = [submissions[1].id, submissions[2].id, submissions[0].id]
+        assert [item["id"] for item in result.json()] == expected
+
+        url = (
+            reverse("submission-expired")
+            + "?source=reddit&pagination=cursor&page_size=2"
+        )
+        ids = []
+        while url:
+            result = client.get(url, content_type="application/json", **headers)
+            assert result.status_code == status.HTTP_200_OK
+            ids += [item["id"] for item in result.json()["results"]]
+            url = result.json()["next"]
+        assert ids == expected
+
     def test_expired_invalid_time(self, client: Client) -> None:
         """Check that requesting an invalid time will return an error."""
         client, headers, _ = setup_user_client(client)
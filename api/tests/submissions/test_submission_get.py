@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 import pytest
 from django.test import Client
@@ -334,3 +334,46 @@ class TestSubmissionGet:
         )
         assert result.status_code == status.HTTP_200_OK
         assert len(result.json()["results"]) == result_count
+
+    @pytest.mark.parametrize(
+        "ordering,expected",
+        [
+            (None, [1, 2, 3, 4, 5]),
+            ("-id", [5, 4, 3, 2, 1]),
+            ("create_time", [3, 5, 1, 2, 4]),
+            ("-create_time", [4, 2, 1, 5, 3]),
+        ],
+    )
+    def test_list_with_cursor(
+        self, client: Client, ordering: Optional[str], expected: List[int]
+    ) -> None:
+        """Verify that the submissions can be scanned through with a cursor."""
+        client, headers, _ = setup_user_client(client)
+        for day in [3, 4, 1, 5, 2]:
+            create_submission(create_time=make_aware(datetime(2021, 6, day)))
+
+        url = reverse("submission-list") + "?pagination=cursor&page_size=2"
+        if ordering:
+            url += f"&ordering={ordering}"
+        ids = []
+        while url:
+            result = client.get(url, content_type="application/json", **headers)
+            assert result.status_code == status.HTTP_200_OK
+            assert "count" not in result.json()
+            ids += [submission["id"] for submission in result.json()["results"]]
+            url = result.json()["next"]
+
+        assert ids == expected
+
+    def test_list_with_cursor_invalid_ordering(self, client: Client) -> None:
+        """Verify that a cursor cannot be used with orderings without an index."""
+        client, headers, _ = setup_user_client(client)
+        create_submission()
+
+        result = client.get(
+            reverse("submission-list") + "?pagination=cursor&ordering=title",
+            content_type="application/json",
+            **headers,
+        )
+
+        assert result.status_code == status.HTTP_400_BAD_REQUEST
@@ -92,6 +92,35 @@ class TestSubmissionsInProgress:
         assert len(result.json()) == 1
         assert result.json()[0]["id"] == submission.id
 
+    def test_in_progress_with_cursor(self, client: Client) -> None:
+        """Verify that the next page continues after the previous one."""
+        client, headers, user = setup_user_client(client)
+        reddit, _ = Source.objects.get_or_create(name="reddit")
+        first, second = [
+            create_submission(
+                claimed_by=user,
+                claim_time=timezone.now() - timezone.timedelta(hours=hours),
+                source=reddit,
+            )
+            for hours in [6, 5]
+        ]
+
+        result = client.get(
+            reverse("submission-in-progress")
+            + "?source=reddit&pagination=cursor&page_size=1",
+            content_type="application/json",
+            **headers,
+        )
+        assert result.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in result.json()["results"]] == [first.id]
+
+        result = client.get(
+            result.json()["next"], content_type="application/json", **headers
+        )
+        assert result.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in result.json()["results"]] == [second.id]
+        assert result.json()["next"] is None
+
     def test_missing_source(self, client: Client) -> None:
         """Verify that requesting unarchived posts without a source errors out."""
         client, headers, user = setup_user_client(client)
@@ -1,15 +1,40 @@
-from datetime import datetime
+import json
+from datetime import datetime, timedelta
 from typing import Any, Dict, List, Union
+from unittest.mock import patch
 
 import pytest
 import pytz
-from django.test import Client
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import Client, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.timezone import make_aware
 from rest_framework import status
 
+from api.leaderboard import (
+    LEADERBOARDS,
+    gamma_ranking,
+    get_entry,
+    get_leaderboard_start,
+    get_named_leaderboard,
+    get_window_rank,
+    submission_ranking,
+)
+from api.models import Source, Submission
 from authentication.models import BlossomUser
-from utils.test_helpers import create_submission, create_user, setup_user_client
+from utils.test_helpers import (
+    create_submission,
+    create_transcription,
+    create_user,
+    setup_user_client,
+)
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "shared": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
 
 
 def extract_ids(results: List[Dict[str, Any]]) -> List[int]:
@@ -163,3 +188,277 @@ class TestSubmissionLeaderboard:
             "rank": 1,
             "date_joined": "2021-11-03T00:00:00Z",
         }
+
+    def test_leaderboard_windows(self, client: Client) -> None:
+        """Test that the windows around the user have the requested sizes."""
+        BlossomUser.objects.all().delete()
+        client, headers, _ = setup_user_client(client, id=99999, is_volunteer=False)
+
+        for user_id in range(1, 11):
+            cur_user = create_user(id=user_id, username=f"user-{user_id}")
+            for _ in range(user_id):
+                create_submission(completed_by=cur_user)
+
+        results = client.get(
+            reverse("submission-leaderboard")
+            + "?user_id=5&top_count=2&above_count=3&below_count=1",
+            content_type="application/json",
+            **headers,
+        )
+
+        assert results.status_code == status.HTTP_200_OK
+        results = results.json()
+        assert [(res["id"], res["rank"]) for res in results["top"]] == [(10, 1), (9, 2)]
+        assert [(res["id"], res["rank"]) for res in results["above"]] == [
+            (8, 3),
+            (7, 4),
+            (6, 5),
+        ]
+        assert (results["user"]["id"], results["user"]["rank"]) == (5, 6)
+        assert [(res["id"], res["rank"]) for res in results["below"]] == [(4, 7)]
+
+    def test_leaderboard_follows_reverted_submissions(self, client: Client) -> None:
+        """Test that the ranking is updated when a completion is reverted."""
+        BlossomUser.objects.all().delete()
+        client, headers, _ = setup_user_client(client, id=99999, is_volunteer=False)
+        first = create_user(id=1, username="user-1")
+        second = create_user(id=2, username="user-2")
+        submissions = [create_submission(completed_by=first) for _ in range(2)]
+        create_submission(completed_by=second)
+
+        for submission in submissions:
+            submission.completed_by = None
+            submission.save()
+
+        results = client.get(
+            reverse("submission-leaderboard") + "?user_id=1",
+            content_type="application/json",
+            **headers,
+        )
+
+        assert results.status_code == status.HTTP_200_OK
+        results = results.json()
+        assert extract_ids(results["top"]) == [2]
+        assert results["user"]["gamma"] == 0
+        assert results["user"]["rank"] == 2
+        assert extract_ids(results["above"]) == [2]
+        assert results["below"] == []
+
+    def test_window_rank(self) -> None:
+        """Test that the window function ranks like the count of the entries ahead."""
+        BlossomUser.objects.all().delete()
+        gammas = {1: 3, 2: 5, 3: 3, 4: 1}
+        for user_id, gamma in gammas.items():
+            user = create_user(
+                id=user_id,
+                username=f"user-{user_id}",
+                date_joined=make_aware(datetime(2021, 11, user_id)),
+            )
+            for _ in range(gamma):
+                create_submission(completed_by=user)
+        unranked = create_user(id=5, username="user-5")
+
+        for ranking in [gamma_ranking(), submission_ranking(Submission.objects.all())]:
+            ranks = {
+                user_id: get_window_rank(ranking, user_id) for user_id in gammas
+            }
+            assert ranks == {1: 3, 2: 1, 3: 2, 4: 4}
+            for user in BlossomUser.objects.filter(id__in=gammas):
+                assert get_entry(ranking, user)["rank"] == ranks[user.id]
+            assert get_window_rank(ranking, unranked.id) is None
+
+    def test_leaderboard_unknown_user(self, client: Client) -> None:
+        """Test that a 404 is returned for users that do not exist."""
+        client, headers, _ = setup_user_client(client, id=99999, is_volunteer=False)
+
+        results = client.get(
+            reverse("submission-leaderboard") + "?user_id=404",
+            content_type="application/json",
+            **headers,
+        )
+
+        assert results.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_leaderboard_query_count(
+        self, client: Client, django_assert_max_num_queries: Any
+    ) -> None:
+        """Test that the number of queries does not depend on the user count."""
+        BlossomUser.objects.all().delete()
+        client, headers, _ = setup_user_client(client, id=99999, is_volunteer=False)
+        for user_id in range(1, 21):
+            create_submission(
+                completed_by=create_user(id=user_id, username=f"user-{user_id}")
+            )
+
+        with django_assert_max_num_queries(10):
+            results = client.get(
+                reverse("submission-leaderboard") + "?user_id=10",
+                content_type="application/json",
+                **headers,
+            )
+
+        assert results.status_code == status.HTTP_200_OK
+
+
+class TestNamedLeaderboards:
+    """Tests to validate the behavior of the precomputed leaderboards."""
+
+    def test_leaderboard_start(self) -> None:
+        """Test that the periods of the leaderboards start as expected."""
+        # Wednesday
+        now = datetime(2021, 11, 17, 15, 30, tzinfo=pytz.UTC)
+
+        assert get_leaderboard_start("week", now) == datetime(
+            2021, 11, 15, tzinfo=pytz.UTC
+        )
+        assert get_leaderboard_start("month", now) == datetime(
+            2021, 11, 1, tzinfo=pytz.UTC
+        )
+        assert get_leaderboard_start("all_time", now) is None
+
+    def test_weekly_leaderboard(self, client: Client) -> None:
+        """Test that the weekly leaderboard only counts this week's completions."""
+        BlossomUser.objects.all().delete()
+        client, headers, _ = setup_user_client(client, id=99999, is_volunteer=False)
+        first = create_user(id=1, username="user-1")
+        second = create_user(id=2, username="user-2")
+        week_start = get_leaderboard_start("week")
+        for _ in range(3):
+            create_submission(
+                completed_by=first, complete_time=week_start - timedelta(hours=1)
+            )
+        create_submission(completed_by=first, complete_time=week_start)
+        for _ in range(2):
+            create_submission(completed_by=second, complete_time=timezone.now())
+
+        results = client.get(
+            reverse("submission-leaderboard") + "?board=week&user_id=1",
+            content_type="application/json",
+            **headers,
+        )
+
+        assert results.status_code == status.HTTP_200_OK
+        results = results.json()
+        assert [(res["id"], res["gamma"]) for res in results["top"]] == [
+            (2, 2),
+            (1, 1),
+        ]
+        assert results["user"]["rank"] == 2
+        assert extract_ids(results["above"]) == [2]
+        assert results["below"] == []
+
+    def test_source_leaderboard(self, client: Client) -> None:
+        """Test that the leaderboard can be limited to a source."""
+        BlossomUser.objects.all().delete()
+        client, headers, _ = setup_user_client(client, id=99999, is_volunteer=False)
+        other_source = Source.objects.create(name="other")
+        first = create_user(id=1, username="user-1")
+        second = create_user(id=2, username="user-2")
+        for _ in range(3):
+            create_submission(completed_by=first, complete_time=timezone.now())
+        create_submission(
+            completed_by=second, complete_time=timezone.now(), source=other_source
+        )
+
+        results = client.get(
+            reverse("submission-leaderboard") + "?board=all_time&source=other",
+            content_type="application/json",
+            **headers,
+        )
+
+        assert results.status_code == status.HTTP_200_OK
+        assert extract_ids(results.json()["top"]) == [2]
+
+    def test_unknown_leaderboard(self, client: Client) -> None:
+        """Test that unknown leaderboards are rejected."""
+        client, headers, _ = setup_user_client(client, id=99999, is_volunteer=False)
+
+        results = client.get(
+            reverse("submission-leaderboard") + "?board=decade",
+            content_type="application/json",
+            **headers,
+        )
+
+        assert results.status_code == status.HTTP_400_BAD_REQUEST
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_cached_leaderboard(
+        self, client: Client, django_assert_num_queries: Any
+    ) -> None:
+        """Test that cached leaderboards are read without queries."""
+        caches["shared"].clear()
+        BlossomUser.objects.all().delete()
+        user = create_user(id=1, username="user-1")
+        create_submission(completed_by=user, complete_time=timezone.now())
+
+        get_named_leaderboard("month")
+        with django_assert_num_queries(0):
+            leaderboard = get_named_leaderboard("month")
+
+        assert extract_ids(leaderboard.top(5)) == [1]
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_leaderboard_invalidated_on_done(
+        self, client: Client, django_capture_on_commit_callbacks: Any
+    ) -> None:
+        """Test that completing a submission invalidates the cached leaderboards."""
+        caches["shared"].clear()
+        BlossomUser.objects.all().delete()
+        client, headers, user = setup_user_client(client, id=1, username="user-1")
+        submission = create_submission(claimed_by=user)
+        create_transcription(submission, user)
+
+        assert get_named_leaderboard("week").top(5) == []
+
+        with patch("api.outbox.send_check_message"), (
+            django_capture_on_commit_callbacks(execute=True)
+        ):
+            result = client.patch(
+                reverse("submission-done", args=[submission.id]),
+                json.dumps({"username": user.username}),
+                content_type="application/json",
+                **headers,
+            )
+
+        assert result.status_code == status.HTTP_201_CREATED
+        assert extract_ids(get_named_leaderboard("week").top(5)) == [1]
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    @pytest.mark.parametrize("change", ["revert", "delete"])
+    def test_leaderboard_invalidated_on_gamma_change(
+        self, client: Client, django_capture_on_commit_callbacks: Any, change: str
+    ) -> None:
+        """Test that the cached leaderboards are invalidated by any gamma change."""
+        caches["shared"].clear()
+        BlossomUser.objects.all().delete()
+        user = create_user(id=1, username="user-1")
+        submission = create_submission(completed_by=user, complete_time=timezone.now())
+
+        assert extract_ids(get_named_leaderboard("all_time").top(5)) == [1]
+        assert extract_ids(get_named_leaderboard("week").top(5)) == [1]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            if change == "revert":
+                submission.completed_by = None
+                submission.save()
+            else:
+                Submission.objects.filter(id=submission.id).delete()
+
+        assert get_named_leaderboard("all_time").top(5) == []
+        assert get_named_leaderboard("week").top(5) == []
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_precompute_leaderboards(
+        self, client: Client, django_assert_num_queries: Any
+    ) -> None:
+        """Test that the precomputed leaderboards are read without queries."""
+        caches["shared"].clear()
+        BlossomUser.objects.all().delete()
+        user = create_user(id=1, username="user-1")
+        create_submission(completed_by=user, complete_time=timezone.now())
+
+        call_command("precompute_leaderboards", "--once")
+        with django_assert_num_queries(0):
+            leaderboards = [get_named_leaderboard(name) for name in LEADERBOARDS]
+
+        assert [extract_ids(board.top(5)) for board in leaderboards] == [[1]] * 3
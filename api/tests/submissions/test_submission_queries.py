@@ -0,0 +1,81 @@
+from datetime import timedelta
+from typing import Dict
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from api.models import get_source
+from authentication.models import BlossomUser
+from utils.test_helpers import (
+    create_submission,
+    create_transcription,
+    setup_user_client,
+)
+
+# The endpoints and the fields of the submissions they return
+ENDPOINTS = {
+    "submission-list": {},
+    "submission-expired": {"create_time": timedelta(days=3)},
+    "submission-in-progress": {"claim_time": timedelta(hours=5), "claimed": True},
+    "submission-unarchived": {"complete_time": timedelta(days=1), "completed": True},
+}
+
+
+def _create_submissions(start: int, stop: int, fields: Dict) -> None:
+    """Create submissions with an OCR and a volunteer transcription each."""
+    transcribot = BlossomUser.objects.get(username="transcribot")
+    volunteer, _ = BlossomUser.objects.get_or_create(id=100, username="volunteer")
+    reddit = get_source("reddit")
+    now = timezone.now()
+    for index in range(start, stop):
+        submission = create_submission(
+            original_id=f"submission_{index}",
+            create_time=now - fields.get("create_time", timedelta()),
+            claim_time=now - fields["claim_time"] if "claim_time" in fields else None,
+            complete_time=(
+                now - fields["complete_time"] if "complete_time" in fields else None
+            ),
+            claimed_by=volunteer if fields.get("claimed") else None,
+            source=reddit,
+            completed_by=volunteer if fields.get("completed") else None,
+        )
+        create_transcription(submission, transcribot, original_id=f"ocr_{index}")
+        create_transcription(submission, volunteer, original_id=f"tr_{index}")
+
+
+def _count_queries(client: Client, headers: Dict, endpoint: str, count: int) -> int:
+    """Get the given number of submissions from the endpoint, counting the queries."""
+    with CaptureQueriesContext(connection) as context:
+        result = client.get(
+            reverse(endpoint) + "?source=reddit&page_size=100",
+            content_type="application/json",
+            **headers,
+        )
+    assert result.status_code == status.HTTP_200_OK
+    data = result.json()
+    submissions = data["results"] if "results" in data else data
+    assert len(submissions) == count
+    for submission in submissions:
+        assert submission["has_ocr_transcription"]
+        assert len(submission["transcription_set"]) == 2
+    return len(context.captured_queries)
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_constant_queries(client: Client, endpoint: str) -> None:
+    """Verify that the number of queries does not depend on the page size."""
+    client, headers, _ = setup_user_client(client)
+    _create_submissions(0, 1, ENDPOINTS[endpoint])
+    # Load the caches that are filled on the first request
+    _count_queries(client, headers, endpoint, 1)
+
+    few = _count_queries(client, headers, endpoint, 1)
+    _create_submissions(1, 20, ENDPOINTS[endpoint])
+    many = _count_queries(client, headers, endpoint, 20)
+
+    assert few == many
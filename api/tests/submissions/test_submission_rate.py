@@ -125,6 +125,35 @@ class TestSubmissionRate:
         assert response["previous"] is not None
         assert response["next"] is not None
 
+    def test_pagination_with_cursor(self, client: Client) -> None:
+        """Verify that the rate can be scanned through with a cursor."""
+        client, headers, user = setup_user_client(client, id=123456)
+        for day in range(1, 4):
+            date = make_aware(datetime(2021, 6, day))
+            create_transcription(
+                create_submission(completed_by=user, complete_time=date),
+                user,
+                create_time=date,
+            )
+
+        url = (
+            reverse("submission-rate")
+            + "?pagination=cursor&page_size=2&completed_by=123456"
+        )
+        dates = []
+        while url:
+            result = client.get(url, content_type="application/json", **headers)
+            assert result.status_code == status.HTTP_200_OK
+            assert "count" not in result.json()
+            dates += [rate["date"] for rate in result.json()["results"]]
+            url = result.json()["next"]
+
+        assert dates == [
+            "2021-06-01T00:00:00Z",
+            "2021-06-02T00:00:00Z",
+            "2021-06-03T00:00:00Z",
+        ]
+
     @pytest.mark.parametrize(
         "time_frame,dates,results",
         [
@@ -64,6 +64,36 @@ class TestSubmissionsUnarchived:
         assert len(result.json()) == 1
         assert result.json()[0]["id"] == submission.id
 
+    def test_unarchived_with_cursor(self, client: Client) -> None:
+        """Test whether the next page continues after the previous one."""
+        client, headers, user = setup_user_client(client)
+        reddit, _ = Source.objects.get_or_create(name="reddit")
+        first, second = [
+            create_submission(
+                completed_by=user,
+                complete_time=timezone.now() - timezone.timedelta(hours=hours),
+                archived=False,
+                source=reddit,
+            )
+            for hours in [3, 2]
+        ]
+
+        result = client.get(
+            reverse("submission-unarchived")
+            + "?source=reddit&pagination=cursor&page_size=1",
+            content_type="application/json",
+            **headers,
+        )
+        assert result.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in result.json()["results"]] == [first.id]
+
+        result = client.get(
+            result.json()["next"], content_type="application/json", **headers
+        )
+        assert result.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in result.json()["results"]] == [second.id]
+        assert result.json()["next"] is None
+
     def test_missing_source(self, client: Client) -> None:
         """Verify that requesting unarchived posts without a source errors out."""
         client, headers, user = setup_user_client(client)
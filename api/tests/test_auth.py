@@ -28,10 +28,18 @@ def test_creation_without_api_key(client: Client) -> None:
     assert result.status_code == status.HTTP_403_FORBIDDEN
 
 
-def test_creation_without_login(client: Client) -> None:
-    """Test whether creation without logging in to an allowed user is forbidden."""
+def test_creation_with_only_api_key(client: Client) -> None:
+    """Test whether the API key alone authenticates the staff member owning it."""
     client, headers, _ = setup_user_client(client, login=False)
     result = client.post(reverse("volunteer-list"), USER_CREATION_DATA, **headers)
+    assert result.status_code == status.HTTP_201_CREATED
+
+
+def test_creation_with_invalid_api_key(client: Client) -> None:
+    """Test whether creation with an invalid API key and no login is forbidden."""
+    client, headers, _ = setup_user_client(client, login=False)
+    headers["HTTP_AUTHORIZATION"] += "x"
+    result = client.post(reverse("volunteer-list"), USER_CREATION_DATA, **headers)
     assert result.status_code == status.HTTP_403_FORBIDDEN
 
 
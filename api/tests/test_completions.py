@@ -0,0 +1,160 @@
+from datetime import datetime, timezone
+
+from django.db.models.functions import TruncDay
+from django.test import Client
+from django.urls import reverse
+from rest_framework import status
+
+from api.completions import (
+    count_completions,
+    count_completions_by,
+    find_rollup_drift,
+    rebuild_completion_rollups,
+)
+from api.models import CompletionRollup
+from utils.test_helpers import create_submission, create_user, setup_user_client
+
+
+def _time(day: int, hour: int, minute: int = 0) -> datetime:
+    """Create an aware time in June 2021."""
+    return datetime(2021, 6, day, hour, minute, tzinfo=timezone.utc)
+
+
+class TestCompletionRollups:
+    """Tests to validate that the completion rollups are kept in sync."""
+
+    def test_rollup_on_completion(self) -> None:
+        """Verify that completing a submission increments its bucket."""
+        user = create_user()
+        create_submission(completed_by=user, complete_time=_time(1, 10, 5))
+        create_submission(completed_by=user, complete_time=_time(1, 10, 55))
+        create_submission(completed_by=user, complete_time=_time(1, 11, 0))
+
+        buckets = CompletionRollup.objects.order_by("bucket_start")
+        assert [(b.bucket_start, b.count) for b in buckets] == [
+            (_time(1, 10), 2),
+            (_time(1, 11), 1),
+        ]
+
+    def test_rollup_on_reassignment(self) -> None:
+        """Verify that moving a completion moves it to the new bucket."""
+        user = create_user(id=100, username="one")
+        other_user = create_user(id=200, username="two")
+        submission = create_submission(completed_by=user, complete_time=_time(1, 10))
+
+        submission.completed_by = other_user
+        submission.complete_time = _time(2, 3)
+        submission.save()
+
+        bucket = CompletionRollup.objects.get(count__gt=0)
+        assert bucket.user == other_user
+        assert bucket.bucket_start == _time(2, 3)
+        assert not find_rollup_drift()
+
+    def test_rollup_on_delete(self) -> None:
+        """Verify that deleting a completed submission decrements its bucket."""
+        user = create_user()
+        submission = create_submission(completed_by=user, complete_time=_time(1, 10))
+
+        submission.delete()
+
+        assert count_completions(completed_by=user.id) == 0
+        assert not find_rollup_drift()
+
+    def test_count_completions_edges(self) -> None:
+        """Verify that partially covered hours are counted exactly."""
+        user = create_user()
+        for time in [
+            _time(1, 9, 59),
+            _time(1, 10, 30),
+            _time(1, 11, 0),
+            _time(1, 11, 59),
+            _time(1, 12, 0),
+            _time(1, 13, 10),
+        ]:
+            create_submission(completed_by=user, complete_time=time)
+
+        assert count_completions(completed_by=user.id) == 6
+        assert (
+            count_completions(
+                completed_by=user.id,
+                lower=(_time(1, 10, 30), True),
+                upper=(_time(1, 12, 0), False),
+            )
+            == 3
+        )
+        assert (
+            count_completions(
+                completed_by=user.id,
+                lower=(_time(1, 10, 30), False),
+                upper=(_time(1, 12, 0), True),
+            )
+            == 3
+        )
+        assert count_completions(completed_by=user.id, lower=(_time(1, 11), True)) == 4
+        assert count_completions(completed_by=user.id, upper=(_time(1, 11), False)) == 2
+
+    def test_count_completions_by(self) -> None:
+        """Verify that the grouped counts include the raw edge hours."""
+        user = create_user()
+        for time in [_time(1, 10, 30), _time(1, 23, 0), _time(2, 0, 15), _time(2, 5)]:
+            create_submission(completed_by=user, complete_time=time)
+
+        result = count_completions_by(
+            lambda field: {"date": TruncDay(field, tzinfo=timezone.utc)},
+            completed_by=user.id,
+            lower=(_time(1, 10, 45), True),
+            upper=(_time(2, 0, 30), True),
+        )
+
+        assert result == [
+            {"date": _time(1, 0), "count": 1},
+            {"date": _time(2, 0), "count": 1},
+        ]
+
+    def test_rebuild_completion_rollups(self) -> None:
+        """Verify that drifted rollups are detected and rebuilt."""
+        user = create_user()
+        create_submission(completed_by=user, complete_time=_time(1, 10))
+        create_submission(completed_by=user, complete_time=_time(1, 12))
+        CompletionRollup.objects.filter(bucket_start=_time(1, 10)).update(count=5)
+        CompletionRollup.objects.filter(bucket_start=_time(1, 12)).delete()
+
+        drift = find_rollup_drift()
+        assert [(key[2], expected, actual) for key, expected, actual in drift] == [
+            (_time(1, 10), 1, 5),
+            (_time(1, 12), 1, 0),
+        ]
+
+        assert rebuild_completion_rollups() == 2
+        assert not find_rollup_drift()
+
+
+class TestRateFromRollups:
+    """Tests to validate that the rate is served correctly from the rollups."""
+
+    def test_rate_matches_raw_submissions(self, client: Client) -> None:
+        """Verify that the rollups give the same rate as the raw submissions."""
+        client, headers, user = setup_user_client(client, accepted_coc=True, id=123456)
+        for time in [_time(1, 10, 30), _time(1, 10, 45), _time(1, 11, 5), _time(1, 14)]:
+            create_submission(completed_by=user, complete_time=time)
+
+        query = (
+            "?completed_by=123456&time_frame=hour&utc_offset=3600"
+            "&complete_time__gte=2021-06-01T10:40:00Z"
+        )
+        from_rollups = client.get(
+            reverse("submission-rate") + query,
+            content_type="application/json",
+            **headers,
+        )
+        # Filtering by another field forces the raw submissions to be used
+        from_submissions = client.get(
+            reverse("submission-rate") + query + "&removed_from_queue=false",
+            content_type="application/json",
+            **headers,
+        )
+
+        assert from_rollups.status_code == status.HTTP_200_OK
+        assert from_rollups.json() == from_submissions.json()
+        assert [row["count"] for row in from_rollups.json()["results"]] == [1, 1, 1]
@@ -1,13 +1,23 @@
 # Disable line length restrictions to allow long URLs
 # flake8: noqa: E501
-from typing import Optional
+import json
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
 
 import pytest
+from django.db import connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 
-from api.views.find import extract_core_url, find_by_submission_url, normalize_url
+from api.reddit import RedditIds, parse_reddit_url
+from api.views.find import (
+    find_by_submission_url,
+    find_by_url,
+    normalize_url,
+)
 from utils.test_helpers import (
     create_submission,
     create_transcription,
@@ -63,17 +73,6 @@ def test_normalize_url(url: str, expected: Optional[str]) -> None:
     assert actual == expected
 
 
-def test_extract_core_url() -> None:
-    """Verify that the core URL is extracted correctly."""
-    url = (
-        "https://reddit.com/r/TranscribersOfReddit/comments/plmx5n/"
-        + "curatedtumblr_image_im_an_atheist_but_yall_need/"
-    )
-    expected = "https://reddit.com/r/TranscribersOfReddit/comments/plmx5n"
-    actual = extract_core_url(url)
-    assert actual == expected
-
-
 @pytest.mark.parametrize(
     "url,url_type,expected",
     [
@@ -320,3 +319,216 @@ def test_find_completed(client: Client, url: str, expected: bool) -> None:
         assert actual["ocr"]["id"] == ocr.id
     else:
         assert result.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        (
+            "https://reddit.com/r/antiwork/comments/Q1tlcf/work_is_work/",
+            RedditIds("antiwork", "q1tlcf", None),
+        ),
+        (
+            "https://old.reddit.com/r/AntiWork/comments/q1tlcf",
+            RedditIds("antiwork", "q1tlcf", None),
+        ),
+        (
+            "https://reddit.com/r/antiwork/comments/q1tlcf/comment/hfgp814/?context=3",
+            RedditIds("antiwork", "q1tlcf", "hfgp814"),
+        ),
+        (
+            "https://reddit.com/r/NonPoliticalTwitter/comments/rn02rf/subtitles/hppsgrs/",
+            RedditIds("nonpoliticaltwitter", "rn02rf", "hppsgrs"),
+        ),
+        ("https://reddit.com/r/antiwork/", None),
+        ("https://example.com/r/antiwork/comments/q1tlcf/", None),
+        (None, None),
+    ],
+)
+def test_parse_reddit_url(url: Optional[str], expected: Optional[RedditIds]) -> None:
+    """Verify that the IDs are parsed from the URL correctly."""
+    assert parse_reddit_url(url) == expected
+
+
+def test_reddit_ids_on_save() -> None:
+    """Verify that the Reddit IDs are parsed again when the URLs change."""
+    submission = create_submission(
+        url="https://reddit.com/r/antiwork/comments/q1tlcf/work_is_work/",
+        tor_url="https://reddit.com/r/TranscribersOfReddit/comments/q1tnhc/work/",
+    )
+    assert (submission.subreddit, submission.reddit_id) == ("antiwork", "q1tlcf")
+    assert submission.tor_reddit_id == "q1tnhc"
+
+    submission.url = "https://reddit.com/r/meirl/comments/abc123/me_irl/"
+    submission.save(update_fields=["url"])
+    submission.refresh_from_db()
+
+    assert (submission.subreddit, submission.reddit_id) == ("meirl", "abc123")
+
+
+def test_find_query_count(django_assert_num_queries: Any) -> None:
+    """Verify that a URL is resolved with two indexed queries."""
+    user = create_user(id=123, username="test_user")
+    submission = create_submission(
+        claimed_by=user,
+        completed_by=user,
+        url="https://reddit.com/r/antiwork/comments/q1tlcf/work_is_work/",
+    )
+    transcription = create_transcription(submission, user)
+    ocr_bot = create_user(id=333, username="ocr_bot", is_bot=True)
+    ocr = create_transcription(submission, ocr_bot)
+
+    with django_assert_num_queries(2):
+        actual = find_by_url(
+            "https://reddit.com/r/antiwork/comments/q1tlcf/comment/hfgp814/"
+        )
+        assert actual["author"] == user
+
+    assert actual["submission"] == submission
+    assert actual["transcription"] == transcription
+    assert actual["ocr"] == ocr
+
+
+def test_find_by_transcription_comment() -> None:
+    """Verify that a transcription posted on another post is found by its comment."""
+    user = create_user(id=123, username="test_user")
+    submission = create_submission(
+        claimed_by=user,
+        url="https://reddit.com/r/antiwork/comments/q1tlcf/work_is_work/",
+    )
+    transcription = create_transcription(
+        submission,
+        user,
+        url="https://reddit.com/r/crosspost/comments/q2abcd/comment/hfgp814/",
+    )
+
+    actual = find_by_url(
+        "https://reddit.com/r/crosspost/comments/q2abcd/comment/hfgp814/"
+    )
+
+    assert actual is not None
+    assert actual["submission"] == submission
+    assert actual["transcription"] == transcription
+
+
+def _find_batch(client: Client, headers: Dict, data: Any) -> Any:
+    """Find the objects of the URLs in the data with the batch endpoint."""
+    return client.post(
+        reverse("find-batch"),
+        json.dumps(data),
+        content_type="application/json",
+        **headers,
+    )
+
+
+def test_find_batch(client: Client) -> None:
+    """Verify that the objects of many URLs are found at once, keyed by URL."""
+    client, headers, user = setup_user_client(client, id=123, username="test_user")
+    first = create_submission(
+        claimed_by=user,
+        completed_by=user,
+        url="https://reddit.com/r/antiwork/comments/q1tlcf/work_is_work/",
+        tor_url="https://reddit.com/r/TranscribersOfReddit/comments/q1tnhc/work/",
+    )
+    transcription = create_transcription(
+        first,
+        user,
+        url="https://reddit.com/r/antiwork/comments/q1tlcf/comment/hfgp814/",
+    )
+    second = create_submission(
+        url="https://reddit.com/r/meirl/comments/abc123/me_irl/",
+    )
+    crossposted = create_submission(
+        claimed_by=user,
+        url="https://reddit.com/r/meirl/comments/def456/me_irl/",
+    )
+    create_transcription(
+        crossposted,
+        user,
+        url="https://reddit.com/r/crosspost/comments/q2abcd/comment/hfgp999/",
+    )
+    urls = [
+        "https://old.reddit.com/r/antiwork/comments/q1tlcf/comment/hfgp814/",
+        "https://reddit.com/r/transcribersofreddit/comments/q1tnhc/work/",
+        "https://reddit.com/r/meirl/comments/abc123/",
+        "https://reddit.com/r/crosspost/comments/q2abcd/comment/hfgp999/",
+        "https://reddit.com/r/meirl/comments/zzz999/unknown/",
+        "https://example.com/not/reddit/",
+    ]
+
+    result = _find_batch(client, headers, {"urls": urls})
+
+    assert result.status_code == status.HTTP_200_OK
+    actual = result.json()
+    assert list(actual) == urls
+    assert actual[urls[0]]["submission"]["id"] == first.id
+    assert actual[urls[0]]["author"]["id"] == user.id
+    assert actual[urls[0]]["transcription"]["id"] == transcription.id
+    assert actual[urls[0]]["ocr"] is None
+    assert actual[urls[1]]["submission"]["id"] == first.id
+    assert actual[urls[2]]["submission"]["id"] == second.id
+    assert actual[urls[2]]["author"] is None
+    assert actual[urls[3]]["submission"]["id"] == crossposted.id
+    assert actual[urls[4]] is None
+    assert actual[urls[5]] is None
+
+
+def test_find_oldest_duplicate(client: Client) -> None:
+    """Verify that both endpoints find the oldest submission of a post."""
+    client, headers, _ = setup_user_client(client, id=123, username="test_user")
+    url = "https://reddit.com/r/antiwork/comments/q1tlcf/work_is_work/"
+    create_submission(url=url)
+    oldest = create_submission(url=url, create_time=timezone.now() - timedelta(days=1))
+
+    actual = find_by_url(url)
+    result = _find_batch(client, headers, {"urls": [url]})
+
+    assert actual is not None
+    assert actual["submission"] == oldest
+    assert result.json()[url]["submission"]["id"] == oldest.id
+
+
+def test_find_batch_constant_queries(client: Client) -> None:
+    """Verify that the number of queries does not depend on the number of URLs."""
+    client, headers, user = setup_user_client(client, id=123, username="test_user")
+    ocr_bot = create_user(id=333, username="ocr_bot", is_bot=True)
+    urls = []
+    for index in range(5):
+        submission = create_submission(
+            claimed_by=user,
+            completed_by=user,
+            url=f"https://reddit.com/r/antiwork/comments/post{index}/work/",
+        )
+        create_transcription(submission, user)
+        create_transcription(submission, ocr_bot)
+        urls.append(
+            f"https://reddit.com/r/antiwork/comments/post{index}/comment/c{index}/"
+        )
+
+    query_counts = []
+    for count in [1, 5]:
+        with CaptureQueriesContext(connection) as context:
+            result = _find_batch(client, headers, {"urls": urls[:count]})
+        assert result.status_code == status.HTTP_200_OK
+        assert all(data["ocr"] for data in result.json().values())
+        query_counts.append(len(context.captured_queries))
+
+    assert query_counts[0] == query_counts[1]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        {"urls": "https://reddit.com/r/antiwork/comments/q1tlcf/"},
+        {"urls": [123]},
+        {"urls": ["https://reddit.com/r/antiwork/comments/q1tlcf/"] * 101},
+    ],
+)
+def test_find_batch_invalid(client: Client, data: Dict[str, List]) -> None:
+    """Verify that a list of at most 100 URLs is required."""
+    client, headers, _ = setup_user_client(client)
+
+    result = _find_batch(client, headers, data)
+
+    assert result.status_code == status.HTTP_400_BAD_REQUEST
@@ -1,11 +1,21 @@
 """Test the available helper classes and their methods."""
+import threading
 from types import SimpleNamespace
-from typing import Dict, Set
+from typing import Dict, List, Set
+from unittest.mock import patch
 
 import pytest
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
 from rest_framework import serializers
 
-from api.helpers import validate_request
+from api.helpers import fire_and_forget, update_returning, validate_request
+from api.models import Source, Submission
+from utils.test_helpers import create_submission
+from utils.workers import WorkerPool
+
+# The number of events in the burst of the load test
+BURST_SIZE = 500
 
 
 @pytest.mark.parametrize(
@@ -44,3 +54,61 @@ def test_validate_request(
             test_function(None, request)
     else:
         test_function(None, request)
+
+
+@pytest.mark.skipif(
+    connection.vendor == "sqlite" and connection.Database.sqlite_version_info < (3, 35),
+    reason="RETURNING is only supported by SQLite 3.35 or newer",
+)
+def test_update_returning() -> None:
+    """Verify that the updated rows are returned by the update itself."""
+    updated = create_submission(original_id="a")
+    create_submission(original_id="b")
+
+    actual = update_returning(
+        Submission.objects.filter(original_id="a"), title="new title", nsfw=True
+    )
+
+    assert actual == [updated]
+    assert actual[0].title == "new title"
+    assert actual[0].nsfw is True
+    assert Submission.objects.filter(title="new title").count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_fire_and_forget_burst() -> None:
+    """Verify that a burst of events does not grow the threads or connections."""
+    executor = WorkerPool(name="test", size=4, max_queue_size=BURST_SIZE)
+    baseline_threads = threading.active_count()
+    thread_counts: List[int] = []
+    created_connections: List[int] = []
+
+    def _count_connection(**kwargs: object) -> None:
+        created_connections.append(threading.get_ident())
+
+    @fire_and_forget
+    def _handle_event(index: int) -> None:
+        Source.objects.filter(name=str(index)).exists()
+        thread_counts.append(threading.active_count())
+
+    connection_created.connect(_count_connection)
+    try:
+        with patch("api.helpers.executor", executor), patch(
+            "utils.workers.connections.close_all", wraps=connections.close_all
+        ) as close_all:
+            for index in range(BURST_SIZE):
+                _handle_event(index)
+            assert executor.shutdown(timeout=60)
+            # The connections are closed after every event and when the
+            # threads stop
+            assert close_all.call_count == BURST_SIZE + 4
+    finally:
+        connection_created.disconnect(_count_connection)
+
+    stats = executor.stats()
+    assert stats["completed"] == BURST_SIZE
+    assert stats["failed"] == 0
+    assert max(thread_counts) <= baseline_threads + 4
+    # Only the four threads of the pool have connected to the database
+    assert len(set(created_connections)) <= 4
+    assert threading.active_count() == baseline_threads
@@ -0,0 +1,178 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.utils import timezone
+
+from api.models import OutboxEvent, TranscriptionCheck
+from api.outbox import (
+    LEASE_TIME,
+    MAX_ATTEMPTS,
+    RETRY_DELAY,
+    process_events,
+    publish_event,
+)
+from utils.test_helpers import create_submission, create_transcription, create_user
+
+EventKind = OutboxEvent.OutboxEventKind
+
+
+def test_process_events_marks_completion() -> None:
+    """Verify that processed events are marked as complete."""
+    user = create_user()
+    submission = create_submission(completed_by=user, tor_url="https://tor")
+    event = publish_event(
+        EventKind.RANK_UP_MESSAGE, submission_id=submission.id, rank="Pink"
+    )
+
+    with patch("api.slack.client.chat_postMessage") as mock:
+        assert process_events() == 1
+
+    event.refresh_from_db()
+    assert event.complete_time is not None
+    assert mock.call_args[1]["text"] == (
+        f"Congrats to {user.username} on achieving the rank of Pink!! https://tor"
+    )
+    # Completed events are not processed again
+    assert process_events() == 0
+
+
+def test_process_events_retries_with_backoff() -> None:
+    """Verify that failed events are retried later with an increasing delay."""
+    submission = create_submission(completed_by=create_user())
+    event = publish_event(
+        EventKind.RANK_UP_MESSAGE, submission_id=submission.id, rank="Pink"
+    )
+
+    with patch("api.slack.client.chat_postMessage", side_effect=ConnectionError):
+        assert process_events() == 1
+        # The event is not due yet
+        assert process_events() == 0
+
+        event.refresh_from_db()
+        assert event.attempts == 1
+        assert event.complete_time is None
+        assert "ConnectionError" in event.last_error
+        assert event.available_time > timezone.now() + RETRY_DELAY / 2
+
+        OutboxEvent.objects.update(available_time=timezone.now())
+        process_events()
+
+    event.refresh_from_db()
+    assert event.attempts == 2
+    assert event.available_time > timezone.now() + RETRY_DELAY * 3 / 2
+
+
+def test_process_events_leases_event() -> None:
+    """Verify that an event is leased before it is sent to Slack."""
+    submission = create_submission(completed_by=create_user())
+    event = publish_event(
+        EventKind.RANK_UP_MESSAGE, submission_id=submission.id, rank="Pink"
+    )
+
+    def post_message(**_: str) -> None:
+        # Other workers skip the event while it is processed
+        leased = OutboxEvent.objects.get(id=event.id)
+        assert leased.available_time > timezone.now() + LEASE_TIME / 2
+        assert process_events() == 0
+
+    with patch("api.slack.client.chat_postMessage", side_effect=post_message):
+        assert process_events() == 1
+
+    event.refresh_from_db()
+    assert event.complete_time is not None
+
+
+def test_process_events_retries_after_lease() -> None:
+    """Verify that an event leased by a stopped worker is retried."""
+    submission = create_submission(completed_by=create_user())
+    event = publish_event(
+        EventKind.RANK_UP_MESSAGE, submission_id=submission.id, rank="Pink"
+    )
+    # Leased by a worker that stopped before processing it
+    OutboxEvent.objects.update(available_time=timezone.now() + LEASE_TIME)
+    assert process_events() == 0
+
+    OutboxEvent.objects.update(available_time=timezone.now())
+    with patch("api.slack.client.chat_postMessage"):
+        assert process_events() == 1
+
+    event.refresh_from_db()
+    assert event.complete_time is not None
+
+
+def test_process_events_gives_up() -> None:
+    """Verify that events are not retried after running out of attempts."""
+    submission = create_submission(completed_by=create_user())
+    event = publish_event(
+        EventKind.RANK_UP_MESSAGE, submission_id=submission.id, rank="Pink"
+    )
+    OutboxEvent.objects.update(attempts=MAX_ATTEMPTS - 1)
+
+    with patch("api.slack.client.chat_postMessage", side_effect=ConnectionError):
+        process_events()
+    OutboxEvent.objects.update(available_time=timezone.now() - timedelta(days=1))
+
+    event.refresh_from_db()
+    assert event.failed
+    assert process_events() == 0
+
+
+def test_check_sampled_once() -> None:
+    """Verify that retrying a failed check message does not sample it again."""
+    user = create_user()
+    submission = create_submission(completed_by=user)
+    transcription = create_transcription(submission, user)
+    publish_event(
+        EventKind.SUBMISSION_DONE,
+        submission_id=submission.id,
+        transcription_id=transcription.id,
+        gamma=1,
+    )
+
+    with patch(
+        "authentication.models.BlossomUser.should_check_transcription",
+        return_value=True,
+    ), patch("api.outbox.send_check_message", side_effect=ConnectionError):
+        # Samples the check, then fails to send it
+        assert process_events() == 2
+
+    OutboxEvent.objects.update(available_time=timezone.now())
+    with patch(
+        "authentication.models.BlossomUser.should_check_transcription",
+        return_value=True,
+    ), patch("api.outbox.send_check_message") as mock:
+        assert process_events() == 1
+
+    assert mock.call_count == 1
+    assert TranscriptionCheck.objects.filter(transcription=transcription).count() == 1
+
+
+def test_check_message_not_sent_twice() -> None:
+    """Verify that checks that are already on Slack are not sent again."""
+    user = create_user()
+    transcription = create_transcription(create_submission(completed_by=user), user)
+    check = TranscriptionCheck.objects.create(
+        transcription=transcription, slack_channel_id="abc", slack_message_ts="123"
+    )
+    publish_event(EventKind.CHECK_MESSAGE, check_id=check.id)
+
+    with patch("api.outbox.send_check_message") as mock:
+        assert process_events() == 1
+
+    assert mock.call_count == 0
+
+
+def test_report_update_skipped_when_reverted() -> None:
+    """Verify that reports are not updated for changes that were reverted."""
+    approved = create_submission(approved=True)
+    reverted = create_submission(approved=False)
+    for submission in [approved, reverted]:
+        publish_event(
+            EventKind.REPORT_UPDATE, submission_id=submission.id, status="approved"
+        )
+
+    with patch("api.outbox.update_submission_report") as mock:
+        assert process_events() == 2
+
+    assert mock.call_count == 1
+    assert mock.call_args[0][0] == approved
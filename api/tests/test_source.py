@@ -1,12 +1,28 @@
 import json
+from typing import Any
 
-from django.test import Client
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client, override_settings
 from django.urls import reverse
 from rest_framework import status
 
-from api.models import Source
+from api.models import (
+    SOURCE_REGISTRY_VERSION_KEY,
+    Source,
+    Submission,
+    Transcription,
+    get_default_source,
+    get_source,
+)
 from utils.test_helpers import get_default_test_source, setup_user_client
 
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "shared": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
 
 class TestSourceViewset:
     """Tests that validate the Source viewset is working correctly."""
@@ -77,3 +93,82 @@ class TestSourceViewset:
         assert result.status_code == status.HTTP_201_CREATED
         assert Source.objects.count() == 1
         assert result.json()["name"] == data["name"]
+
+
+class TestSourceRegistry:
+    """Tests that validate the in-process registry of the sources."""
+
+    def test_default_source_without_queries(
+        self, django_assert_num_queries: Any, django_capture_on_commit_callbacks: Any
+    ) -> None:
+        """Verify that the default source is only looked up once."""
+        with django_capture_on_commit_callbacks(execute=True):
+            get_default_source()
+
+        with django_assert_num_queries(0):
+            for _ in range(10):
+                assert Submission().source_id == "reddit"
+                assert Transcription().source_id == "reddit"
+
+    def test_default_source_created(self) -> None:
+        """Verify that the default source is created if it does not exist."""
+        Source.objects.filter(name="reddit").delete()
+
+        assert get_default_source() == "reddit"
+        assert Source.objects.filter(name="reddit").exists()
+
+    def test_registry_cleared_on_change(self) -> None:
+        """Verify that added and removed sources are picked up right away."""
+        with pytest.raises(Source.DoesNotExist):
+            get_source("AAA")
+
+        Source.objects.create(name="AAA")
+        assert get_source("AAA").name == "AAA"
+
+        Source.objects.filter(name="AAA").delete()
+        with pytest.raises(Source.DoesNotExist):
+            get_source("AAA")
+
+    def test_registry_not_filled_before_commit(
+        self, django_capture_on_commit_callbacks: Any
+    ) -> None:
+        """Verify that sources are only remembered once they are committed."""
+        with django_capture_on_commit_callbacks() as callbacks:
+            get_source("AAA", create=True)
+
+        # The transaction is rolled back instead
+        Source.objects.filter(name="AAA").delete()
+        with pytest.raises(Source.DoesNotExist):
+            get_source("AAA")
+        assert callbacks
+
+    @override_settings(CACHES=LOCMEM_CACHES, SOURCE_REGISTRY_CHECK_INTERVAL=0)
+    def test_registry_invalidated_by_other_process(
+        self, django_capture_on_commit_callbacks: Any
+    ) -> None:
+        """Verify that sources removed by another process are picked up."""
+        caches["shared"].clear()
+        Source.objects.create(name="AAA")
+        with django_capture_on_commit_callbacks(execute=True):
+            assert get_source("AAA").name == "AAA"
+
+        # Another process removes the source, so the signals do not run here
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM api_source WHERE name = 'AAA'")
+        assert get_source("AAA").name == "AAA"
+
+        # That process then replaces the shared version
+        caches["shared"].set(SOURCE_REGISTRY_VERSION_KEY, "other")
+        with pytest.raises(Source.DoesNotExist):
+            get_source("AAA")
+
+    def test_unknown_source_404(self, client: Client) -> None:
+        """Verify that views still answer 404 for unknown sources."""
+        client, headers, _ = setup_user_client(client)
+        result = client.get(
+            reverse("submission-expired") + "?source=AAA",
+            content_type="application/json",
+            **headers,
+        )
+
+        assert result.status_code == status.HTTP_404_NOT_FOUND
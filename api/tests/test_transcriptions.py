@@ -1,15 +1,31 @@
 """Tests to validate the behavior of the Transcription View."""
 import json
-from datetime import datetime
-from typing import List
+from datetime import datetime, timedelta
+from importlib import import_module
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock, patch
+from urllib.parse import urlencode
 
 import pytest
+from django.apps import apps
+from django.core.management import call_command
+from django.db import DatabaseError, connection
 from django.test import Client
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.timezone import make_aware
+from pytest_django.fixtures import SettingsWrapper
 from rest_framework import status
 
-from api.models import Source, Transcription
+from api.models import ReviewHistory, Source, Transcription
+from api.search import (
+    POSTGRES_TRIGRAM_EXTENSION,
+    POSTGRES_TRIGRAM_INDEX,
+    _to_tsquery,
+    install_search_indexes,
+    parse_query,
+    uninstall_search,
+)
 from utils.test_helpers import (
     create_submission,
     create_transcription,
@@ -43,6 +59,33 @@ class TestTranscriptionCreation:
         assert result.json()["count"] == 1
         assert result.json()["results"][0]["id"] == 1
 
+    def test_list_with_cursor(self, client: Client) -> None:
+        """Test that the transcriptions can be scanned through with a cursor."""
+        client, headers, user = setup_user_client(client)
+        submission = create_submission()
+        for day in [2, 3, 1]:
+            create_transcription(
+                submission, user, create_time=make_aware(datetime(2021, 6, day))
+            )
+
+        result = client.get(
+            reverse("transcription-list") + "?pagination=cursor&page_size=2",
+            content_type="application/json",
+            **headers,
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        assert "count" not in result.json()
+        assert [t["id"] for t in result.json()["results"]] == [2, 1]
+
+        result = client.get(
+            result.json()["next"], content_type="application/json", **headers
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        assert [t["id"] for t in result.json()["results"]] == [3]
+        assert result.json()["next"] is None
+
     def test_list_with_filters(self, client: Client) -> None:
         """Verify that listing all submissions works correctly."""
         client, headers, user = setup_user_client(client)
@@ -547,6 +590,203 @@ class TestTranscriptionSearch:
         assert result_times == expected_times
 
 
+class TestTranscriptionTextSearch:
+    """Tests validating the full-text search of the transcriptions."""
+
+    def _search(self, client: Client, headers: Dict, query: str) -> Any:
+        """Search the transcriptions for the given query."""
+        return client.get(
+            reverse("transcription-text-search") + f"?{urlencode({'query': query})}",
+            content_type="application/json",
+            **headers,
+        )
+
+    def test_text_search(self, client: Client) -> None:
+        """Verify that the best matches come first, with a highlighted snippet."""
+        client, headers, user = setup_user_client(client)
+        submission = create_submission()
+        create_transcription(submission, user, text="A cat sat on a cat.")
+        create_transcription(submission, user, text="A dog chased a bird.")
+        create_transcription(submission, user, text="The cat is orange.")
+
+        result = self._search(client, headers, "cat")
+
+        assert result.status_code == status.HTTP_200_OK
+        results = result.json()["results"]
+        assert [t["id"] for t in results] == [1, 3]
+        assert results[0]["rank"] > results[1]["rank"]
+        assert results[0]["snippet"] == "A **cat** sat on a **cat**."
+
+    @pytest.mark.parametrize(
+        "query,expected",
+        [
+            ("dog bird", [2]),
+            ('"bird chased"', []),
+            ('"dog chased"', [2]),
+            ("cha*", [2]),
+            ("chase", [2]),
+            ("sat orange", []),
+        ],
+    )
+    def test_text_search_terms(
+        self, client: Client, query: str, expected: List[int]
+    ) -> None:
+        """Verify that all words, phrases and prefixes of the query have to match."""
+        client, headers, user = setup_user_client(client)
+        submission = create_submission()
+        create_transcription(submission, user, text="A cat sat on a cat.")
+        create_transcription(submission, user, text="A dog chased a bird.")
+        create_transcription(submission, user, text="The cat is orange.")
+
+        result = self._search(client, headers, query)
+
+        assert result.status_code == status.HTTP_200_OK
+        assert [t["id"] for t in result.json()["results"]] == expected
+
+    def test_text_search_on_write(self, client: Client) -> None:
+        """Verify that edited and deleted transcriptions are indexed again."""
+        client, headers, user = setup_user_client(client)
+        submission = create_submission()
+        edited = create_transcription(submission, user, text="old text")
+        deleted = create_transcription(submission, user, text="old text")
+
+        edited.text = "new text"
+        edited.save()
+        deleted.delete()
+
+        assert self._search(client, headers, "old").json()["results"] == []
+        results = self._search(client, headers, "new").json()["results"]
+        assert [t["id"] for t in results] == [edited.id]
+
+    def test_text_search_pages(self, client: Client) -> None:
+        """Verify that the results with equal ranks are paginated without overlap."""
+        client, headers, user = setup_user_client(client)
+        submission = create_submission()
+        for _ in range(3):
+            create_transcription(submission, user, text="A cat.")
+        create_transcription(submission, user, text="A cat.", removed_from_reddit=True)
+
+        result = client.get(
+            reverse("transcription-text-search")
+            + "?query=cat&removed_from_reddit=false&page_size=2",
+            content_type="application/json",
+            **headers,
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        assert [t["id"] for t in result.json()["results"]] == [3, 2]
+        assert result.json()["count"] == 3
+
+        result = client.get(
+            result.json()["next"], content_type="application/json", **headers
+        )
+
+        assert [t["id"] for t in result.json()["results"]] == [1]
+        assert result.json()["next"] is None
+
+    @pytest.mark.parametrize("query", [None, "", "* !?"])
+    def test_text_search_invalid(self, client: Client, query: Optional[str]) -> None:
+        """Verify that a query without any words is rejected."""
+        client, headers, _ = setup_user_client(client)
+        url = reverse("transcription-text-search")
+        if query is not None:
+            url += f"?{urlencode({'query': query})}"
+
+        result = client.get(url, content_type="application/json", **headers)
+
+        assert result.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_backfill_search_index(self, client: Client) -> None:
+        """Verify that transcriptions written before the search are indexed."""
+        client, headers, user = setup_user_client(client)
+        uninstall_search(connection)
+        transcription = create_transcription(create_submission(), user, text="cat")
+        call_command("backfill_search_index")
+
+        results = self._search(client, headers, "cat").json()["results"]
+        assert [t["id"] for t in results] == [transcription.id]
+
+    @pytest.mark.skipif(connection.vendor != "sqlite", reason="Only SQLite rebuilds")
+    @pytest.mark.django_db(transaction=True)
+    def test_search_after_table_rebuild(self, client: Client) -> None:
+        """Verify that the search is reinstalled after the table is recreated."""
+        client, headers, user = setup_user_client(client)
+        field = Transcription._meta.get_field("reddit_id")
+        longer_field = field.clone()
+        longer_field.max_length += 1
+        longer_field.set_attributes_from_name(field.name)
+        migration = import_module("api.migrations.0036_reinstall_search")
+
+        # Changing a column on SQLite recreates the table without the triggers
+        with connection.schema_editor() as schema_editor:
+            schema_editor.alter_field(Transcription, field, longer_field)
+            schema_editor.alter_field(Transcription, longer_field, field)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+                " AND tbl_name = 'api_transcription'"
+            )
+            assert cursor.fetchall() == []
+
+        with connection.schema_editor() as schema_editor:
+            migration.reinstall(apps, schema_editor)
+        transcription = create_transcription(create_submission(), user, text="cat")
+
+        results = self._search(client, headers, "cat").json()["results"]
+        assert [t["id"] for t in results] == [transcription.id]
+
+    @pytest.mark.parametrize(
+        "query,expected",
+        [
+            ("dog", "('dog')"),
+            ("dog bird", "('dog') & ('bird')"),
+            ('"dog chased"', "('dog' <-> 'chased')"),
+            ("cha*", "('cha':*)"),
+            ("don't", "('don' <-> 't')"),
+        ],
+    )
+    def test_postgres_query(self, query: str, expected: str) -> None:
+        """Verify that the query is converted to the tsquery of PostgreSQL."""
+        assert _to_tsquery(parse_query(query)) == expected
+
+    def test_postgres_indexes_without_trigram_extension(self) -> None:
+        """Verify that the trigram index is skipped if its extension is missing."""
+        db = MagicMock(vendor="postgresql")
+        cursor = db.cursor.return_value.__enter__.return_value
+
+        def execute(statement: str) -> None:
+            if statement == POSTGRES_TRIGRAM_EXTENSION:
+                raise DatabaseError("permission denied to create extension")
+
+        cursor.execute.side_effect = execute
+        install_search_indexes(db)
+
+        statements = [call.args[0] for call in cursor.execute.call_args_list]
+        assert "CONCURRENTLY" in statements[0]
+        assert POSTGRES_TRIGRAM_INDEX not in statements
+
+    @pytest.mark.skipif(
+        connection.vendor != "postgresql", reason="Only installed on PostgreSQL"
+    )
+    def test_postgres_search_installed(self, client: Client) -> None:
+        """Verify that the search vector is written and backed by its indexes."""
+        client, headers, user = setup_user_client(client)
+        transcription = create_transcription(create_submission(), user, text="cats")
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT search_vector::text FROM api_transcription WHERE id = %s",
+                [transcription.id],
+            )
+            assert cursor.fetchone()[0] == "'cat':1"
+            cursor.execute(
+                "SELECT indexname FROM pg_indexes WHERE tablename = 'api_transcription'"
+            )
+            indexes = {row[0] for row in cursor.fetchall()}
+        assert "transcription_search_idx" in indexes
+        assert "transcription_text_trgm_idx" in indexes
+
+
 class TestTranscriptionRandom:
     """Tests that validate the behavior of the Random Review process."""
 
@@ -569,3 +809,98 @@ class TestTranscriptionRandom:
         assert result.status_code == status.HTTP_200_OK
         assert result.json()
         assert result.json()["original_id"] == transcription.original_id
+
+    def test_random_no_repeat(self, client: Client) -> None:
+        """Test that a reviewer is not served the same transcription twice."""
+        client, headers, user = setup_user_client(client)
+        submission = create_submission()
+        for _ in range(3):
+            create_transcription(submission, user)
+        create_transcription(
+            submission, user, create_time=timezone.now() - timedelta(hours=2)
+        )
+
+        served = [
+            client.get(reverse("transcription-review-random"), **headers).json()["id"]
+            for _ in range(3)
+        ]
+        assert sorted(served) == [1, 2, 3]
+
+        result = client.get(reverse("transcription-review-random"), **headers)
+        assert not result.content
+
+        # Other reviewers are still served them
+        client, headers, _ = setup_user_client(client, id=124, username="other")
+        result = client.get(reverse("transcription-review-random"), **headers)
+        assert result.json()["id"] in [1, 2, 3]
+
+    def test_random_batch(self, client: Client) -> None:
+        """Test that a batch of distinct transcriptions can be pulled at once."""
+        client, headers, user = setup_user_client(client)
+        submission = create_submission()
+        for _ in range(3):
+            create_transcription(submission, user)
+
+        result = client.get(
+            reverse("transcription-review-random") + "?count=2", **headers
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        first = [transcription["id"] for transcription in result.json()]
+        assert len(set(first)) == 2
+
+        result = client.get(
+            reverse("transcription-review-random") + "?count=2", **headers
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        second = [transcription["id"] for transcription in result.json()]
+        assert sorted(first + second) == [1, 2, 3]
+
+    def test_random_batch_by_id(self, client: Client) -> None:
+        """Test that the transcriptions are also picked from many candidates."""
+        client, headers, user = setup_user_client(client)
+        submission = create_submission()
+        for _ in range(5):
+            create_transcription(submission, user)
+        Transcription.objects.filter(id__in=[2, 4]).delete()
+
+        # The second random ID leads to a transcription picked already
+        with patch("api.sampling.SAMPLE_PAGE_SIZE", 1), patch(
+            "api.sampling.random.randint", side_effect=[2, 3, 4, 1]
+        ) as randint:
+            result = client.get(
+                reverse("transcription-review-random") + "?count=3", **headers
+            )
+
+        assert result.status_code == status.HTTP_200_OK
+        assert [t["id"] for t in result.json()] == [3, 5, 1]
+        randint.assert_called_with(1, 5)
+
+    def test_random_history_expires(
+        self, client: Client, settings: SettingsWrapper
+    ) -> None:
+        """Test that the transcriptions are served again after a while."""
+        client, headers, user = setup_user_client(client)
+        create_transcription(create_submission(), user)
+
+        result = client.get(reverse("transcription-review-random"), **headers)
+        assert result.json()["id"] == 1
+        assert not client.get(reverse("transcription-review-random"), **headers).content
+
+        settings.REVIEW_HISTORY_TIMEOUT = 0
+        result = client.get(reverse("transcription-review-random"), **headers)
+        assert result.json()["id"] == 1
+        # The expired history has been removed
+        assert ReviewHistory.objects.count() == 1
+
+    @pytest.mark.parametrize("count", ["0", "26", "a"])
+    def test_random_invalid_count(self, client: Client, count: str) -> None:
+        """Test that the size of a batch is validated."""
+        client, headers, user = setup_user_client(client)
+
+        result = client.get(
+            reverse("transcription-review-random") + f"?count={count}", **headers
+        )
+
+        assert result.status_code == status.HTTP_400_BAD_REQUEST
@@ -1,7 +1,9 @@
 """Tests to validate the behavior of the VolunteerViewSet."""
 import json
 
+from django.db import connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 
@@ -169,6 +171,50 @@ class TestVolunteerAssortedFunctions:
         assert len(result.json()["results"]) == 1
         assert result.json()["results"][0]["username"] == user.username
 
+    def test_list_gamma(self, client: Client) -> None:
+        """Verify that the gamma of the listed volunteers is correct."""
+        BlossomUser.objects.all().delete()  # clear out system accounts for test
+        client, headers, user = setup_user_client(client)
+        blacklisted = create_user(username="blacklisted", blacklisted=True)
+        for _ in range(2):
+            create_submission(completed_by=user)
+            create_submission(completed_by=blacklisted)
+
+        result = client.get(
+            reverse("volunteer-list"), content_type="application/json", **headers
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        gammas = {
+            volunteer["username"]: volunteer["gamma"]
+            for volunteer in result.json()["results"]
+        }
+        assert gammas == {user.username: 2, "blacklisted": 0}
+
+    def test_list_constant_queries(self, client: Client) -> None:
+        """Verify that the number of queries does not depend on the page size."""
+        BlossomUser.objects.all().delete()  # clear out system accounts for test
+        client, headers, user = setup_user_client(client)
+        create_submission(completed_by=user)
+
+        def _count_queries() -> int:
+            with CaptureQueriesContext(connection) as context:
+                result = client.get(
+                    reverse("volunteer-list") + "?page_size=100",
+                    content_type="application/json",
+                    **headers,
+                )
+            assert result.status_code == status.HTTP_200_OK
+            return len(context.captured_queries)
+
+        _count_queries()
+        few = _count_queries()
+        for index in range(20):
+            create_submission(completed_by=create_user(username=f"user_{index}"))
+        many = _count_queries()
+
+        assert few == many
+
 
 class TestVolunteerGammaPlusOne:
     """Tests to validate the behavior of the plus one process."""
@@ -192,6 +238,8 @@ class TestVolunteerGammaPlusOne:
             == Submission.objects.get(id=1).completed_by
             == user
         )
+        # The dummy post is not offered in the transcription app
+        assert not Submission.objects.get(id=1).transcribable
 
     def test_plus_one_nonexistent_id(self, client: Client) -> None:
         """Test whether a plus one with a nonexistent ID is caught correctly."""
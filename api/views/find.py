@@ -1,6 +1,7 @@
-from typing import Optional, TypedDict
+from typing import Dict, Iterable, List, Optional, TypedDict
 from urllib.parse import urlparse
 
+from django.db.models import F, Q
 from django.views.decorators.csrf import csrf_exempt
 from drf_yasg.openapi import Parameter
 from drf_yasg.openapi import Response as DocResponse
@@ -11,8 +12,10 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from api.helpers import validate_request
 from api.models import Submission, Transcription
-from api.serializers import FindResponseSerializer
+from api.reddit import RedditIds, parse_reddit_url
+from api.serializers import FindResponseSerializer, SubmissionSerializer
 from authentication.models import BlossomUser
 
 
@@ -23,6 +26,14 @@ class FindResponse(TypedDict):
     ocr: Optional[Transcription]
 
 
+# The columns holding the post IDs of the URLs of the submissions
+REDDIT_ID_FIELDS = {"url": "reddit_id", "tor_url": "tor_reddit_id"}
+# The subreddit of the tor_url of the submissions, in lower case
+TOR_SUBREDDIT = "transcribersofreddit"
+# The maximum number of URLs that can be found at once
+FIND_BATCH_MAX_SIZE = 100
+
+
 def normalize_url(reddit_url_str: str) -> Optional[str]:
     """Normalize a Reddit URL to the format that Blossom uses.
 
@@ -41,45 +52,65 @@ def normalize_url(reddit_url_str: str) -> Optional[str]:
     return f"https://reddit.com{path}"
 
 
-def find_by_submission_url(url: str, url_type: str) -> Optional[FindResponse]:
-    """Find the objects by a submission URL."""
-    submissions = Submission.objects.filter(**{f"{url_type}__istartswith": url})
-    if submissions.count() == 0:
-        return None
+def get_find_responses(submissions: Iterable[Submission]) -> Dict[int, FindResponse]:
+    """Get the objects related to the submissions, keyed by their IDs.
 
-    # Get submission
-    submission = submissions[0]
-    # Get author
-    author = submission.claimed_by
-    # Get transcription
-    if author is not None:
-        transcriptions = submission.transcription_set.filter(author=author)
-        transcription = transcriptions[0] if transcriptions.count() > 0 else None
-    else:
-        transcription = None
-    # Get OCR
-    ocr_transcriptions = submission.transcription_set.filter(author__is_bot=True)
-    ocr = ocr_transcriptions[0] if ocr_transcriptions.count() > 0 else None
-
-    return {
-        "submission": submission,
-        "author": author,
-        "transcription": transcription,
-        "ocr": ocr,
+    The transcriptions of the authors and the OCR transcriptions of all
+    submissions are loaded with a single query.
+    """
+    responses: Dict[int, FindResponse] = {
+        submission.id: {
+            "submission": submission,
+            "author": submission.claimed_by,
+            "transcription": None,
+            "ocr": None,
+        }
+        for submission in submissions
     }
+    if not responses:
+        return responses
 
+    transcriptions = (
+        Transcription.objects.filter(submission_id__in=responses)
+        .filter(Q(author_id=F("submission__claimed_by_id")) | Q(author__is_bot=True))
+        .annotate(is_ocr=F("author__is_bot"))
+        .order_by("id")
+    )
+    for candidate in transcriptions:
+        response = responses[candidate.submission_id]
+        author_id = response["submission"].claimed_by_id
+        if response["transcription"] is None and candidate.author_id == author_id:
+            response["transcription"] = candidate
+        if response["ocr"] is None and candidate.is_ocr:
+            response["ocr"] = candidate
+    return responses
 
-def extract_core_url(url: str) -> str:
-    """Extract the minimal unique part of the URL.
 
-    https://reddit.com/r/TranscribersOfReddit/comments/plmx5n/curatedtumblr_image_im_an_atheist_but_yall_need/
-    will be converted to
-    https://reddit.com/r/TranscribersOfReddit/comments/plmx5n
+def get_find_response(submission: Submission) -> FindResponse:
+    """Get the objects related to the submission."""
+    return get_find_responses([submission])[submission.id]
+
+
+def find_by_submission_url(url: str, url_type: str) -> Optional[FindResponse]:
+    """Find the objects by a submission URL.
 
-    This way we can handle submissions and comments uniformly.
+    The submission is looked up by the ID of the post in the URL, which is
+    stored in an indexed column for both of its URLs. If several submissions
+    link to the same post, the oldest one is found, like by `find_by_urls`.
     """
-    url_parts = url.split("/")
-    return "/".join(url_parts[:7])
+    ids = parse_reddit_url(url)
+    if ids is None:
+        return None
+
+    submission = (
+        Submission.objects.filter(**{REDDIT_ID_FIELDS[url_type]: ids.post_id})
+        .select_related("claimed_by")
+        .order_by("create_time", "id")
+        .first()
+    )
+    if submission is None:
+        return None
+    return get_find_response(submission)
 
 
 def find_by_url(url: str) -> Optional[FindResponse]:
@@ -87,21 +118,97 @@ def find_by_url(url: str) -> Optional[FindResponse]:
 
     Example URL:
     https://reddit.com/r/TranscribersOfReddit/comments/plmx5n/curatedtumblr_image_im_an_atheist_but_yall_need/
-    """
-    url_parts = url.split("/")
 
-    if "reddit" not in url or len(url_parts) < 5:
+    Comments are found by the post they are on. If Blossom does not know that
+    post, e.g. for a transcription posted on a crosspost, the comment is
+    looked up as a transcription instead.
+    """
+    ids = parse_reddit_url(url)
+    if ids is None:
         return None
 
-    subreddit = url_parts[4]
-    core_url = extract_core_url(url)
-
-    if subreddit.casefold() == "transcribersofreddit":
+    if ids.subreddit == TOR_SUBREDDIT:
         # Find the submission on ToR
-        return find_by_submission_url(core_url, "tor_url")
+        data = find_by_submission_url(url, "tor_url")
     else:
         # Find the submission on the partner sub
-        return find_by_submission_url(core_url, "url")
+        data = find_by_submission_url(url, "url")
+
+    if data is None and ids.comment_id is not None:
+        transcription = (
+            Transcription.objects.filter(reddit_id=ids.comment_id)
+            .select_related("submission__claimed_by")
+            .first()
+        )
+        if transcription is not None:
+            data = get_find_response(transcription.submission)
+    return data
+
+
+def find_by_urls(urls: List[str]) -> Dict[str, Optional[FindResponse]]:
+    """Find the objects by many URLs at once.
+
+    The URLs are resolved like `find_by_url`, but with a constant number of
+    queries for all of them. The related objects are loaded as needed by
+    `FindResponseSerializer`.
+
+    :param urls: the URLs to resolve, in any variant of Reddit's format
+    :return: the objects of every URL, or None if the URL is invalid or its
+        objects could not be found
+    """
+    parsed: Dict[str, RedditIds] = {}
+    for url in urls:
+        normalized_url = normalize_url(url)
+        ids = parse_reddit_url(normalized_url) if normalized_url else None
+        if ids is not None:
+            parsed[url] = ids
+    tor_post_ids = {
+        ids.post_id for ids in parsed.values() if ids.subreddit == TOR_SUBREDDIT
+    }
+    post_ids = {
+        ids.post_id for ids in parsed.values() if ids.subreddit != TOR_SUBREDDIT
+    }
+    comment_ids = {ids.comment_id for ids in parsed.values() if ids.comment_id}
+
+    # The comments are only used for the posts that Blossom does not know
+    by_comment: Dict[str, int] = {}
+    if comment_ids:
+        for comment_id, submission_id in (
+            Transcription.objects.filter(reddit_id__in=comment_ids)
+            .order_by("-id")
+            .values_list("reddit_id", "submission_id")
+        ):
+            by_comment[comment_id] = submission_id
+
+    submissions = SubmissionSerializer.setup_eager_loading(
+        Submission.objects.filter(
+            Q(reddit_id__in=post_ids)
+            | Q(tor_reddit_id__in=tor_post_ids)
+            | Q(id__in=list(by_comment.values()))
+        )
+        .select_related("claimed_by")
+        .order_by("-create_time", "-id")
+    )
+    responses = get_find_responses(submissions)
+    # The submissions are ordered from new to old, so the oldest one is kept
+    by_post = {}
+    for submission_id, response in responses.items():
+        submission = response["submission"]
+        by_post[("url", submission.reddit_id)] = submission_id
+        by_post[("tor_url", submission.tor_reddit_id)] = submission_id
+
+    results: Dict[str, Optional[FindResponse]] = {}
+    for url in urls:
+        ids = parsed.get(url)
+        if ids is None:
+            results[url] = None
+            continue
+        url_type = "tor_url" if ids.subreddit == TOR_SUBREDDIT else "url"
+        submission_id = by_post.get((url_type, ids.post_id)) or by_comment.get(
+            ids.comment_id
+        )
+        results[url] = responses.get(submission_id)
+    return results
 
 
 class FindView(APIView):
@@ -159,3 +266,55 @@ class FindView(APIView):
             data=FindResponseSerializer(data, context={"request": request}).data,
             status=status.HTTP_200_OK,
         )
+
+
+class FindBatchView(APIView):
+    """A view to find the submissions or transcriptions of many URLs at once."""
+
+    @csrf_exempt
+    @swagger_auto_schema(
+        request_body=Schema(
+            type="object",
+            required=["urls"],
+            properties={
+                "urls": Schema(
+                    type="array",
+                    items=Schema(type="string"),
+                    description="The URLs to find the objects of, at most "
+                    f"{FIND_BATCH_MAX_SIZE}. See the find endpoint for the formats.",
+                )
+            },
+        ),
+        responses={
+            200: DocResponse(
+                "The objects of every URL, keyed by the URL. They have the same "
+                "format as the response of the find endpoint, or are null if the "
+                "URL is invalid or could not be found.",
+                schema=Schema(type="object"),
+            ),
+            400: "The URLs are not a list of strings or too many.",
+        },
+    )
+    @validate_request(data_params={"urls"})
+    def post(self, request: Request, urls: List[str] = None) -> Response:
+        """Find the submissions/transcriptions corresponding to the URLs."""
+        if (
+            not isinstance(urls, list)
+            or len(urls) > FIND_BATCH_MAX_SIZE
+            or not all(isinstance(url, str) for url in urls)
+        ):
+            return Response(
+                data=f"Provide a list of at most {FIND_BATCH_MAX_SIZE} URLs.",
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        context = {"request": request}
+        return Response(
+            data={
+                url: FindResponseSerializer(data, context=context).data
+                if data is not None
+                else None
+                for url, data in find_by_urls(urls).items()
+            },
+            status=status.HTTP_200_OK,
+        )
@@ -2,10 +2,11 @@
 import datetime
 import logging
 from datetime import timedelta
-from typing import Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from django.conf import settings
-from django.db.models import Count, F
+from django.db import connection, transaction
+from django.db.models import Count, Exists, QuerySet
 from django.db.models.functions import (
     ExtractHour,
     ExtractIsoWeekDay,
@@ -35,47 +36,74 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 
 from api.authentication import BlossomApiPermission
-from api.helpers import validate_request
-from api.models import Source, Submission, Transcription, TranscriptionCheck
-from api.pagination import StandardResultsSetPagination
+from api.completions import count_completions_by
+from api.helpers import get_source_or_404, update_returning, validate_request
+from api.ingestion import (
+    CREATED,
+    EXISTS,
+    find_new,
+    ingest_submissions,
+    lock_source,
+    parse_submission,
+)
+from api.leaderboard import (
+    LEADERBOARDS,
+    gamma_ranking,
+    get_above,
+    get_below,
+    get_entry,
+    get_named_leaderboard,
+    get_top,
+    submission_ranking,
+)
+from api.models import OutboxEvent, Submission, Transcription
+from api.outbox import publish_event
+from api.pagination import (
+    CURSOR,
+    CURSOR_PARAMETERS,
+    CursorResultsSetPagination,
+    StandardResultsSetPagination,
+)
 from api.serializers import SubmissionSerializer
-from api.slack import client as slack
 from api.slack.actions import (
     ReportMessageStatus,
     ask_about_removing_post,
     update_submission_report,
 )
-from api.slack.transcription_check.messages import send_check_message
 from api.views.volunteer import VolunteerViewSet
 from authentication.models import BlossomUser
 
 # The maximum number of posts a user can claim
 # depending on their current gamma score
 MAX_CLAIMS = [{"gamma": 0, "claims": 1}, {"gamma": 100, "claims": 2}]
+# The filters that can be answered from the completion rollups
+COMPLETION_ROLLUP_FILTERS = {
+    "completed_by",
+    "source",
+    "complete_time__gt",
+    "complete_time__gte",
+    "complete_time__lt",
+    "complete_time__lte",
+}
+# The default number of submissions returned by the queue feeds, e.g. expired
+QUEUE_FEED_SIZE = 100
+# The maximum number of submissions that can be changed with one bulk update
+BULK_UPDATE_MAX_SIZE = 500
+# The maximum number of submissions that can be created with one request
+BULK_CREATE_MAX_SIZE = 500
+# The results of the submissions of a bulk update
+BULK_UPDATED = "updated"
+BULK_UNCHANGED = "unchanged"
+BULK_NOT_FOUND = "not_found"
 logger = logging.getLogger("api.views.submission")
 
 
-def _check_for_rank_up(user: BlossomUser, submission: Submission = None) -> None:
-    """
-    Check if a volunteer has changed rank and, if so, notify Slack.
-
-    Because gamma is calculated off of transcriptions and the `done` endpoint
-    is called after the transcription is posted, by the time that we go to
-    calculate the gamma of the user, their gamma has already changed... so
-    we'll just subtract one from their current score and see if that changes
-    anything.
-    """
-    current_rank = user.get_rank()
-    if user.get_rank(override=user.gamma - 1) != current_rank:
-        msg = (
-            f"Congrats to {user.username} on achieving the rank of {current_rank}!!"
-            f" {submission.tor_url}"
-        )
-        try:
-            slack.chat_postMessage(channel=settings.SLACK_RANK_UP_CHANNEL, text=msg)
-        except:  # noqa
-            logger.warning(f"Cannot post message to slack. Msg: {msg}")
-            pass
+def _get_max_claims(gamma: int) -> Optional[int]:
+    """Get the number of submissions a user with the given gamma can claim."""
+    for claim_restriction in reversed(MAX_CLAIMS):
+        if gamma >= claim_restriction["gamma"]:
+            return claim_restriction["claims"]
+    return None
 
 
 def _get_limit_value(request: Request, default: int = 10) -> Union[int, None]:
@@ -97,6 +125,43 @@ def _get_limit_value(request: Request, default: int = 10) -> Union[int, None]:
             return default
 
 
+def bulk_update_schema(field: str) -> Callable:
+    """Document a bulk update endpoint which sets the given field."""
+    return swagger_auto_schema(
+        request_body=Schema(
+            type="object",
+            required=["submission_ids"],
+            properties={
+                "submission_ids": Schema(
+                    type="array",
+                    items=Schema(type="integer"),
+                    max_items=BULK_UPDATE_MAX_SIZE,
+                ),
+                field: Schema(type="boolean", default=True),
+            },
+        ),
+        responses={
+            200: DocResponse(
+                "The result of every submission, in the order of the request",
+                schema=Schema(
+                    type="array",
+                    items=Schema(
+                        type="object",
+                        properties={
+                            "id": Schema(type="integer"),
+                            "status": Schema(
+                                type="string",
+                                enum=[BULK_UPDATED, BULK_UNCHANGED, BULK_NOT_FOUND],
+                            ),
+                        },
+                    ),
+                ),
+            ),
+            400: "The submission IDs or the new value are invalid.",
+        },
+    )
+
+
 @method_decorator(
     name="list",
     decorator=swagger_auto_schema(
@@ -124,6 +189,7 @@ def _get_limit_value(request: Request, default: int = 10) -> Union[int, None]:
                     " until=2021-06-05 will return everything from before that date."
                 ),
             ),
+            *CURSOR_PARAMETERS,
         ],
     ),
 )
@@ -157,12 +223,114 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         "claim_time",
         "complete_time",
     ]
+    # The indexed orderings that can be used with `pagination=cursor`
+    cursor_ordering_fields = ["id", "create_time"]
+
+    def get_queryset(self) -> QuerySet:
+        """Get the submissions, eagerly loading what the serializer needs."""
+        queryset = super().get_queryset()
+        if self.action in ("list", "retrieve"):
+            queryset = self.serializer_class.setup_eager_loading(queryset)
+        return queryset
+
+    def _get_feed(
+        self, request: Request, queryset: QuerySet, time_field: str
+    ) -> Response:
+        """
+        Get the oldest submissions of a queue feed, e.g. the expired ones.
+
+        The submissions are ordered by the given time, so the oldest ones are
+        handled first. By default, the first `QUEUE_FEED_SIZE` submissions are
+        returned as a list. With `pagination=cursor`, they are returned as a
+        page with a link to the next one, which continues after the last
+        submission of this page.
+
+        :param request: the request for the feed
+        :param queryset: the submissions in the feed, matching a partial index
+        :param time_field: the indexed time to order the submissions by
+        :return: the response with the serialized submissions
+        """
+        queryset = self.serializer_class.setup_eager_loading(
+            queryset.order_by(time_field, "id")
+        )
+        if request.query_params.get("pagination") != CURSOR:
+            return Response(
+                self.get_serializer(queryset[:QUEUE_FEED_SIZE], many=True).data
+            )
+
+        pagination = CursorResultsSetPagination(
+            ordering_fields=["id", time_field], page_size=QUEUE_FEED_SIZE
+        )
+        page = pagination.paginate_queryset(queryset, request)
+        return pagination.get_paginated_response(
+            self.get_serializer(page, many=True).data
+        )
+
+    def _get_used_filters(self, request: Request) -> Optional[Dict[str, Any]]:
+        """Get the submission filters that are used by the request.
+
+        :return: the cleaned values of the used filters, or None if they are
+            invalid.
+        """
+        filterset = DjangoFilterBackend().get_filterset(
+            request, Submission.objects.all(), self
+        )
+        if not filterset.is_valid():
+            return None
+
+        return {
+            name: value
+            for name, value in filterset.form.cleaned_data.items()
+            if value not in [None, ""]
+        }
+
+    def _get_completion_filters(self, request: Request) -> Optional[Dict[str, Any]]:
+        """Translate the submission filters of the request for the rollups.
+
+        The completion rollups can only be filtered by user, source and
+        completion time. If any other filter is used, None is returned and the
+        submissions have to be queried directly.
+        """
+        used_filters = self._get_used_filters(request)
+        if used_filters is None:
+            # Let the regular filtering report the error
+            return None
+        if not used_filters.keys() <= COMPLETION_ROLLUP_FILTERS:
+            return None
+
+        lower_bounds = [
+            (used_filters[name], inclusive)
+            for name, inclusive in [
+                ("complete_time__gte", True),
+                ("complete_time__gt", False),
+            ]
+            if name in used_filters
+        ]
+        upper_bounds = [
+            (used_filters[name], inclusive)
+            for name, inclusive in [
+                ("complete_time__lte", True),
+                ("complete_time__lt", False),
+            ]
+            if name in used_filters
+        ]
+        user = used_filters.get("completed_by")
+        source = used_filters.get("source")
+        return {
+            "completed_by": user.id if user else None,
+            "source": source.pk if source else None,
+            # If both bounds are given on the same side, use the stricter one
+            "lower": max(lower_bounds, key=lambda b: (b[0], not b[1]), default=None),
+            "upper": min(upper_bounds, key=lambda b: (b[0], b[1]), default=None),
+        }
 
     @csrf_exempt
     @swagger_auto_schema(
         manual_parameters=[
             Parameter("ctq", "query", type="boolean"),
             Parameter("hours", "query", type="integer"),
+            Parameter("page_size", "query", type="integer"),
+            *CURSOR_PARAMETERS,
         ],
         required=["source"],
         responses={
@@ -192,7 +360,7 @@ class SubmissionViewSet(viewsets.ModelViewSet):
                 delay_time = timezone.now() - timedelta(hours=hours)
             except ValueError:
                 return Response(status=status.HTTP_400_BAD_REQUEST)
-        source_obj = get_object_or_404(Source, pk=source)
+        source_obj = get_source_or_404(source)
         queryset = Submission.objects.filter(
             completed_by=None,
             claimed_by=None,
@@ -201,11 +369,15 @@ class SubmissionViewSet(viewsets.ModelViewSet):
             source=source_obj,
             removed_from_queue=False,
         )
-        return Response(self.get_serializer(queryset[:100], many=True).data)
+        return self._get_feed(request, queryset, "create_time")
 
     @csrf_exempt
     @swagger_auto_schema(
-        manual_parameters=[Parameter("hours", "query", type="integer")],
+        manual_parameters=[
+            Parameter("hours", "query", type="integer"),
+            Parameter("page_size", "query", type="integer"),
+            *CURSOR_PARAMETERS,
+        ],
         required=["source"],
         responses={
             200: DocResponse("Successful operation", schema=serializer_class),
@@ -230,7 +402,7 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         except ValueError:
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
-        source_obj = get_object_or_404(Source, pk=source)
+        source_obj = get_source_or_404(source)
         queryset = Submission.objects.filter(
             completed_by=None,
             claimed_by__isnull=False,
@@ -239,10 +411,14 @@ class SubmissionViewSet(viewsets.ModelViewSet):
             source=source_obj,
             removed_from_queue=False,
         )
-        return Response(self.get_serializer(queryset[:100], many=True).data)
+        return self._get_feed(request, queryset, "claim_time")
 
     @csrf_exempt
     @swagger_auto_schema(
+        manual_parameters=[
+            Parameter("page_size", "query", type="integer"),
+            *CURSOR_PARAMETERS,
+        ],
         responses={200: DocResponse("Successful operation", schema=serializer_class)},
         required=["source"],
     )
@@ -255,7 +431,7 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         The definition of old in this method is half an hour. When no posts are
         found, an empty array is returned in the body.
         """
-        source_obj = get_object_or_404(Source, pk=source)
+        source_obj = get_source_or_404(source)
         delay_time = timezone.now() - timedelta(
             hours=settings.ARCHIVIST_COMPLETED_DELAY_TIME
         )
@@ -265,7 +441,7 @@ class SubmissionViewSet(viewsets.ModelViewSet):
             archived=False,
             source=source_obj,
         )
-        return Response(data=self.get_serializer(queryset[:100], many=True).data)
+        return self._get_feed(request, queryset, "complete_time")
 
     @swagger_auto_schema(
         operation_summary=(
@@ -296,6 +472,7 @@ class SubmissionViewSet(viewsets.ModelViewSet):
             ),
             Parameter("page_size", "query", type="number"),
             Parameter("page", "query", type="number"),
+            *CURSOR_PARAMETERS,
         ],
     )
     @action(detail=False, methods=["get"])
@@ -325,18 +502,33 @@ class SubmissionViewSet(viewsets.ModelViewSet):
 
         trunc_fn = trunc_dict.get(time_frame, TruncDate)
 
-        # https://stackoverflow.com/questions/8746014/django-group-by-date-day-month-year
-        rate = (
-            self.filter_queryset(Submission.objects)
-            .filter(complete_time__isnull=False)
-            .annotate(date=trunc_fn("complete_time", tzinfo=tzinfo))
-            .values("date")
-            .annotate(count=Count("id"))
-            .values("date", "count")
-            .order_by("date")
-        )
+        completion_filters = self._get_completion_filters(request)
+        # A cursor can only continue a database query, not the rollups
+        use_cursor = request.GET.get("pagination") == CURSOR
+        if (
+            not use_cursor
+            and completion_filters is not None
+            and trunc_fn is not TruncSecond
+            and utc_offset % 3600 == 0
+        ):
+            # The groups align with the hourly buckets, use the rollups
+            rate = count_completions_by(
+                lambda field: {"date": trunc_fn(field, tzinfo=tzinfo)},
+                **completion_filters,
+            )
+        else:
+            # https://stackoverflow.com/questions/8746014/django-group-by-date-day-month-year
+            rate = (
+                self.filter_queryset(Submission.objects)
+                .filter(complete_time__isnull=False)
+                .annotate(date=trunc_fn("complete_time", tzinfo=tzinfo))
+                .values("date")
+                .annotate(count=Count("id"))
+                .values("date", "count")
+                .order_by("date")
+            )
 
-        pagination = StandardResultsSetPagination()
+        pagination = StandardResultsSetPagination(cursor_ordering_fields=["date"])
         page = pagination.paginate_queryset(rate, request)
         return pagination.get_paginated_response(page)
 
@@ -369,6 +561,18 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         # Construct a timezone from the offset
         tzinfo = datetime.timezone(datetime.timedelta(seconds=utc_offset))
 
+        completion_filters = self._get_completion_filters(request)
+        if completion_filters is not None and utc_offset % 3600 == 0:
+            # The time slots align with the hourly buckets, use the rollups
+            heatmap = count_completions_by(
+                lambda field: {
+                    "day": ExtractIsoWeekDay(field, tzinfo=tzinfo),
+                    "hour": ExtractHour(field, tzinfo=tzinfo),
+                },
+                **completion_filters,
+            )
+            return Response(heatmap)
+
         heatmap = (
             self.filter_queryset(Submission.objects).filter(complete_time__isnull=False)
             # Extract the day of the week and the hour the transcription was made in
@@ -457,45 +661,57 @@ class SubmissionViewSet(viewsets.ModelViewSet):
 
         The volunteer is specified in the HTTP body.
         """
-        submission = get_object_or_404(Submission, id=pk)
-        user = get_object_or_404(BlossomUser, username=username)
+        with transaction.atomic():
+            # Lock the volunteer, so that their claims are counted one at a time
+            user = get_object_or_404(
+                BlossomUser.objects.select_for_update(), username=username
+            )
 
-        if user.blacklisted:
-            return Response(status=status.HTTP_423_LOCKED)
+            if user.blacklisted:
+                return Response(status=status.HTTP_423_LOCKED)
 
-        if not user.accepted_coc:
-            return Response(status=status.HTTP_403_FORBIDDEN)
+            if not user.accepted_coc:
+                return Response(status=status.HTTP_403_FORBIDDEN)
 
-        if submission.claimed_by is not None:
+            claimed_submissions = Submission.objects.filter(
+                claimed_by=user, archived=False, completed_by__isnull=True
+            )
+            unclaimed = Submission.objects.filter(id=pk, claimed_by__isnull=True)
+            max_claims = _get_max_claims(user.gamma)
+            if max_claims is not None:
+                # Only claim if the user has fewer claimed submissions than allowed
+                unclaimed = unclaimed.filter(
+                    ~Exists(claimed_submissions.order_by()[max_claims - 1 :])
+                )
+            # Check and claim the submission in a single statement
+            claim = {"claimed_by": user, "claim_time": timezone.now()}
+            if connection.vendor == "postgresql":
+                # Load the claimed submission in the same statement
+                claimed = update_returning(unclaimed, **claim)
+                submission = claimed[0] if claimed else None
+            elif unclaimed.update(**claim):
+                submission = Submission.objects.get(id=pk)
+            else:
+                submission = None
+
+        if submission is None:
+            submission = get_object_or_404(Submission, id=pk)
+            if submission.claimed_by is not None:
+                return Response(
+                    data=VolunteerViewSet.serializer_class(
+                        submission.claimed_by, context={"request": request}
+                    ).data,
+                    status=status.HTTP_409_CONFLICT,
+                )
+
+            # The user has already claimed too many submissions
             return Response(
-                data=VolunteerViewSet.serializer_class(
-                    submission.claimed_by, context={"request": request}
+                data=self.get_serializer(
+                    claimed_submissions, context={"request": request}, many=True
                 ).data,
-                status=status.HTTP_409_CONFLICT,
+                status=460,
             )
 
-        # Determine how many submissions the user has already claimed
-        claimed_submissions = Submission.objects.filter(
-            claimed_by=user, archived=False, completed_by__isnull=True
-        )
-        claimed_count = claimed_submissions.count()
-
-        for claim_restriction in reversed(MAX_CLAIMS):
-            if user.gamma >= claim_restriction["gamma"]:
-                if claimed_count >= claim_restriction["claims"]:
-                    # The user has already claimed too many submissions
-                    return Response(
-                        data=self.get_serializer(
-                            claimed_submissions, context={"request": request}, many=True
-                        ).data,
-                        status=460,
-                    )
-                break
-
-        submission.claimed_by = user
-        submission.claim_time = timezone.now()
-        submission.save()
-
         return Response(
             status=status.HTTP_201_CREATED,
             data=self.serializer_class(submission, context={"request": request}).data,
@@ -569,21 +785,18 @@ class SubmissionViewSet(viewsets.ModelViewSet):
                 return Response(status=status.HTTP_428_PRECONDITION_REQUIRED)
 
         # At this point everything looks good, award the user their gamma
-        submission.completed_by = user
-        submission.complete_time = timezone.now()
-        submission.save()
-
-        # Send the transcription to Slack if necessary
-        if transcription is not None and user.should_check_transcription():
-            # Create a new check object
-            check = TranscriptionCheck.objects.create(
-                transcription=transcription, trigger=user.transcription_check_reason()
+        with transaction.atomic():
+            submission.completed_by = user
+            submission.complete_time = timezone.now()
+            submission.save()
+            # The transcription check and the rank up message are sent to Slack
+            # in the background, to not hold up the response
+            publish_event(
+                OutboxEvent.OutboxEventKind.SUBMISSION_DONE,
+                submission_id=submission.id,
+                transcription_id=transcription.id if transcription else None,
+                gamma=user.gamma,
             )
-            # Send the check to the check channel
-            send_check_message(check)
-
-        # Send rank up message to Slack if necessary
-        _check_for_rank_up(user, submission)
 
         return Response(
             status=status.HTTP_201_CREATED,
@@ -628,29 +841,111 @@ class SubmissionViewSet(viewsets.ModelViewSet):
 
         Note that both the original id, source, and content_url should be supplied.
         """
-        source_obj = get_object_or_404(Source, pk=source)
+        source_obj = get_source_or_404(source)
         url = request.data.get("url")
         tor_url = request.data.get("tor_url")
         # allows pre-marking submissions we know won't be able to make it through OCR
         cannot_ocr = request.data.get("cannot_ocr", "False") == "True"
         nsfw = request.data.get("nsfw", "False") == "True"
         title = request.data.get("title")
-        submission = Submission.objects.create(
-            original_id=original_id,
-            source=source_obj,
-            url=url,
-            tor_url=tor_url,
-            content_url=content_url,
-            cannot_ocr=cannot_ocr,
-            nsfw=nsfw,
-            title=title,
-        )
+        with transaction.atomic():
+            # Wait for the ingestions of the source, which could otherwise
+            # create the same submission at the same time
+            lock_source(source_obj)
+            submission = Submission.objects.create(
+                original_id=original_id,
+                source=source_obj,
+                url=url,
+                tor_url=tor_url,
+                content_url=content_url,
+                cannot_ocr=cannot_ocr,
+                nsfw=nsfw,
+                title=title,
+            )
 
         return Response(
             status=status.HTTP_201_CREATED,
             data=self.serializer_class(submission, context={"request": request}).data,
         )
 
+    @csrf_exempt
+    @swagger_auto_schema(
+        request_body=Schema(
+            type="object",
+            required=["source", "submissions"],
+            properties={
+                "source": Schema(type="string"),
+                "submissions": Schema(
+                    type="array",
+                    max_items=BULK_CREATE_MAX_SIZE,
+                    items=Schema(
+                        type="object",
+                        required=["original_id", "content_url"],
+                        properties={
+                            "original_id": Schema(type="string"),
+                            "url": Schema(type="string"),
+                            "tor_url": Schema(type="string"),
+                            "content_url": Schema(type="string"),
+                            "cannot_ocr": Schema(type="boolean"),
+                            "nsfw": Schema(type="boolean"),
+                            "title": Schema(type="string"),
+                        },
+                    ),
+                ),
+            },
+        ),
+        responses={
+            200: DocResponse(
+                "The result of every submission, in the order of the request",
+                schema=Schema(
+                    type="array",
+                    items=Schema(
+                        type="object",
+                        properties={
+                            "id": Schema(type="integer"),
+                            "original_id": Schema(type="string"),
+                            "status": Schema(type="string", enum=[CREATED, EXISTS]),
+                        },
+                    ),
+                ),
+            ),
+            400: "The submissions are invalid or required parameters not provided",
+            404: "Source requested was not found",
+        },
+    )
+    @validate_request(data_params={"source", "submissions"})
+    @action(detail=False, methods=["post"])
+    def bulk_create(
+        self, request: Request, source: str = None, submissions: Any = None
+    ) -> Response:
+        """
+        Create many submissions at once, skipping the ones that already exist.
+
+        A submission already exists if there is one with the same original ID
+        in the source or one with the same URL. Sending the same submissions
+        again is therefore safe. The OCR of the new image submissions is
+        queued to be processed in the background.
+        """
+        source_obj = get_source_or_404(source)
+        if not isinstance(submissions, list) or len(submissions) > BULK_CREATE_MAX_SIZE:
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+        fields = [parse_submission(data) for data in submissions]
+        if None in fields:
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+
+        results = ingest_submissions(source_obj, fields)
+        return Response(
+            status=status.HTTP_200_OK,
+            data=[
+                {
+                    "id": submission_id,
+                    "original_id": data["original_id"],
+                    "status": result,
+                }
+                for data, (submission_id, result) in zip(fields, results)
+            ],
+        )
+
     @csrf_exempt
     @swagger_auto_schema(
         responses={
@@ -687,7 +982,7 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         * that the submission has not been marked as removed from the queue
           - ie. it broke rules and was reported & removed
         """
-        source_obj = get_object_or_404(Source, pk=source)
+        source_obj = get_source_or_404(source)
         transcribot = BlossomUser.objects.get(username="transcribot")
         return_limit = _get_limit_value(request)
         queryset = Submission.objects.filter(
@@ -746,18 +1041,52 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         return Response(status=status.HTTP_200_OK, data={"total_yeeted": yeeted})
 
     @csrf_exempt
+    @swagger_auto_schema(
+        request_body=Schema(
+            type="object",
+            properties={
+                "urls": Schema(type="array", items=Schema(type="string")),
+                "original_ids": Schema(type="array", items=Schema(type="string")),
+                "source": Schema(type="string"),
+            },
+        ),
+        responses={
+            200: DocResponse(
+                "The URLs or original IDs that are new, in the order of the request",
+                schema=Schema(type="array", items=Schema(type="string")),
+            ),
+            400: "Not exactly one of urls and original_ids provided",
+            404: "Source requested was not found",
+        },
+    )
     @action(detail=False, methods=["post"])
     def bulkcheck(self, request: Request) -> Response:
-        """Start with of a list of IDs, then return which ones are new to us."""
-        # we can't do a filter for things that don't exist, and excluding doesn't
-        # make sense here because we're looking for IDs that actually don't exist.
-        urls = dict(request.data).get("urls")
-        submissions = Submission.objects.filter(url__in=urls)
-        for submission in submissions:
-            if submission.url in urls:
-                urls.pop(urls.index(submission.url))
+        """
+        Start with a list of URLs or original IDs, then return which ones are new.
 
-        return Response(status=status.HTTP_200_OK, data=urls)
+        Either `urls` or `original_ids` should be supplied. Original IDs are
+        only unique within their source, so a `source` can be supplied to
+        only compare them to the submissions of that source.
+        """
+        # Form data has a list for every key
+        data = dict(request.data)
+        urls, original_ids = data.get("urls"), data.get("original_ids")
+        if (urls is None) == (original_ids is None):
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+        field, values = (
+            ("url", urls) if urls is not None else ("original_id", original_ids)
+        )
+        if not isinstance(values, list) or not all(
+            isinstance(value, str) for value in values
+        ):
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = Submission.objects.all()
+        if source := request.data.get("source"):
+            queryset = queryset.filter(source=get_source_or_404(source))
+        return Response(
+            status=status.HTTP_200_OK, data=find_new(queryset, field, values)
+        )
 
     @csrf_exempt
     @swagger_auto_schema(
@@ -786,8 +1115,19 @@ class SubmissionViewSet(viewsets.ModelViewSet):
                 type="number",
                 description="The number of users to show below the given user.",
             ),
+            Parameter(
+                "board",
+                "query",
+                type="string",
+                enum=LEADERBOARDS,
+                description="The precomputed leaderboard to show. If given, the "
+                "submission filters are ignored, except for the source.",
+            ),
         ],
-        responses={404: "No volunteer with the specified ID."},
+        responses={
+            400: "The given leaderboard does not exist.",
+            404: "No volunteer with the specified ID.",
+        },
     )
     @action(detail=False, methods=["get"])
     def leaderboard(
@@ -802,49 +1142,40 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         above_count = int(request.GET.get("above_count", 5))
         below_count = int(request.GET.get("below_count", 5))
 
-        above_data = user_data = below_data = None
+        board = request.GET.get("board", None)
+        if board is not None and board not in LEADERBOARDS:
+            return Response(status=status.HTTP_400_BAD_REQUEST)
 
-        rank_query = (
-            # Apply the provided submission filters
-            self.filter_queryset(Submission.objects)
-            .filter(completed_by__isnull=False)
-            # Add author information
-            .select_related("completed_by")
-            # Group by author
-            .values(
-                "completed_by", "completed_by__username", "completed_by__date_joined"
-            )
-            # Count gamma
-            .annotate(
-                gamma=Count("completed_by"),
-                id=F("completed_by"),
-                username=F("completed_by__username"),
-                date_joined=F("completed_by__date_joined"),
-            )
-            .values("id", "username", "gamma", "date_joined")
-            .order_by(F("gamma").desc(), F("date_joined").desc())
+        above_data = user_data = below_data = None
+        user = (
+            get_object_or_404(BlossomUser, id=user_id) if user_id is not None else None
         )
-        # TODO: This is very inefficient, maybe there's a better way to do this?
-        # Originally we used window expressions to annotate the ranks directly
-        # https://stackoverflow.com/questions/54595867/django-model-how-to-add-order-index-annotation
-        # Unfortunately that is not supported on all backends
-        # Instead, we convert the query into a list and also add the ranks manually
-        rank_list = rank_list = [
-            {**entry, "rank": i + 1} for i, entry in enumerate(rank_query)
-        ]
 
-        # Find the top users
-        top_data = rank_list[:top_count]
-
-        if user_id is not None:
-            # Find the queried user in the list
-            # TODO: Find a more efficient way to do this
-            user_index = [user["id"] for user in rank_list].index(user_id)
-            user_data = rank_list[user_index]
-            # Users with more gamma than the current user
-            above_data = rank_list[user_index - 1 - below_count : user_index]
-            # Users with less gamma than the current user
-            below_data = rank_list[user_index + 1 : user_index + 1 + above_count]
+        if board is not None:
+            # Serve the precomputed leaderboard
+            leaderboard = get_named_leaderboard(board, request.GET.get("source"))
+            top_data = leaderboard.top(top_count)
+            if user is not None:
+                user_data = leaderboard.entry(user)
+                above_data = leaderboard.above(user_data, above_count)
+                below_data = leaderboard.below(user_data, below_count)
+        else:
+            if self._get_used_filters(request) == {}:
+                # Without filters, the ranking can be read from the gamma counters
+                ranking = gamma_ranking()
+            else:
+                # Apply the provided submission filters
+                ranking = submission_ranking(self.filter_queryset(Submission.objects))
+
+            # Find the top users
+            top_data = get_top(ranking, top_count)
+
+            if user is not None:
+                user_data = get_entry(ranking, user)
+                # Users with more gamma than the current user
+                above_data = get_above(ranking, user_data, above_count)
+                # Users with less gamma than the current user
+                below_data = get_below(ranking, user_data, below_count)
 
         data = {
             "top": top_data,
@@ -998,3 +1329,133 @@ class SubmissionViewSet(viewsets.ModelViewSet):
             status=status.HTTP_200_OK,
             data=self.serializer_class(submission, context={"request": request}).data,
         )
+
+    def _bulk_update(
+        self,
+        submission_ids: Any,  # noqa: ANN401
+        changes: Dict[str, Any],
+        report_status: Optional[ReportMessageStatus] = None,
+    ) -> Response:
+        """
+        Apply the same changes to many submissions with a single UPDATE.
+
+        The submissions that are changed and have a Slack report get their
+        report updated to the given status in the background.
+
+        :param submission_ids: the IDs of the submissions to change
+        :param changes: the new values of the fields of the submissions
+        :param report_status: the status to update the Slack reports to
+        :return: the result of every submission, in the order of the request
+        """
+        if (
+            not isinstance(submission_ids, list)
+            or len(submission_ids) > BULK_UPDATE_MAX_SIZE
+            or not all(type(item) is int for item in submission_ids)
+            or not all(isinstance(value, bool) for value in changes.values())
+        ):
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            submissions = Submission.objects.select_for_update().filter(
+                id__in=submission_ids
+            )
+            found = set(submissions.values_list("id", flat=True))
+            changed = list(
+                submissions.exclude(**changes).values_list(
+                    "id", "report_slack_channel_id", "report_slack_message_ts"
+                )
+            )
+            changed_ids = {submission_id for submission_id, _, _ in changed}
+            Submission.objects.filter(id__in=changed_ids).update(**changes)
+
+            if report_status is not None:
+                for submission_id, channel_id, message_ts in changed:
+                    if channel_id is not None and message_ts is not None:
+                        publish_event(
+                            OutboxEvent.OutboxEventKind.REPORT_UPDATE,
+                            submission_id=submission_id,
+                            status=report_status.value,
+                        )
+
+        results: List[Dict[str, Any]] = []
+        for submission_id in submission_ids:
+            if submission_id in changed_ids:
+                result = BULK_UPDATED
+            elif submission_id in found:
+                result = BULK_UNCHANGED
+            else:
+                result = BULK_NOT_FOUND
+            results.append({"id": submission_id, "status": result})
+        return Response(status=status.HTTP_200_OK, data=results)
+
+    @csrf_exempt
+    @bulk_update_schema("archived")
+    @validate_request(data_params={"submission_ids"})
+    @action(detail=False, methods=["patch"])
+    def bulk_archive(self, request: Request, submission_ids: Any) -> Response:
+        """
+        Archive multiple submissions at once.
+
+        It is also possible to unarchive them by setting archived to false in
+        the body of the request.
+        """
+        archived = request.data.get("archived", True)
+        return self._bulk_update(submission_ids, {"archived": archived})
+
+    @csrf_exempt
+    @bulk_update_schema("removed_from_queue")
+    @validate_request(data_params={"submission_ids"})
+    @action(detail=False, methods=["patch"])
+    def bulk_remove(self, request: Request, submission_ids: Any) -> Response:
+        """
+        Remove multiple submissions from the queue at once.
+
+        It is also possible to revert the removal by setting removed_from_queue
+        to false in the body of the request.
+        """
+        removed_from_queue = request.data.get("removed_from_queue", True)
+        if removed_from_queue is True:
+            # Revert the approval as well
+            return self._bulk_update(
+                submission_ids,
+                {"removed_from_queue": True, "approved": False},
+                ReportMessageStatus.REMOVED,
+            )
+        return self._bulk_update(
+            submission_ids, {"removed_from_queue": removed_from_queue}
+        )
+
+    @csrf_exempt
+    @bulk_update_schema("approved")
+    @validate_request(data_params={"submission_ids"})
+    @action(detail=False, methods=["patch"])
+    def bulk_approve(self, request: Request, submission_ids: Any) -> Response:
+        """
+        Approve multiple submissions at once.
+
+        It is also possible to revert the approval by setting approved to false
+        in the body of the request.
+        """
+        approved = request.data.get("approved", True)
+        if approved is True:
+            # Revert the removal as well
+            return self._bulk_update(
+                submission_ids,
+                {"approved": True, "removed_from_queue": False},
+                ReportMessageStatus.APPROVED,
+            )
+        return self._bulk_update(submission_ids, {"approved": approved})
+
+    @csrf_exempt
+    @bulk_update_schema("nsfw")
+    @validate_request(data_params={"submission_ids"})
+    @action(detail=False, methods=["patch"])
+    def bulk_nsfw(self, request: Request, submission_ids: Any) -> Response:
+        """
+        Mark multiple submissions as NSFW at once.
+
+        It is also possible to mark them as SFW by setting nsfw to false in the
+        body of the request.
+        """
+        nsfw = request.data.get("nsfw", True)
+        return self._bulk_update(submission_ids, {"nsfw": nsfw})
@@ -1,9 +1,9 @@
 """Views that specifically relate to transcriptions."""
-import random
 from datetime import timedelta
 
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg.openapi import Parameter
@@ -17,12 +17,22 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 
 from api.authentication import BlossomApiPermission
-from api.helpers import validate_request
-from api.models import Source, Submission, Transcription
-from api.serializers import TranscriptionSerializer
+from api.helpers import get_source_or_404, validate_request
+from api.models import Submission, Transcription
+from api.pagination import CURSOR_PARAMETERS, StandardResultsSetPagination
+from api.sampling import add_review_history, get_review_history, sample_ids
+from api.search import parse_query, search_transcriptions
+from api.serializers import TranscriptionSearchSerializer, TranscriptionSerializer
 from authentication.models import BlossomUser
 
+# The maximum number of transcriptions pulled at once for a review
+REVIEW_BATCH_MAX_SIZE = 25
 
+
+@method_decorator(
+    name="list",
+    decorator=swagger_auto_schema(manual_parameters=CURSOR_PARAMETERS),
+)
 class TranscriptionViewSet(viewsets.ModelViewSet):
     """The API view to view and edit information regarding Transcribers."""
 
@@ -46,6 +56,8 @@ class TranscriptionViewSet(viewsets.ModelViewSet):
         "create_time",
         "last_update_time",
     ]
+    # The indexed orderings that can be used with `pagination=cursor`
+    cursor_ordering_fields = ["id", "create_time"]
 
     @csrf_exempt
     @swagger_auto_schema(
@@ -117,7 +129,7 @@ class TranscriptionViewSet(viewsets.ModelViewSet):
         # todo: if the original_id is passed in here, make sure this is okay
         submission = get_object_or_404(Submission, id=submission_id)
         user = get_object_or_404(BlossomUser, username=username)
-        source = get_object_or_404(Source, name=source)
+        source = get_source_or_404(source)
         removed_from_reddit = request.data.get("removed_from_reddit", "False") == "True"
 
         if user.blacklisted:
@@ -174,12 +186,80 @@ class TranscriptionViewSet(viewsets.ModelViewSet):
 
     @csrf_exempt
     @swagger_auto_schema(
+        manual_parameters=[
+            Parameter(
+                "query",
+                "query",
+                type="string",
+                description="The words to search for. Words ending in * match every"
+                " word starting with them, words between double quotes have to"
+                " appear as that exact phrase.",
+                required=True,
+            ),
+            Parameter(
+                "page",
+                "query",
+                type="integer",
+                description="The number of the page of results, starting at 1.",
+                required=False,
+            ),
+        ],
+        responses={
+            200: DocResponse(
+                "The matching transcriptions, the best matches first",
+                schema=TranscriptionSearchSerializer,
+            ),
+            400: "The query has nothing to search for",
+        },
+    )
+    @validate_request(query_params={"query"})
+    @action(detail=False, methods=["get"])
+    def text_search(
+        self, request: Request, query: str = None, *args: object, **kwargs: object
+    ) -> Response:
+        """
+        Search the text of the transcriptions.
+
+        The results are ranked by how well they match and come with a snippet
+        of the text, in which the matched words are in bold. They can be
+        narrowed down with the same filters as the list of transcriptions and
+        are paginated by page number, as the rank is not unique and cannot be
+        used as the position of a cursor.
+        """
+        terms = parse_query(query)
+        if not terms:
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = search_transcriptions(
+            self.filter_queryset(self.get_queryset()), terms
+        )
+        pagination = StandardResultsSetPagination()
+        page = pagination.paginate_queryset(queryset, request, self)
+        return pagination.get_paginated_response(
+            TranscriptionSearchSerializer(
+                page, many=True, context={"request": request}
+            ).data
+        )
+
+    @csrf_exempt
+    @swagger_auto_schema(
+        manual_parameters=[
+            Parameter(
+                "count",
+                "query",
+                type="integer",
+                description="Pull this many transcriptions at once, as a list,"
+                f" at most {REVIEW_BATCH_MAX_SIZE}.",
+                required=False,
+            ),
+        ],
         responses={
             200: DocResponse(
                 "Successful retrieval of a random transcription",
                 schema=serializer_class,
-            )
-        }
+            ),
+            400: "The count is not a valid number",
+        },
     )
     @action(detail=False, methods=["get"])
     def review_random(
@@ -188,20 +268,33 @@ class TranscriptionViewSet(viewsets.ModelViewSet):
         """
         Pull a random transcription that was completed in the last hour and return it.
 
-        Note that if there are no transcriptions in the last hour, this request
-        returns an empty HTTP body.
+        The transcriptions recently pulled by the same user are skipped.
+        Note that if there are no such transcriptions in the last hour, this
+        request returns an empty HTTP body.
+
+        With the `count` parameter, a list of up to that many transcriptions is
+        returned instead, for a whole review session.
         """
+        count = request.query_params.get("count")
+        if count is not None:
+            try:
+                count = int(count)
+            except ValueError:
+                return Response(status=status.HTTP_400_BAD_REQUEST)
+            if not 1 <= count <= REVIEW_BATCH_MAX_SIZE:
+                return Response(status=status.HTTP_400_BAD_REQUEST)
         one_hour_ago = timezone.now() - timedelta(hours=1)
-
         queryset = Transcription.objects.filter(create_time__gte=one_hour_ago)
+        history = get_review_history(request.user.id)
+        ids = sample_ids(queryset, count or 1, exclude=history)
+        add_review_history(request.user.id, ids)
+        transcriptions = Transcription.objects.in_bulk(ids)
+        data = self.serializer_class(
+            [transcriptions[transcription_id] for transcription_id in ids],
+            many=True,
+            context={"request": request},
+        ).data
 
-        # TODO: Add system so that we're not pulling the same one over and over
-
-        if not queryset:
-            return Response()
-        else:
-            return Response(
-                data=self.serializer_class(
-                    random.choice(queryset), context={"request": request}
-                ).data
-            )
+        if count is not None:
+            return Response(data=data)
+        return Response(data=data[0] if data else None)
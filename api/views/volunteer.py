@@ -17,7 +17,7 @@ from rest_framework.response import Response
 from api.authentication import BlossomApiPermission
 from api.filters import CaseInsensitiveUsernameFilter
 from api.helpers import validate_request
-from api.models import Source, Submission, Transcription
+from api.models import Submission, Transcription, get_source
 from api.serializers import VolunteerSerializer
 from authentication.models import BlossomUser
 
@@ -71,9 +71,11 @@ class VolunteerViewSet(viewsets.ModelViewSet):
         """
         user = get_object_or_404(BlossomUser, id=pk)
 
-        gamma_plus_one, _ = Source.objects.get_or_create(name="gamma_plus_one")
+        gamma_plus_one = get_source("gamma_plus_one", create=True)
 
-        dummy_post = Submission.objects.create(source=gamma_plus_one, completed_by=user)
+        dummy_post = Submission.objects.create(
+            source=gamma_plus_one, completed_by=user, transcribable=False
+        )
         Transcription.objects.create(
             submission=dummy_post,
             author=user,
@@ -1,4 +1,5 @@
 import random
+import uuid
 from typing import Any
 from unittest.mock import patch
 
@@ -9,7 +10,7 @@ from django.test import Client, RequestFactory
 from pytest_django.fixtures import SettingsWrapper
 from rest_framework import status
 
-from api.models import Transcription
+from api.models import Submission, Transcription
 from app.views import TranscribeSubmission
 from utils.test_helpers import (
     add_social_auth_to_user,
@@ -182,6 +183,71 @@ class TestChooseSubmission:
             response = client.get(reverse("choose_transcription"))
             assert response.context.get("show_confetti") is None
 
+    def test_placeholder_options(self, client: Client) -> None:
+        """Verify that placeholder submissions are not offered."""
+        client, _, user = setup_user_client(client)
+        add_social_auth_to_user(user)
+
+        placeholder = create_submission(
+            title="a", content_url="http://imgur.com", transcribable=False
+        )
+        # Generated IDs are not mistaken for placeholders
+        submission = create_submission(
+            original_id=str(uuid.uuid4()),
+            title="b",
+            content_url="http://imgur.com/a.png",
+        )
+
+        response = client.get(reverse("choose_transcription"))
+
+        assert not placeholder.transcribable
+        assert submission.transcribable
+        assert submission.content_host == "imgur.com"
+        assert response.context["options"] == [submission]
+
+    def test_options_loaded_alone(self, client: Client) -> None:
+        """Verify that only the three chosen submissions are loaded."""
+        client, _, user = setup_user_client(client)
+        add_social_auth_to_user(user)
+
+        for index in range(10):
+            create_submission(
+                original_id=str(index), title="abc", content_url="http://imgur.com"
+            )
+
+        with patch(
+            "app.views.Submission.objects.in_bulk",
+            wraps=Submission.objects.in_bulk,
+        ) as in_bulk:
+            response = client.get(reverse("choose_transcription"))
+
+        assert len(response.context["options"]) == 3
+        assert len(in_bulk.call_args[0][0]) == 3
+
+    def test_options_with_sparse_queue(self, client: Client) -> None:
+        """Verify that the options are picked from a queue with gaps in the IDs."""
+        client, _, user = setup_user_client(client)
+        add_social_auth_to_user(user)
+
+        submissions = [
+            create_submission(
+                original_id=str(index), title="abc", content_url="http://imgur.com"
+            )
+            for index in range(12)
+        ]
+        for submission in submissions[:3] + submissions[4:8] + submissions[9:11]:
+            submission.claimed_by = user
+            submission.save()
+        queue = {submissions[index].id for index in [3, 8, 11]}
+
+        # Pick the options by random IDs instead of from a page of IDs
+        with patch("api.sampling.SAMPLE_PAGE_SIZE", 1), patch(
+            "api.sampling.random.randint", side_effect=[5, 1, 10]
+        ):
+            response = client.get(reverse("choose_transcription"))
+
+        assert {option.id for option in response.context["options"]} == queue
+
     def test_no_error_page_with_completed_posts(self, client: Client) -> None:
         """Verify that if completed posts exist, we don't show an error page."""
         client, _, user = setup_user_client(client)
@@ -366,7 +432,7 @@ class TestTranscribeSubmission:
         )
         assert submission.completed_by is None
 
-        with patch("api.views.submission.send_check_message"):
+        with patch("api.outbox.send_check_message"):
             response = client.post(
                 reverse(
                     "transcribe_submission", kwargs={"submission_id": submission.id}
@@ -429,7 +495,7 @@ class TestTranscribeSubmission:
             claimed_by=user,
         )
 
-        with patch("api.views.submission.send_check_message"):
+        with patch("api.outbox.send_check_message"):
             client.post(
                 reverse(
                     "transcribe_submission", kwargs={"submission_id": submission.id}
@@ -23,7 +23,8 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import View
 from rest_framework import status
 
-from api.models import Source, Submission, Transcription
+from api.models import Source, Submission, Transcription, get_source
+from api.sampling import sample_ids
 from api.slack.actions import ask_about_removing_post
 from api.views.submission import SubmissionViewSet
 from app.permissions import RequireCoCMixin, require_coc, require_reddit_auth
@@ -71,7 +72,7 @@ TRANSCRIPTION_TEMPLATE = (
 
 def get_blossom_app_source() -> Source:
     """Get the source object for transcriptions completed using the App."""
-    return Source.objects.get_or_create(name="TranscriptionApp")[0]
+    return get_source("TranscriptionApp", create=True)
 
 
 @login_required
@@ -114,28 +115,24 @@ def choose_transcription(request: HttpRequest) -> HttpResponse:
         if settings.OVERRIDE_ARCHIVIST_DELAY_TIME
         else settings.ARCHIVIST_DELAY_TIME
     )
-    submissions = Submission.objects.annotate(
-        original_id_len=Length("original_id")
-    ).filter(
-        original_id_len__lt=10,
+    submissions = Submission.objects.filter(
+        transcribable=True,
+        content_host__in=settings.IMAGE_DOMAINS,
         completed_by=None,
         claimed_by=None,
         create_time__gte=time_delay,
         removed_from_queue=False,
         archived=False,
+    ).order_by(
+        # The columns of the partial index of the queue
+        "content_host",
+        "create_time",
+        "id",
     )
-
-    options_list = [obj for obj in submissions if obj.is_image]
-
-    if len(options_list) > 3:
-        # we have more to choose from, so let's grab 3
-        temp = []
-        for _ in range(3):
-            submission = random.choice(options_list)
-            temp.append(options_list.pop(options_list.index(submission)))
-        options = temp
-    else:
-        options = options_list
+    # Pick three of them in the database, so that only those are loaded
+    option_ids = sample_ids(submissions, 3)
+    submissions_by_id = Submission.objects.in_bulk(option_ids)
+    options = [submissions_by_id[submission_id] for submission_id in option_ids]
 
     for submission in options:
         # todo: add check for source. This will need to happen after we convert
@@ -151,17 +148,13 @@ def choose_transcription(request: HttpRequest) -> HttpResponse:
     context = get_additional_context({"options": options, "fullwidth_view": True})
 
     if len(options) == 0:
-        completed_post_count = (
-            Submission.objects.annotate(original_id_len=Length("original_id"))
-            .filter(
-                original_id_len__lt=10,
-                completed_by__isnull=False,
-                create_time__gte=time_delay,
-            )
-            .count()
-        )
-        if completed_post_count == 0:
-            # if it's not zero, then we cleared the queue and will show that page instead.
+        has_completed_posts = Submission.objects.filter(
+            transcribable=True,
+            completed_by__isnull=False,
+            create_time__gte=time_delay,
+        ).exists()
+        if not has_completed_posts:
+            # if there are any, then we cleared the queue and will show that page instead.
             context.update({"show_error_page": True})
     claimed_submissions = Submission.objects.filter(
         claimed_by=request.user, archived=False, completed_by__isnull=True
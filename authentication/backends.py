@@ -7,6 +7,11 @@ from django.contrib.auth.models import User
 from rest_framework import authentication
 from rest_framework.request import Request
 
+from authentication.credentials import (
+    authenticate_api_key,
+    authenticate_password,
+    get_request_api_key,
+)
 from authentication.models import BlossomUser
 
 
@@ -50,14 +55,19 @@ class BlossomRestFrameworkAuth(authentication.BaseAuthentication):
         so it's easier to just expand it into its own type of auth handler.
 
         The first check is for standard API interactions involving the BlossomAPI
-        class. Username + password. The second check (SessionAuthentication) is
-        used for the web interface -- log in through the front end and browse the
-        API as an authenticated user.
+        class. Username + password, or only the API key if neither is sent; the
+        verified credentials are cached for a short while, so that the bots do
+        not pay for the password hasher on every call. The second check
+        (SessionAuthentication) is used for the web interface -- log in through
+        the front end and browse the API as an authenticated user.
         """
-        if user := EmailBackend().authenticate(
-            username=request.data.get("email"), password=request.data.get("password")
-        ):
-            return (user, None)
+        email, password = request.data.get("email"), request.data.get("password")
+        if email or password:
+            if user := authenticate_password(email, password):
+                return (user, None)
+        elif key := get_request_api_key(request):
+            if user := authenticate_api_key(key):
+                return (user, None)
 
         if user_data := authentication.SessionAuthentication().authenticate(request):
             if user_data[0].is_staff or user_data[0].is_grafeas_staff:
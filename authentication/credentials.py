@@ -0,0 +1,109 @@
+"""
+A short-lived cache of verified credentials.
+
+Checking a password or API key runs a deliberately slow hasher, which the bots
+would otherwise pay for on every single API call. Once a set of credentials
+has been verified, a keyed digest of them is cached for a few minutes, so
+that repeated calls only have to look up the user.
+
+The cache entries remember a fingerprint of the stored password hash or API
+key hash. Changing the password or replacing the key changes the fingerprint,
+which invalidates the cached credentials right away. Revoked and expired API
+keys are rejected regardless of the cache.
+"""
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare, salted_hmac
+from rest_framework.request import Request
+from rest_framework_api_key.models import APIKey
+
+from authentication.models import BlossomUser
+
+KEY_SALT = "authentication.credentials"
+
+
+def _digest(*values: str) -> str:
+    """Compute a digest of the values keyed with the secret key of the site."""
+    return salted_hmac(KEY_SALT, "\0".join(values)).hexdigest()
+
+
+def _is_cached(cache_key: str, fingerprint: str) -> bool:
+    """Check whether the cached credentials match the current fingerprint."""
+    cached = cache.get(cache_key)
+    return cached is not None and constant_time_compare(cached, _digest(fingerprint))
+
+
+def _remember(cache_key: str, fingerprint: str) -> None:
+    """Cache the verified credentials with their current fingerprint."""
+    cache.set(cache_key, _digest(fingerprint), settings.CREDENTIAL_CACHE_TIMEOUT)
+
+
+def get_request_api_key(request: Request) -> Optional[str]:
+    """Get the key from the `Authorization: Api-Key <key>` header of the request."""
+    header = request.headers.get("Authorization", "").split()
+    if len(header) >= 2 and header[0] == "Api-Key":
+        return header[1]
+    return None
+
+
+def authenticate_password(email: str, password: str) -> Optional[BlossomUser]:
+    """Get the user with the given email address, if the password is correct.
+
+    :param email: the email address of the user
+    :param password: the password of the user
+    :return: the user if the credentials are correct, otherwise None
+    """
+    if not email or not password:
+        return None
+    try:
+        user = BlossomUser.objects.get(email=email)
+    except BlossomUser.DoesNotExist:
+        return None
+
+    cache_key = f"credentials:password:{_digest(email, password)}"
+    if _is_cached(cache_key, user.password):
+        return user
+    if not user.check_password(password):
+        return None
+    # Checking the password might have upgraded its hash
+    _remember(cache_key, user.password)
+    return user
+
+
+def verify_api_key(api_key: APIKey, key: str) -> bool:
+    """Check whether the given key is the API key and it can still be used.
+
+    :param api_key: the API key that the key should belong to
+    :param key: the key provided with the request
+    :return: whether the key is valid
+    """
+    if api_key.revoked or api_key.has_expired:
+        return False
+
+    cache_key = f"credentials:api_key:{_digest(key)}"
+    fingerprint = f"{api_key.id}:{api_key.hashed_key}"
+    if _is_cached(cache_key, fingerprint):
+        return True
+    if not api_key.is_valid(key):
+        return False
+    _remember(cache_key, fingerprint)
+    return True
+
+
+def authenticate_api_key(key: str) -> Optional[BlossomUser]:
+    """Get the user that owns the given API key, if it is valid.
+
+    :param key: the key provided with the request
+    :return: the owner of the key if the key is valid, otherwise None
+    """
+    prefix, _, _ = key.partition(".")
+    user = (
+        BlossomUser.objects.select_related("api_key")
+        .filter(api_key__prefix=prefix)
+        .first()
+    )
+    if user is None or not verify_api_key(user.api_key, key):
+        return None
+    return user
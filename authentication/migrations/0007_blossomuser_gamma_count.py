@@ -0,0 +1,40 @@
+# Generated by Django 3.2.25 on 2026-10-18 04:19
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_gamma_count(apps, schema_editor):  # noqa: ANN001,ANN201
+    BlossomUser = apps.get_model("authentication", "BlossomUser")  # noqa: N806
+    Submission = apps.get_model("api", "Submission")  # noqa: N806
+
+    BlossomUser.objects.update(
+        gamma_count=Coalesce(
+            Subquery(
+                Submission.objects.filter(completed_by=OuterRef("pk"))
+                .order_by()
+                .values("completed_by")
+                .annotate(count=Count("id"))
+                .values("count")
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0025_accountmigration"),
+        ("authentication", "0006_blossomuser_overwrite_check_percentage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blossomuser",
+            name="gamma_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_gamma_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 3.2.25 on 2026-10-18 04:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0007_blossomuser_gamma_count"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="blossomuser",
+            index=models.Index(
+                fields=["gamma_count", "date_joined", "id"],
+                name="authenticat_gamma_c_9453ff_idx",
+            ),
+        ),
+    ]
@@ -1,15 +1,17 @@
 """Models used within the Authentication application."""
 import random
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Iterable, List, Optional, Tuple
 
 import pytz
 from django.contrib.auth.models import AbstractUser, UserManager
 from django.db import models
-from django.db.models import QuerySet
+from django.db.models import Count, Field, OuterRef, Q, QuerySet, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from rest_framework_api_key.models import APIKey
 
+from api.completions import count_completions
 from api.models import Submission
 
 # A list of gamma values and corresponding check percentages.
@@ -61,7 +63,11 @@ class BlossomUser(AbstractUser):
     """
 
     class Meta:
-        indexes = [models.Index(fields=["username", "email"])]
+        indexes = [
+            models.Index(fields=["username", "email"]),
+            # Used to look up the ranks on the leaderboard
+            models.Index(fields=["gamma_count", "date_joined", "id"]),
+        ]
 
     # The backend class which is used to authenticate the BlossomUser.
     backend = "authentication.backends.EmailBackend"
@@ -98,8 +104,38 @@ class BlossomUser(AbstractUser):
     # with this user.
     blacklisted = models.BooleanField(default=False)
 
+    # The number of submissions completed by this user. This is a denormalized
+    # copy of `Submission.objects.filter(completed_by=user).count()` which is
+    # kept up to date by `Submission.save` and friends. It is never written by
+    # `BlossomUser.save`; use `reconcile_gamma` to repair it if it drifts.
+    gamma_count = models.IntegerField(default=0)
+
     objects = BlossomUserManager()
 
+    def _do_update(
+        self,
+        base_qs: QuerySet,
+        using: str,
+        pk_val: Any,
+        values: List[Tuple[Field, Any, Any]],
+        update_fields: Optional[Iterable[str]],
+        forced_update: bool,
+    ) -> bool:
+        """
+        Update the row of the user, but not its gamma counter.
+
+        The gamma counter is updated in place by the database, so an instance
+        that was loaded before a submission got completed holds a stale value.
+        To avoid writing that stale value back, the counter is left out when
+        saving all fields. It is still written when the user is created or when
+        it is explicitly listed in `update_fields`.
+        """
+        if update_fields is None:
+            values = [value for value in values if value[0].name != "gamma_count"]
+        return super()._do_update(
+            base_qs, using, pk_val, values, update_fields, forced_update
+        )
+
     def date_last_active(self) -> Optional[datetime]:
         """Return the time where the user was last active.
 
@@ -129,12 +165,15 @@ class BlossomUser(AbstractUser):
         """
         Return the number of transcriptions the user has made.
 
-        Note that this is a calculated property, computed by the number of
-        transcriptions in the database.
+        Note that this reads the denormalized `gamma_count` field instead of
+        counting the transcriptions in the database.
 
         :return: the number of transcriptions written by the user.
         """
-        return self.gamma_at_time(start_time=None, end_time=None)
+        if self.blacklisted:
+            return 0  # see https://github.com/GrafeasGroup/blossom/issues/15
+
+        return self.gamma_count
 
     def gamma_at_time(
         self,
@@ -144,21 +183,23 @@ class BlossomUser(AbstractUser):
     ) -> int:
         """Return the number of transcriptions the user has made in the given time-frame.
 
+        The total gamma is read from the counter on the user, while time-frames
+        are counted from the hourly completion rollups.
+
         :param start_time: The time to start counting transcriptions from.
         :param end_time: The time to end counting transcriptions to.
         """
         if self.blacklisted:
             return 0  # see https://github.com/GrafeasGroup/blossom/issues/15
 
-        filters = {
-            "completed_by": self,
-        }
-        if start_time:
-            filters["complete_time__gte"] = start_time
-        if end_time:
-            filters["complete_time__lte"] = end_time
+        if start_time is None and end_time is None:
+            return self.gamma_count
 
-        return Submission.objects.filter(**filters).count()
+        return count_completions(
+            completed_by=self.id,
+            lower=(start_time, True) if start_time else None,
+            upper=(end_time, True) if end_time else None,
+        )
 
     def __str__(self) -> str:
         return self.username
@@ -170,7 +211,7 @@ class BlossomUser(AbstractUser):
 
         Override provided for the purposes of checking ranks.
         """
-        gamma = override if override else self.gamma
+        gamma = override if override is not None else self.gamma
 
         if gamma >= 20000:
             return "Sapphire"
@@ -251,3 +292,39 @@ class BlossomUser(AbstractUser):
             reason="Watched" if self.overwrite_check_percentage else "Automatic",
             percentage=self.check_percentage,
         )
+
+
+def reconcile_gamma(queryset: Optional[QuerySet] = None) -> int:
+    """Recalculate the gamma counters of the given users from the submissions.
+
+    The drifted users are found with a single query and fixed with a single
+    UPDATE, so this is safe to run on the entire user table.
+
+    :param queryset: The users to reconcile. Defaults to all users.
+    :return: The number of users whose counter was out of sync.
+    """
+    if queryset is None:
+        queryset = BlossomUser.objects.all()
+
+    actual_gamma = Coalesce(
+        Subquery(
+            Submission.objects.filter(completed_by=OuterRef("pk"))
+            .order_by()
+            .values("completed_by")
+            .annotate(count=Count("id"))
+            .values("count")
+        ),
+        0,
+    )
+    drifted = queryset.annotate(actual_gamma=actual_gamma).filter(
+        ~Q(gamma_count=models.F("actual_gamma"))
+    )
+    drifted_ids = list(drifted.values_list("id", flat=True))
+    if drifted_ids:
+        BlossomUser.objects.filter(id__in=drifted_ids).update(gamma_count=actual_gamma)
+        # prevent circular import
+        from api.leaderboard import invalidate_leaderboards
+
+        invalidate_leaderboards()
+
+    return len(drifted_ids)
@@ -1,14 +1,17 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Optional
 from unittest.mock import PropertyMock, patch
 
 import pytest
 import pytz
 from django.test import Client
 
+from api.models import Submission
+from authentication.models import BlossomUser, reconcile_gamma
 from utils.test_helpers import (
     create_submission,
     create_transcription,
+    create_user,
     setup_user_client,
 )
 
@@ -72,6 +75,104 @@ def test_gamma_with_empty_times(client: Client) -> None:
     assert user.gamma == 6
 
 
+def test_gamma_counter_follows_submissions(client: Client) -> None:
+    """Test that the gamma counter is updated when submissions change hands."""
+    client, headers, user = setup_user_client(client, id=123, username="Test")
+    other_user = create_user(id=124, username="Other")
+
+    submission = create_submission(completed_by=user)
+    create_submission(completed_by=user)
+    assert user.gamma == 2
+
+    # Move one submission to another user
+    submission = Submission.objects.get(id=submission.id)
+    submission.completed_by = other_user
+    submission.save()
+    user.refresh_from_db()
+    other_user.refresh_from_db()
+    assert user.gamma == 1
+    assert other_user.gamma == 1
+
+    # Deleting the submission removes the gamma again
+    Submission.objects.filter(id=submission.id).delete()
+    other_user.refresh_from_db()
+    assert other_user.gamma == 0
+
+
+def test_gamma_counter_not_overwritten_by_stale_user(client: Client) -> None:
+    """Test that saving an outdated user object does not reset the counter."""
+    client, headers, user = setup_user_client(client, id=123, username="Test")
+    stale_user = BlossomUser.objects.get(id=user.id)
+
+    create_submission(completed_by=user)
+
+    stale_user.accepted_coc = False
+    stale_user.save()
+    user.refresh_from_db()
+    assert user.gamma == 1
+    assert user.accepted_coc is False
+
+
+def test_gamma_counter_deferred_submissions(
+    client: Client, django_assert_num_queries: Any
+) -> None:
+    """Test that the counter also follows submissions loaded with deferred fields."""
+    client, headers, user = setup_user_client(client, id=123, username="Test")
+    other_user = create_user(id=124, username="Other")
+    for _ in range(5):
+        create_submission(completed_by=user)
+
+    # Loading the submissions must not load the deferred fields one by one
+    with django_assert_num_queries(1):
+        submissions = list(Submission.objects.only("id"))
+    assert len(submissions) == 5
+
+    submission = submissions[0]
+    submission.completed_by = other_user
+    submission.save()
+    user.refresh_from_db()
+    other_user.refresh_from_db()
+    assert user.gamma == 4
+    assert other_user.gamma == 1
+
+
+def test_save_user_without_row(client: Client) -> None:
+    """Test that saving a user whose row is gone creates it again."""
+    client, headers, user = setup_user_client(client, id=123, username="Test")
+    BlossomUser.objects.filter(id=user.id).delete()
+
+    user.save()
+    assert BlossomUser.objects.filter(id=user.id).exists()
+
+
+def test_gamma_blacklisted(client: Client) -> None:
+    """Test that blacklisted users always have zero gamma."""
+    client, headers, user = setup_user_client(client, blacklisted=True)
+    create_submission(completed_by=user)
+
+    assert user.gamma == 0
+    assert user.gamma_at_time(start_time=datetime(2020, 1, 1)) == 0
+
+
+def test_reconcile_gamma(client: Client) -> None:
+    """Test that drifted gamma counters are repaired."""
+    client, headers, user = setup_user_client(client, id=123, username="Test")
+    other_user = create_user(id=124, username="Other")
+    create_submission(completed_by=user)
+    create_submission(completed_by=user)
+
+    BlossomUser.objects.filter(id=user.id).update(gamma_count=10)
+    BlossomUser.objects.filter(id=other_user.id).update(gamma_count=-3)
+
+    assert reconcile_gamma() == 2
+    assert reconcile_gamma() == 0
+
+    user.refresh_from_db()
+    other_user.refresh_from_db()
+    assert user.gamma == 2
+    assert other_user.gamma == 0
+
+
 @pytest.mark.parametrize(
     "start_time, end_time, expected",
     [
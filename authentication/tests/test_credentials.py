@@ -0,0 +1,109 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework_api_key.models import APIKey
+
+from authentication.credentials import (
+    authenticate_api_key,
+    authenticate_password,
+    verify_api_key,
+)
+from authentication.models import BlossomUser
+from utils.test_helpers import create_user
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+@pytest.fixture(autouse=True)
+def enable_cache(settings: SettingsWrapper) -> None:
+    """Use an actual, empty cache instead of the dummy cache of the tests."""
+    settings.CACHES = LOCMEM_CACHES
+    cache.clear()
+
+
+def _create_user_with_password() -> BlossomUser:
+    """Create a user that logs in with a@example.com and "secret"."""
+    user = create_user(id=100, email="a@example.com")
+    user.set_password("secret")
+    user.save()
+    return user
+
+
+class TestCredentialCache:
+    """Tests validating the cache of the verified credentials."""
+
+    def test_password_cached(self) -> None:
+        """Verify that a verified password is not hashed again."""
+        user = _create_user_with_password()
+
+        with patch.object(
+            BlossomUser,
+            "check_password",
+            autospec=True,
+            side_effect=BlossomUser.check_password,
+        ) as mock:
+            assert authenticate_password("a@example.com", "secret") == user
+            assert authenticate_password("a@example.com", "secret") == user
+
+        assert mock.call_count == 1
+
+    def test_wrong_password_rejected(self) -> None:
+        """Verify that a wrong password is neither accepted nor cached."""
+        _create_user_with_password()
+
+        assert authenticate_password("a@example.com", "secret") is not None
+        assert authenticate_password("a@example.com", "wrong") is None
+        assert authenticate_password("b@example.com", "secret") is None
+
+    def test_password_change_invalidates(self) -> None:
+        """Verify that the old password is rejected right after changing it."""
+        user = _create_user_with_password()
+        assert authenticate_password("a@example.com", "secret") == user
+
+        user.set_password("new secret")
+        user.save()
+
+        assert authenticate_password("a@example.com", "secret") is None
+        assert authenticate_password("a@example.com", "new secret") == user
+
+    def test_api_key_cached(self) -> None:
+        """Verify that a verified API key is not hashed again."""
+        api_key, key = APIKey.objects.create_key(name="test")
+        user = create_user(id=100, api_key=api_key)
+
+        with patch.object(
+            APIKey, "is_valid", autospec=True, side_effect=APIKey.is_valid
+        ) as mock:
+            assert authenticate_api_key(key) == user
+            assert authenticate_api_key(key) == user
+            assert verify_api_key(api_key, key)
+
+        assert mock.call_count == 1
+        assert authenticate_api_key(key + "x") is None
+        assert authenticate_api_key("unknown.key") is None
+
+    def test_revoked_api_key_rejected(self) -> None:
+        """Verify that revoking an API key takes effect despite the cache."""
+        api_key, key = APIKey.objects.create_key(name="test")
+        create_user(id=100, api_key=api_key)
+        assert authenticate_api_key(key) is not None
+
+        api_key.revoked = True
+        api_key.save()
+
+        assert authenticate_api_key(key) is None
+
+    def test_replaced_api_key_rejected(self) -> None:
+        """Verify that the old key is rejected after giving the user a new key."""
+        old_api_key, old_key = APIKey.objects.create_key(name="old")
+        user = create_user(id=100, api_key=old_api_key)
+        assert verify_api_key(old_api_key, old_key)
+
+        user.api_key, _ = APIKey.objects.create_key(name="new")
+        user.save()
+
+        assert not verify_api_key(user.api_key, old_key)
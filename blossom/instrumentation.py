@@ -29,3 +29,16 @@ def post_worker_init(worker: Any) -> None:
     }
     beeline.init(**args)
     atexit.register(beeline.close)
+
+
+def worker_exit(server: Any, worker: Any) -> None:
+    """
+    Gunicorn hook, called in the worker process just before it exits.
+
+    Lets the background tasks that are still queued finish, instead of losing
+    them when gunicorn restarts or scales down its workers.
+    """
+    from utils.workers import shutdown_pools
+
+    shutdown_pools()
+    logging.info(f"Worker pools of process pid {os.getpid()} stopped.")
@@ -0,0 +1,47 @@
+"""
+Index the transcriptions that were written before the full-text search existed.
+
+New and edited transcriptions are indexed when they are written. The ones from
+before the search was installed are only found once this command has run. It
+can safely be interrupted and run again, it continues where it stopped. It also
+reinstalls the triggers, in case a migration of SQLite recreated the table, and
+builds the indexes on PostgreSQL that are still missing, e.g. the trigram index
+if the `pg_trgm` extension was only created after the migrations ran.
+
+Usage: python manage.py backfill_search_index [--batch-size 1000]
+"""
+import logging
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection
+
+from api.search import (
+    backfill_search_index,
+    install_search,
+    install_search_indexes,
+)
+
+logger = logging.getLogger("blossom.management.backfill_search_index")
+
+
+class Command(BaseCommand):
+    help = (
+        "Indexes the existing transcriptions for the full-text search."  # noqa: VNE003
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Allow changing the number of rows indexed at once."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="The number of transcriptions to index per transaction.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Install the search if needed and index the missing transcriptions."""
+        install_search(connection)
+        indexed = backfill_search_index(connection, options["batch_size"])
+        install_search_indexes(connection)
+        logger.info(self.style.SUCCESS(f"Indexed {indexed} transcription(s)."))
@@ -0,0 +1,49 @@
+"""
+Compute the named leaderboards in the background.
+
+The leaderboards are cached and invalidated whenever the gamma of a volunteer
+changes, after which the next request has to compute them again. This worker
+computes the leaderboards of all sources at a regular interval, so that the
+requests can usually read them from the cache. Pass `--once` to compute them
+and exit, e.g. from a cron job.
+
+Usage: python manage.py precompute_leaderboards [--once] [--interval SECONDS]
+"""
+import logging
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import close_old_connections
+
+from api.leaderboard import precompute_leaderboards
+
+logger = logging.getLogger("blossom.management.precompute_leaderboards")
+
+
+class Command(BaseCommand):
+    help = "Computes and caches the named leaderboards."  # noqa: VNE003
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Allow running the worker once or changing its interval."""
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Compute the leaderboards and exit.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=60,
+            help="The number of seconds between two computations.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Compute the leaderboards, either once or until interrupted."""
+        while True:
+            close_old_connections()
+            precompute_leaderboards()
+            logger.debug("Precomputed the leaderboards.")
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
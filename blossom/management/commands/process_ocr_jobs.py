@@ -0,0 +1,81 @@
+"""
+Run the OCR of the image submissions in the background.
+
+Runs as a long-lived worker that polls for due OCR jobs and processes them
+with the given number of threads. Several workers can run at the same time,
+every job is leased by one of them. Pass `--once` to process the due jobs and
+exit, e.g. from a cron job.
+
+Usage: python manage.py process_ocr_jobs [--concurrency N] [--once]
+"""
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection
+
+from ocr import cache
+from ocr.jobs import process_jobs
+
+logger = logging.getLogger("blossom.management.process_ocr_jobs")
+
+
+class Command(BaseCommand):
+    help = "Processes the queued OCR jobs."  # noqa: VNE003
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Allow configuring the concurrency and polling of the worker."""
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="The number of jobs to process at the same time.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process the jobs that are due and exit.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="The number of seconds to wait when no jobs are due.",
+        )
+
+    def _work(self, worker: str, once: bool, interval: float) -> None:
+        """Process jobs in the current thread."""
+        try:
+            while True:
+                processed = process_jobs(worker)
+                if processed:
+                    logger.info(
+                        f"{worker} processed {processed} OCR job(s), "
+                        f"OCR cache: {cache.stats}."
+                    )
+                if once:
+                    return
+                time.sleep(interval)
+        finally:
+            # Every thread has its own database connection
+            connection.close()
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Start the worker threads and wait for them to finish."""
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        threads = [
+            threading.Thread(
+                target=self._work,
+                args=(f"{prefix}:{index}", options["once"], options["interval"]),
+                daemon=True,
+            )
+            for index in range(max(options["concurrency"], 1))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
@@ -0,0 +1,56 @@
+"""
+Process the side effects that the API calls have recorded in the outbox.
+
+Runs as a long-lived worker that polls for due events, e.g. to send the
+transcription checks and rank up messages to Slack. Several workers can run
+at the same time. Pass `--once` to process the due events and exit, e.g. from
+a cron job.
+
+Usage: python manage.py process_outbox [--once] [--interval SECONDS]
+"""
+import logging
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import close_old_connections
+
+from api.outbox import process_events
+
+logger = logging.getLogger("blossom.management.process_outbox")
+
+
+class Command(BaseCommand):
+    help = "Processes the events recorded in the outbox."  # noqa: VNE003
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Allow running the worker once or tuning its polling."""
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process the events that are due and exit.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2,
+            help="The number of seconds to wait when no events are due.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="The maximum number of events to process at once.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Process the due events, either once or until interrupted."""
+        while True:
+            close_old_connections()
+            processed = process_events(limit=options["batch_size"])
+            if processed:
+                logger.info(f"Processed {processed} outbox event(s).")
+            if options["once"]:
+                return
+            if processed < options["batch_size"]:
+                time.sleep(options["interval"])
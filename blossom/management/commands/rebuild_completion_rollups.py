@@ -0,0 +1,59 @@
+"""
+Rebuild the hourly completion rollups from the submission table.
+
+The rollups are kept up to date whenever a submission is completed, moved or
+deleted. If they ever drift from the submission table (for example after
+manual database surgery), this command recreates them in bulk. Pass `--check`
+to only report the buckets that are out of sync.
+
+Usage: python manage.py rebuild_completion_rollups [--check]
+"""
+import logging
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from api.completions import find_rollup_drift, rebuild_completion_rollups
+from authentication.models import BlossomUser
+
+logger = logging.getLogger("blossom.management.rebuild_completion_rollups")
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the hourly completion rollups."  # noqa: VNE003
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Allow limiting the command to specific users or only checking."""
+        parser.add_argument(
+            "--username",
+            action="append",
+            help="Only rebuild the given user. Can be passed multiple times.",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report the buckets that are out of sync.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Rebuild the rollups or report how far they have drifted."""
+        user_ids = None
+        if options["username"]:
+            user_ids = list(
+                BlossomUser.objects.filter(
+                    username__in=options["username"]
+                ).values_list("id", flat=True)
+            )
+
+        if options["check"]:
+            drift = find_rollup_drift(user_ids)
+            for (user_id, source, start), expected, actual in drift:
+                logger.warning(
+                    f"Bucket {start} of user {user_id} on {source} "
+                    f"counts {actual} instead of {expected}."
+                )
+            logger.info(f"Found {len(drift)} drifted bucket(s).")
+            return
+
+        created = rebuild_completion_rollups(user_ids)
+        logger.info(self.style.SUCCESS(f"Rebuilt {created} completion bucket(s)."))
@@ -0,0 +1,39 @@
+"""
+Repair the denormalized gamma counters of the volunteers.
+
+The gamma of every user is stored in `BlossomUser.gamma_count` and is updated
+whenever a submission is completed, moved or deleted. If the counters ever
+drift from the submission table (for example after manual database surgery),
+this command recalculates all of them in bulk.
+
+Usage: python manage.py reconcile_gamma
+"""
+import logging
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from authentication.models import BlossomUser, reconcile_gamma
+
+logger = logging.getLogger("blossom.management.reconcile_gamma")
+
+
+class Command(BaseCommand):
+    help = "Recalculates the gamma counters of the volunteers."  # noqa: VNE003
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Allow limiting the command to specific users."""
+        parser.add_argument(
+            "--username",
+            action="append",
+            help="Only reconcile the given user. Can be passed multiple times.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Recalculate the gamma counters and report how many were wrong."""
+        queryset = BlossomUser.objects.all()
+        if options["username"]:
+            queryset = queryset.filter(username__in=options["username"])
+
+        fixed = reconcile_gamma(queryset)
+        logger.info(self.style.SUCCESS(f"Reconciled gamma of {fixed} user(s)."))
@@ -157,6 +157,20 @@ DATABASES = {
     }
 }
 
+# Caches
+# https://docs.djangoproject.com/en/3.2/ref/settings/#caches
+
+CACHES = {
+    # Local to every worker process, for values that are never invalidated
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    # Shared by all worker processes, for values that any of them can change
+    # or invalidate. The table is created by `python manage.py createcachetable`.
+    "shared": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "blossom_cache",
+    },
+}
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -232,6 +246,36 @@ OVERRIDE_ARCHIVIST_DELAY_TIME = None  # for testing
 # number of hours to allow a completed post to stay up
 ARCHIVIST_COMPLETED_DELAY_TIME = 0.5
 
+# number of seconds to remember verified passwords and API keys for, so that
+# the bots do not run the password hasher on every call
+CREDENTIAL_CACHE_TIMEOUT = 5 * 60
+
+# number of seconds to cache the named leaderboards for; they are also
+# invalidated whenever the gamma of a volunteer changes
+LEADERBOARD_CACHE_TIMEOUT = 5 * 60
+
+# number of seconds that a process may use its known sources for before
+# checking whether another process has added or removed one
+SOURCE_REGISTRY_CHECK_INTERVAL = 60
+
+# number of transcriptions served by the random review that are remembered per
+# reviewer, and the number of seconds they are remembered for
+REVIEW_HISTORY_SIZE = 500
+REVIEW_HISTORY_TIMEOUT = 60 * 60
+
+# The threads that run the background tasks of `send_to_worker`, per process
+WORKER_POOL_SIZE = int(os.getenv("WORKER_POOL_SIZE", 4))
+# The number of tasks that can wait for a thread...
+WORKER_QUEUE_SIZE = int(os.getenv("WORKER_QUEUE_SIZE", 1000))
+# ...and what to do with new tasks when they are all taken: "block", "drop" or
+# "inline" to run them in the calling thread
+WORKER_QUEUE_POLICY = os.getenv("WORKER_QUEUE_POLICY", "block")
+# The number of seconds to let the queued tasks finish when the process exits
+WORKER_SHUTDOWN_TIMEOUT = 30
+# The threads that handle the Slack events of `fire_and_forget`, per process
+FIRE_AND_FORGET_POOL_SIZE = int(os.getenv("FIRE_AND_FORGET_POOL_SIZE", 4))
+FIRE_AND_FORGET_QUEUE_SIZE = int(os.getenv("FIRE_AND_FORGET_QUEUE_SIZE", 1000))
+
 # Global flag; if this is set to False, all slack calls will fail silently
 ENABLE_SLACK = True
 
@@ -256,6 +300,26 @@ if OCR_ENABLE_BACKUP_ENDPOINT:
     # unofficial backup endpoint. May or may not be up at any given time.
     OCR_API_URLS += ["https://apix.ocr.space/parse/image"]
 
+# The number of seconds to wait for the first byte of an OCR.space response
+OCR_TIMEOUT = 10
+# An endpoint is skipped after this many consecutive failed requests...
+OCR_CIRCUIT_BREAKER_THRESHOLD = 3
+# ...until this many seconds have passed and a single request probes it again
+OCR_CIRCUIT_BREAKER_RESET_TIME = 60
+# Send every request to two endpoints at once and use the first good answer
+OCR_HEDGED_REQUESTS = bool(os.getenv("OCR_HEDGED_REQUESTS", ""))
+
+# Reuse the OCR results of images that have been posted before
+OCR_CACHE_ENABLED = True
+# The number of seconds after which a cached OCR result is run again
+OCR_CACHE_TTL = 30 * 24 * 60 * 60
+# The number of cached OCR results to keep, the least recently used are evicted
+OCR_CACHE_MAX_ENTRIES = 100_000
+# Also recognize reposts under a different URL by downloading and hashing the image
+OCR_CACHE_HASH_IMAGES = bool(os.getenv("OCR_CACHE_HASH_IMAGES", ""))
+# The largest image in bytes that is downloaded for hashing
+OCR_CACHE_MAX_IMAGE_SIZE = 10 * 1024 * 1024
+
 OCR_NOOP_MODE = bool(os.getenv("OCR_NOOP_MODE", ""))
 OCR_DEBUG_MODE = bool(os.getenv("OCR_DEBUG_MODE", ""))
 
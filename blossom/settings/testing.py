@@ -16,7 +16,10 @@ SECRET_KEY = (
 CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.dummy.DummyCache",
-    }  # noqa: E231
+    },  # noqa: E231
+    "shared": {
+        "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+    },  # noqa: E231
 }
 
 DATABASES = {
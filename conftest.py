@@ -1,9 +1,21 @@
 from typing import Any
 
 import pytest
+from django.db import connection
 from pytest_django.fixtures import SettingsWrapper
 
+from api.models import clear_source_registry
+from api.search import install_search, install_search_indexes
 from blossom.management.commands import bootstrap_site
+from ocr.client import reset_ocr_client
+
+
+@pytest.fixture(scope="session")
+def django_db_setup(django_db_setup: Any, django_db_blocker: Any) -> None:
+    """Install the full-text search, which is created by migrations."""
+    with django_db_blocker.unblock():
+        install_search(connection)
+        install_search_indexes(connection)
 
 
 @pytest.fixture(autouse=True)
@@ -22,3 +34,15 @@ def enable_app(settings: SettingsWrapper) -> None:
 def setup_site() -> None:
     """Fixture that configures the site as if it were about to be deployed."""
     bootstrap_site.Command().handle()
+
+
+@pytest.fixture(autouse=True)
+def reset_ocr_endpoints() -> None:
+    """Forget the health of the OCR endpoints recorded by earlier tests."""
+    reset_ocr_client()
+
+
+@pytest.fixture(autouse=True)
+def reset_source_registry() -> None:
+    """Forget the sources of earlier tests, their rows have been rolled back."""
+    clear_source_registry()
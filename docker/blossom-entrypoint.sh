@@ -3,6 +3,7 @@ set -euo pipefail
 
 if [ "$1" = "runserver" ]; then
   python manage.py migrate
+  python manage.py createcachetable
   python manage.py bootstrap_site
   python manage.py collectstatic --noinput -v 0
 
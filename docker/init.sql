@@ -2,3 +2,7 @@
 -- Here's where you would write some initial SQL prior to
 -- running DB migrations. Perhaps activating a pg extension?
 --
+
+-- The trigram index of the transcription search needs this extension, which
+-- only a superuser can create on PostgreSQL 11.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
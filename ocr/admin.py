@@ -1 +1,19 @@
+from django.contrib import admin
+
+from ocr.models import OCRJob, OCRResult
+
+
+class OCRJobAdmin(admin.ModelAdmin):
+    list_display = ("submission", "status", "attempts", "available_time")
+    list_filter = ("status",)
+    raw_id_fields = ("submission",)
+
+
+class OCRResultAdmin(admin.ModelAdmin):
+    list_display = ("url", "hits", "create_time", "last_hit_time")
+    search_fields = ("url", "content_hash")
+
+
 # Register your models here.
+admin.site.register(OCRJob, OCRJobAdmin)
+admin.site.register(OCRResult, OCRResultAdmin)
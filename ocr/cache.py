@@ -0,0 +1,215 @@
+"""
+A cache of OCR results, to avoid running the OCR of reposted images again.
+
+The same images are crossposted and reposted all the time. Before running
+the OCR of an image, the cache is checked for a result of the same image,
+looked up by its normalized URL and, if `OCR_CACHE_HASH_IMAGES` is enabled,
+by a hash of the image itself. The cached text is the final text of the
+transcription, after escaping the reddit links and removing the shortlinks.
+"""
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from django.conf import settings
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from ocr.models import OCRResult
+
+logger = logging.getLogger("ocr.cache")
+
+
+class CacheStats:
+    """Counts the hits and misses of the cache in the current process."""
+
+    def __init__(self) -> None:
+        """Start counting from zero."""
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit: bool) -> None:
+        """Count a lookup of the cache."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    @property
+    def hit_rate(self) -> float:
+        """Get the share of the lookups that have been hits."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def reset(self) -> None:
+        """Start counting from zero again."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def __str__(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses ({self.hit_rate:.1%})"
+
+
+stats = CacheStats()
+
+
+def normalize_url(url: str) -> str:
+    """Normalize the URL of an image, so that reposts share the same URL.
+
+    The scheme and host are lowercased, http is upgraded to https and the
+    `www.` prefix and the fragment are removed. The path and query are kept,
+    they identify the image.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[len("www.") :]
+    scheme = "https" if parts.scheme.lower() in ("http", "https") else parts.scheme
+    return urlunsplit((scheme, host, parts.path.rstrip("/"), parts.query, ""))
+
+
+def hash_image(url: str) -> Optional[str]:
+    """Download the image and compute its SHA-256 hash.
+
+    :return: the hash, or None if the image could not be downloaded.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with requests.get(url, stream=True, timeout=settings.OCR_TIMEOUT) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                size += len(chunk)
+                if size > settings.OCR_CACHE_MAX_IMAGE_SIZE:
+                    logger.info(f"Image {url} is too large to hash.")
+                    return None
+                digest.update(chunk)
+    except requests.RequestException as e:
+        logger.warning(f"Could not download {url} for hashing: {e!r}")
+        return None
+    return digest.hexdigest()
+
+
+def _expiry(now: datetime) -> datetime:
+    """Get the time before which cached results are expired."""
+    return now - timedelta(seconds=settings.OCR_CACHE_TTL)
+
+
+def _lookup(now: datetime, escaped: bool, **lookup: str) -> Optional[OCRResult]:
+    """Find a result that has not expired yet and count the hit."""
+    result = (
+        OCRResult.objects.filter(
+            escaped=escaped, create_time__gte=_expiry(now), **lookup
+        )
+        .order_by("-create_time")
+        .first()
+    )
+    if result is not None:
+        OCRResult.objects.filter(id=result.id).update(
+            hits=F("hits") + 1, last_hit_time=now
+        )
+    return result
+
+
+def _store(
+    url: str, escaped: bool, text: Optional[str], content_hash: Optional[str]
+) -> None:
+    """Store the result for the given URL, replacing an expired one."""
+    now = timezone.now()
+    OCRResult.objects.update_or_create(
+        url=url,
+        escaped=escaped,
+        defaults={
+            "text": text,
+            "content_hash": content_hash,
+            "create_time": now,
+            "last_hit_time": now,
+            "hits": 0,
+        },
+    )
+
+
+def get_ocr_text(
+    image_url: str, escaped: bool, run_ocr: Callable[[], Optional[str]]
+) -> Optional[str]:
+    """Get the OCR text of the image, from the cache if possible.
+
+    :param image_url: The URL of the image.
+    :param escaped: Whether the reddit links in the text are escaped.
+    :param run_ocr: Runs the OCR on a miss, returning the text of the
+        transcription or None if the image cannot be OCR'd. Errors are not
+        cached, they are raised to the caller.
+    :return: The text of the transcription, or None if the image cannot be
+        OCR'd.
+    """
+    if not settings.OCR_CACHE_ENABLED:
+        return run_ocr()
+
+    now = timezone.now()
+    url = normalize_url(image_url)
+    content_hash = None
+
+    result = _lookup(now, escaped, url=url)
+    if result is None and settings.OCR_CACHE_HASH_IMAGES:
+        content_hash = hash_image(image_url)
+        if content_hash is not None:
+            result = _lookup(now, escaped, content_hash=content_hash)
+            if result is not None:
+                # Find the repost by its URL from now on
+                _store(url, escaped, result.text, content_hash)
+
+    stats.record(hit=result is not None)
+    if result is not None:
+        return result.text
+
+    text = run_ocr()
+    _store(url, escaped, text, content_hash)
+    return text
+
+
+def prune_cache() -> int:
+    """Evict the expired results and the least recently used ones over the limit.
+
+    :return: The number of evicted results.
+    """
+    evicted, _ = OCRResult.objects.filter(
+        create_time__lt=_expiry(timezone.now())
+    ).delete()
+
+    excess = OCRResult.objects.count() - settings.OCR_CACHE_MAX_ENTRIES
+    if excess > 0:
+        ids = OCRResult.objects.order_by("last_hit_time", "id").values_list(
+            "id", flat=True
+        )[:excess]
+        deleted, _ = OCRResult.objects.filter(id__in=list(ids)).delete()
+        evicted += deleted
+
+    return evicted
+
+
+def get_cache_stats() -> Dict:
+    """Get the statistics of the results that are in the cache.
+
+    The hit rate is the share of the lookups answered from the cache, assuming
+    that every result has been created by a miss.
+    """
+    aggregates = OCRResult.objects.aggregate(
+        entries=Count("id"),
+        without_text=Count("id", filter=Q(text=None)),
+        hits=Sum("hits"),
+    )
+    entries = aggregates["entries"]
+    hits = aggregates["hits"] or 0
+    return {
+        "entries": entries,
+        "without_text": aggregates["without_text"],
+        "hits": hits,
+        "hit_rate": hits / (hits + entries) if entries else 0.0,
+    }
@@ -0,0 +1,238 @@
+"""
+A client for the OCR.space API that remembers which endpoints are healthy.
+
+All requests go through one keep-alive session, so the connections to the
+endpoints are reused. Every endpoint has a circuit breaker: after a number of
+consecutive failures the endpoint is skipped, until a single probe request is
+let through after a while to check whether it has recovered. That way, an
+endpoint that has been down for hours does not cost the full timeout for
+every submission.
+
+In hedged mode, the request is sent to two endpoints at the same time and the
+first good answer is used, trading API calls for latency.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from requests.models import Response as RequestsResponse
+
+logger = logging.getLogger("ocr.client")
+
+# The number of requests to race in hedged mode
+HEDGED_REQUEST_COUNT = 2
+
+
+class CircuitBreaker:
+    """Tracks the health of a single endpoint.
+
+    The breaker is closed while the endpoint works. After `failure_threshold`
+    consecutive failures it opens and no requests are let through. Once
+    `reset_timeout` seconds have passed, it is half-open: a single probe
+    request is let through, which closes the breaker again if it succeeds.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a closed breaker."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Determine whether a request may be sent to the endpoint.
+
+        Must be followed by `record_success` or `record_failure` if it returns
+        True, as it might have handed out the only probe.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if (
+                self.state == self.OPEN
+                and self.clock() - self.opened_at >= self.reset_timeout
+            ):
+                # Let a single probe through
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the breaker if necessary."""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+
+class EndpointError(Exception):
+    """A request to a single endpoint has failed."""
+
+    def __init__(self, url: str, response: Optional[RequestsResponse]) -> None:
+        """Remember the response of the endpoint, if there is one."""
+        super().__init__(f"Request to {url} failed.")
+        self.response = response
+
+
+class OCRClient:
+    """Sends requests to the first healthy endpoint of the OCR.space API."""
+
+    def __init__(
+        self,
+        urls: List[str],
+        timeout: float = 10,
+        hedged: bool = False,
+        failure_threshold: int = 3,
+        reset_timeout: float = 60,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a client with a pooled session for the given endpoints."""
+        self.urls = list(urls)
+        self.timeout = timeout
+        self.hedged = hedged
+        self.breakers = {
+            url: CircuitBreaker(failure_threshold, reset_timeout, clock)
+            for url in self.urls
+        }
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=max(len(self.urls), 10))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = (
+            ThreadPoolExecutor(max_workers=len(self.urls), thread_name_prefix="ocr")
+            if hedged
+            else None
+        )
+
+    def _post_to(self, url: str, payload: Dict) -> RequestsResponse:
+        """Send the request to a single endpoint and record the outcome.
+
+        :raises EndpointError: if the endpoint did not give a good answer.
+        """
+        response = None
+        try:
+            # The timeout for this request goes until the first bit response,
+            # not for the entire request process.
+            response = self.session.post(url, data=payload, timeout=self.timeout)
+            # crash and burn if the API is down, or similar
+            response.raise_for_status()
+            if not response.ok:
+                raise requests.HTTPError(response=response)
+            if response.json()["OCRExitCode"] == 6:
+                # process timed out waiting for response
+                raise ConnectionError
+        except Exception as e:
+            self.breakers[url].record_failure()
+            logger.warning(f"OCR request to {url} failed: {e!r}")
+            raise EndpointError(url, response) from e
+
+        self.breakers[url].record_success()
+        return response
+
+    def _next_endpoints(self, count: int, tried: List[str]) -> List[str]:
+        """Pick the next endpoints whose breakers let a request through."""
+        endpoints = []
+        for url in self.urls:
+            if len(endpoints) == count:
+                break
+            if url not in tried and self.breakers[url].allow_request():
+                endpoints.append(url)
+        tried.extend(endpoints)
+        return endpoints
+
+    def _race(self, endpoints: List[str], payload: Dict) -> RequestsResponse:
+        """Send the request to all given endpoints and use the first good answer.
+
+        :raises EndpointError: the last failure, if no endpoint answered well.
+        """
+        if len(endpoints) == 1:
+            return self._post_to(endpoints[0], payload)
+
+        error = None
+        pending = {
+            self._executor.submit(self._post_to, url, payload) for url in endpoints
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    # The slower requests finish in the background
+                    return future.result()
+                except EndpointError as e:
+                    error = e
+        raise error
+
+    def post(self, payload: Dict) -> RequestsResponse:
+        """Send the request to the OCR.space API.
+
+        The endpoints are tried in order, skipping the ones that are known to
+        be down. In hedged mode, the first two are raced against each other.
+
+        :raises ConnectionError: if no endpoint gave a usable answer.
+        """
+        tried: List[str] = []
+        last_response = None
+        count = HEDGED_REQUEST_COUNT if self.hedged else 1
+
+        while endpoints := self._next_endpoints(count, tried):
+            count = 1
+            try:
+                return self._race(endpoints, payload)
+            except EndpointError as e:
+                if e.response is not None:
+                    last_response = e.response
+
+        if last_response is not None and last_response.ok:
+            # Let the caller make sense of the malformed answer
+            return last_response
+        raise ConnectionError("Attempted all three OCR.space APIs -- cannot connect!")
+
+
+_client: Optional[OCRClient] = None
+_client_lock = threading.Lock()
+
+
+def get_ocr_client() -> OCRClient:
+    """Get the shared OCR client, configured from the settings."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OCRClient(
+                settings.OCR_API_URLS,
+                timeout=settings.OCR_TIMEOUT,
+                hedged=settings.OCR_HEDGED_REQUESTS,
+                failure_threshold=settings.OCR_CIRCUIT_BREAKER_THRESHOLD,
+                reset_timeout=settings.OCR_CIRCUIT_BREAKER_RESET_TIME,
+            )
+        return _client
+
+
+def reset_ocr_client() -> None:
+    """Discard the shared OCR client, e.g. after changing the settings."""
+    global _client
+    with _client_lock:
+        _client = None
@@ -1,13 +1,11 @@
-import logging
 import re
 from typing import Dict, Union
 from urllib.parse import urlparse
 
-import requests
 from django.conf import settings
-from requests.exceptions import ConnectTimeout, RequestException
 from requests.models import Response as RequestsResponse
 
+from ocr.client import get_ocr_client
 from ocr.errors import OCRError
 
 URL_RE = (
@@ -70,50 +68,12 @@ def process_image(image_url: str) -> Union[None, Dict]:
 
 
 def _get_results_from_ocrspace(payload: Dict) -> RequestsResponse:
-    """Major API logic from decode_image_from_url."""
-    result = None
-    for API in settings.OCR_API_URLS:  # noqa: N806
-        try:
-            # The timeout for this request goes until the first bit response,
-            # not for the entire request process. If we don't hear anything
-            # from the remote server for 10 seconds, throw a ConnectTimeout
-            # and move on to the next one.
-            result = requests.post(API, data=payload, timeout=10)
-            # crash and burn if the API is down, or similar
-            result.raise_for_status()
-
-            if result.json()["OCRExitCode"] == 6:
-                # process timed out waiting for response
-                raise ConnectionError
-
-            # if the request succeeds, we'll have a result. Therefore, just
-            # break the loop here.
-            break
-        except (ConnectTimeout, ConnectionError):
-            # Sometimes the ocr.space API will just... not respond. Move on.
-            # Try the next API in the list, then release from the loop if we
-            # exhaust our options.
-            continue
-        except RequestException as e:
-            # we have a result object here but it's not right.
-            if result is None:
-                logging.warning(
-                    f"Received null object because of a request exception. "
-                    f"Attempted API: {API} | Error: {e}"
-                )
-            else:
-                logging.error(
-                    f"ERROR {result.status_code} with OCR:\n\nHEADERS:\n "
-                    f"{repr(result.headers)}\n\nBODY:\n{repr(result.text)} "
-                )
-            continue
-        except Exception as e:
-            logging.error(f"Unknown error! Attempted API: {API} | Error: {e}")
-
-    if result is None or not result.ok:
-        raise ConnectionError("Attempted all three OCR.space APIs -- cannot connect!")
-
-    return result
+    """Major API logic from decode_image_from_url.
+
+    The endpoints are handled by the shared client, which skips the ones that
+    are known to be down.
+    """
+    return get_ocr_client().post(payload)
 
 
 def decode_image_from_url(
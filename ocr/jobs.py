@@ -0,0 +1,170 @@
+"""
+A persistent queue for the OCR of image submissions.
+
+Running the OCR takes up to a few requests with a timeout of 10 seconds
+each, which is far too slow to do while the submission is being created.
+Instead, an `OCRJob` is created with the submission and processed by the
+`process_ocr_jobs` command, which sets the OCR transcription or the
+`cannot_ocr` flag of the submission once the job is finished.
+"""
+import logging
+from datetime import timedelta
+from typing import Any, Iterable, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ocr.cache import prune_cache
+from ocr.models import OCRJob
+
+logger = logging.getLogger("ocr.jobs")
+
+JobStatus = OCRJob.OCRJobStatus
+
+# The number of attempts after which the OCR of a submission is given up on
+MAX_ATTEMPTS = 5
+# The delay before the first retry, doubled for every following retry
+RETRY_DELAY = timedelta(minutes=1)
+# The time a worker has to finish a job before another worker can take it over
+LEASE_DURATION = timedelta(minutes=5)
+
+
+def enqueue_ocr(submission: Any) -> Optional[OCRJob]:
+    """Queue the OCR of the given submission, if it needs one.
+
+    :return: the job of the submission, or None if no OCR is needed.
+    """
+    if not settings.ENABLE_OCR or submission.cannot_ocr or not submission.is_image:
+        return None
+
+    job, _ = OCRJob.objects.get_or_create(submission=submission)
+    return job
+
+
+def enqueue_ocr_jobs(submissions: Iterable[Any]) -> int:
+    """Queue the OCR of all given submissions that need one, with one query.
+
+    Submissions that already have a job are skipped.
+
+    :return: the number of submissions that need an OCR.
+    """
+    if not settings.ENABLE_OCR:
+        return 0
+
+    jobs = [
+        OCRJob(submission=submission)
+        for submission in submissions
+        if not submission.cannot_ocr and submission.is_image
+    ]
+    OCRJob.objects.bulk_create(jobs, ignore_conflicts=True)
+    return len(jobs)
+
+
+def lease_job(worker: str) -> Optional[OCRJob]:
+    """Lease the next job that is due for the given worker.
+
+    Jobs whose lease has expired are due again, their worker has presumably
+    died while processing them.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            OCRJob.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=JobStatus.PENDING, available_time__lte=now)
+                | Q(status=JobStatus.RUNNING, lease_expire_time__lte=now)
+            )
+            .order_by("available_time", "id")
+            .first()
+        )
+        if job is None:
+            return None
+
+        job.status = JobStatus.RUNNING
+        job.worker = worker
+        job.lease_expire_time = now + LEASE_DURATION
+        job.save(update_fields=["status", "worker", "lease_expire_time"])
+
+    return job
+
+
+def _finish_job(job: OCRJob, **changes: Any) -> bool:
+    """Update the job, if it is still leased by the worker that processed it.
+
+    :return: whether the job has been updated.
+    """
+    updated = OCRJob.objects.filter(
+        id=job.id, status=JobStatus.RUNNING, worker=job.worker
+    ).update(worker=None, lease_expire_time=None, **changes)
+    if not updated:
+        logger.warning(f"Lease of {job} has been lost while processing it.")
+    return bool(updated)
+
+
+def run_job(job: OCRJob) -> None:
+    """Run the OCR of a leased job and store the outcome on its submission."""
+    submission = job.submission
+    if submission.cannot_ocr or submission.has_ocr_transcription:
+        _finish_job(job, status=JobStatus.DONE, complete_time=timezone.now())
+        return
+
+    try:
+        # Marks the submission with `cannot_ocr` if the image cannot be read
+        submission.generate_ocr_transcription()
+    except Exception as e:
+        # The OCR API could not be reached, try again later
+        attempts = job.attempts + 1
+        if attempts >= MAX_ATTEMPTS:
+            logger.error(f"Giving up on {job} after {attempts} attempts: {e!r}")
+            if _finish_job(
+                job,
+                status=JobStatus.FAILED,
+                attempts=attempts,
+                last_error=repr(e),
+                complete_time=timezone.now(),
+            ):
+                submission.cannot_ocr = True
+                submission.save(update_fields=["cannot_ocr"], skip_extras=True)
+        else:
+            delay = RETRY_DELAY * 2 ** (attempts - 1)
+            logger.warning(f"OCR of {job} failed, retrying in {delay}: {e!r}")
+            _finish_job(
+                job,
+                status=JobStatus.PENDING,
+                attempts=attempts,
+                last_error=repr(e),
+                available_time=timezone.now() + delay,
+            )
+        return
+
+    if submission.cannot_ocr:
+        submission.save(update_fields=["cannot_ocr"], skip_extras=True)
+    _finish_job(job, status=JobStatus.DONE, complete_time=timezone.now())
+
+
+def process_jobs(worker: str, limit: Optional[int] = None) -> int:
+    """Process the OCR jobs that are due until there are none left.
+
+    :param worker: The name of the worker, to identify its leases.
+    :param limit: The maximum number of jobs to process.
+    :return: The number of processed jobs, including failed attempts.
+    """
+    if not settings.ENABLE_OCR:
+        logger.warning("OCR is disabled; the jobs are not processed.")
+        return 0
+
+    processed = 0
+    while limit is None or processed < limit:
+        job = lease_job(worker)
+        if job is None:
+            break
+        run_job(job)
+        processed += 1
+
+    if processed:
+        # Keep the cache of the OCR results within its bounds
+        prune_cache()
+
+    return processed
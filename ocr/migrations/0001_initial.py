@@ -0,0 +1,84 @@
+# Generated by Django 3.2.25 on 2026-10-18 04:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("api", "0027_outboxevent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OCRJob",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "create_time",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "available_time",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "complete_time",
+                    models.DateTimeField(blank=True, default=None, null=True),
+                ),
+                (
+                    "worker",
+                    models.CharField(
+                        blank=True, default=None, max_length=100, null=True
+                    ),
+                ),
+                (
+                    "lease_expire_time",
+                    models.DateTimeField(blank=True, default=None, null=True),
+                ),
+                ("attempts", models.IntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default=None, null=True)),
+                (
+                    "submission",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ocr_job",
+                        to="api.submission",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="ocrjob",
+            index=models.Index(
+                condition=models.Q(("status__in", ["pending", "running"])),
+                fields=["available_time"],
+                name="ocr_job_due_idx",
+            ),
+        ),
+    ]
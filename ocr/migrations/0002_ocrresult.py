@@ -0,0 +1,64 @@
+# Generated by Django 3.2.25 on 2026-10-18 05:09
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ocr", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OCRResult",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("url", models.CharField(max_length=2000)),
+                (
+                    "content_hash",
+                    models.CharField(
+                        blank=True, default=None, max_length=64, null=True
+                    ),
+                ),
+                ("escaped", models.BooleanField(default=False)),
+                ("text", models.TextField(blank=True, default=None, null=True)),
+                (
+                    "create_time",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "last_hit_time",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("hits", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="ocrresult",
+            index=models.Index(fields=["content_hash"], name="ocr_result_hash_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="ocrresult",
+            index=models.Index(fields=["create_time"], name="ocr_result_create_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="ocrresult",
+            index=models.Index(fields=["last_hit_time"], name="ocr_result_hit_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="ocrresult",
+            constraint=models.UniqueConstraint(
+                fields=("url", "escaped"), name="unique_ocr_result_url"
+            ),
+        ),
+    ]
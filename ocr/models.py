@@ -0,0 +1,100 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OCRJob(models.Model):
+    """A request to transcribe the image of a submission with OCR.
+
+    The jobs are created when an image submission is created and processed by
+    the `process_ocr_jobs` command. A worker leases a job for a limited time,
+    so that the job is picked up again if the worker dies while processing it.
+    Jobs that fail because the OCR API cannot be reached are retried with an
+    exponential backoff.
+    """
+
+    class OCRJobStatus(models.TextChoices):
+        # The job is waiting to be (re)tried.
+        PENDING = "pending"
+        # The job has been leased by a worker.
+        RUNNING = "running"
+        # The job has been processed, the outcome is stored on the submission.
+        DONE = "done"
+        # The job has run out of attempts.
+        FAILED = "failed"
+
+    class Meta:
+        indexes = [
+            # Used by the workers to find the jobs that are due
+            models.Index(
+                fields=["available_time"],
+                condition=models.Q(status__in=["pending", "running"]),
+                name="ocr_job_due_idx",
+            )
+        ]
+
+    submission = models.OneToOneField(
+        "api.Submission", on_delete=models.CASCADE, related_name="ocr_job"
+    )
+    status = models.CharField(
+        max_length=20, choices=OCRJobStatus.choices, default=OCRJobStatus.PENDING
+    )
+
+    # The time the job has been created.
+    create_time = models.DateTimeField(default=timezone.now)
+    # The time from which on the job can be (re)tried.
+    available_time = models.DateTimeField(default=timezone.now)
+    # The time the job has been finished, successfully or not.
+    complete_time = models.DateTimeField(default=None, null=True, blank=True)
+
+    # The worker that has leased the job and until when.
+    worker = models.CharField(max_length=100, default=None, null=True, blank=True)
+    lease_expire_time = models.DateTimeField(default=None, null=True, blank=True)
+
+    # The number of times processing the job has failed.
+    attempts = models.IntegerField(default=0)
+    # The error of the last failed attempt.
+    last_error = models.TextField(default=None, null=True, blank=True)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"OCR of submission {self.submission_id} ({self.status})"
+
+
+class OCRResult(models.Model):
+    """The outcome of the OCR of an image, to reuse it for reposts of the image.
+
+    The results are looked up by the normalized URL of the image and, if
+    enabled, by a hash of the image itself. They expire after
+    `OCR_CACHE_TTL` seconds and the least recently used ones are evicted
+    once there are more than `OCR_CACHE_MAX_ENTRIES`.
+    """
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["url", "escaped"], name="unique_ocr_result_url"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["content_hash"], name="ocr_result_hash_idx"),
+            models.Index(fields=["create_time"], name="ocr_result_create_idx"),
+            models.Index(fields=["last_hit_time"], name="ocr_result_hit_idx"),
+        ]
+
+    # The normalized URL of the image.
+    url = models.CharField(max_length=2000)
+    # The SHA-256 hash of the image, if images are hashed.
+    content_hash = models.CharField(max_length=64, default=None, null=True, blank=True)
+    # Whether the reddit links in the text have been escaped.
+    escaped = models.BooleanField(default=False)
+    # The text of the transcription, or None if the image cannot be OCR'd.
+    text = models.TextField(default=None, null=True, blank=True)
+
+    # The time the OCR has been run.
+    create_time = models.DateTimeField(default=timezone.now)
+    # The time the result has last been used, for the eviction.
+    last_hit_time = models.DateTimeField(default=timezone.now)
+    # The number of times the result has been reused.
+    hits = models.IntegerField(default=0)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"OCR result of {self.url}"
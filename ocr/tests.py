@@ -90,7 +90,7 @@ class TestDecodeImage:
                 """Stub for requests."""
                 return None
 
-        with patch("requests.post", return_value=ValidTestResponse()):
+        with patch("requests.Session.post", return_value=ValidTestResponse()):
             result = decode_image_from_url("AAA")
         assert result == DEFAULT_OCRSPACE_RESPONSE
 
@@ -110,7 +110,7 @@ class TestDecodeImage:
                 resp.update(OCRSPACE_ERROR_FIELDS)
                 return resp
 
-        with patch("requests.post", return_value=FailTestResponse()):
+        with patch("requests.Session.post", return_value=FailTestResponse()):
             with raises(ConnectionError) as e:
                 decode_image_from_url("AAA")
 
@@ -141,7 +141,7 @@ class TestDecodeImage:
                 resp["OCRExitCode"] = 6
                 return resp
 
-        with patch("requests.post", return_value=OCRTimeoutResponse()):
+        with patch("requests.Session.post", return_value=OCRTimeoutResponse()):
             with raises(ConnectionError):
                 decode_image_from_url("AAA")
 
@@ -162,7 +162,7 @@ class TestDecodeImage:
                 """Stub for requests."""
                 raise Exception
 
-        with patch("requests.post", return_value=OCRUnknownResponse()):
+        with patch("requests.Session.post", return_value=OCRUnknownResponse()):
             result = decode_image_from_url("AAA")
 
         assert len(result) == 3
@@ -185,7 +185,7 @@ class TestDecodeImage:
                 """Stub for requests."""
                 raise Exception
 
-        with patch("requests.post", return_value=OCRUnknownResponse()):
+        with patch("requests.Session.post", return_value=OCRUnknownResponse()):
             result = decode_image_from_url("AAA")
 
         assert len(result) == 3
@@ -195,6 +195,6 @@ class TestDecodeImage:
         """  # noqa: D200,D205,D210,D400
         Verify that if no result is obtained from the API, a ConnectionError is raised.
         """
-        with patch("requests.post", side_effect=RequestException()):
+        with patch("requests.Session.post", side_effect=RequestException()):
             with raises(ConnectionError):
                 decode_image_from_url("AAA")
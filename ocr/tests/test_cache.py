@@ -0,0 +1,136 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+from pytest import raises
+from pytest_django.fixtures import SettingsWrapper
+
+from api.models import Transcription
+from ocr.cache import get_cache_stats, normalize_url, prune_cache, stats
+from ocr.models import OCRResult
+from utils.test_helpers import create_submission
+
+OCR_RESULT = {"text": "AAA"}
+
+
+@pytest.fixture(autouse=True)
+def enable_ocr(settings: SettingsWrapper) -> None:
+    """Enable the OCR, without queueing jobs for the test submissions."""
+    settings.ENABLE_OCR = True
+    settings.IMAGE_DOMAINS = []
+    stats.reset()
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("https://i.redd.it/a.jpg", "https://i.redd.it/a.jpg"),
+        ("http://I.REDD.IT/a.jpg#top", "https://i.redd.it/a.jpg"),
+        ("https://www.imgur.com/a.png/", "https://imgur.com/a.png"),
+        ("https://preview.redd.it/a.png?s=1", "https://preview.redd.it/a.png?s=1"),
+    ],
+)
+def test_normalize_url(url: str, expected: str) -> None:
+    """Verify that the URLs of the images are normalized."""
+    assert normalize_url(url) == expected
+
+
+def test_repost_uses_cache() -> None:
+    """Verify that the OCR of a reposted image is not run again."""
+    first = create_submission(content_url="https://i.redd.it/a.jpg")
+    repost = create_submission(content_url="http://i.redd.it/a.jpg", original_id="b")
+
+    with patch("api.models.process_image", return_value=OCR_RESULT) as mock:
+        first.generate_ocr_transcription()
+        repost.generate_ocr_transcription()
+
+    assert mock.call_count == 1
+    assert Transcription.objects.get(submission=repost).text == "AAA"
+    assert (stats.hits, stats.misses) == (1, 1)
+    assert stats.hit_rate == 0.5
+    assert get_cache_stats() == {
+        "entries": 1,
+        "without_text": 0,
+        "hits": 1,
+        "hit_rate": 0.5,
+    }
+
+
+def test_cannot_ocr_cached() -> None:
+    """Verify that images without text are remembered as well."""
+    first = create_submission(content_url="https://i.redd.it/a.jpg")
+    repost = create_submission(content_url="https://i.redd.it/a.jpg", original_id="b")
+
+    with patch("api.models.process_image", return_value=None) as mock:
+        first.generate_ocr_transcription()
+        repost.generate_ocr_transcription()
+
+    assert mock.call_count == 1
+    assert repost.cannot_ocr
+    assert not Transcription.objects.filter(submission=repost).exists()
+
+
+def test_errors_not_cached() -> None:
+    """Verify that the result is not cached if the OCR API cannot be reached."""
+    submission = create_submission(content_url="https://i.redd.it/a.jpg")
+
+    with patch("api.models.process_image", side_effect=ConnectionError):
+        with raises(ConnectionError):
+            submission.generate_ocr_transcription()
+
+    assert not OCRResult.objects.exists()
+
+
+def test_expired_result_replaced(settings: SettingsWrapper) -> None:
+    """Verify that the OCR is run again once the cached result has expired."""
+    OCRResult.objects.create(
+        url="https://i.redd.it/a.jpg",
+        text="old",
+        create_time=timezone.now() - timedelta(seconds=settings.OCR_CACHE_TTL + 1),
+    )
+    submission = create_submission(content_url="https://i.redd.it/a.jpg")
+
+    with patch("api.models.process_image", return_value=OCR_RESULT) as mock:
+        submission.generate_ocr_transcription()
+
+    assert mock.call_count == 1
+    assert OCRResult.objects.get().text == "AAA"
+
+
+def test_repost_found_by_hash(settings: SettingsWrapper) -> None:
+    """Verify that reposts under a different URL are found by the image hash."""
+    settings.OCR_CACHE_HASH_IMAGES = True
+    first = create_submission(content_url="https://i.redd.it/a.jpg")
+    repost = create_submission(content_url="https://i.imgur.com/b.jpg", original_id="b")
+
+    with patch("api.models.process_image", return_value=OCR_RESULT) as mock, patch(
+        "ocr.cache.hash_image", return_value="abc"
+    ):
+        first.generate_ocr_transcription()
+        repost.generate_ocr_transcription()
+
+    assert mock.call_count == 1
+    assert Transcription.objects.get(submission=repost).text == "AAA"
+    # The repost is now found by its URL as well
+    assert OCRResult.objects.filter(content_hash="abc").count() == 2
+
+
+def test_prune_cache(settings: SettingsWrapper) -> None:
+    """Verify that the expired and least recently used results are evicted."""
+    settings.OCR_CACHE_MAX_ENTRIES = 2
+    now = timezone.now()
+    OCRResult.objects.create(
+        url="expired",
+        create_time=now - timedelta(seconds=settings.OCR_CACHE_TTL + 1),
+    )
+    for index in range(3):
+        OCRResult.objects.create(
+            url=f"used_{index}", last_hit_time=now - timedelta(hours=index)
+        )
+
+    assert prune_cache() == 2
+    assert set(OCRResult.objects.values_list("url", flat=True)) == {
+        "used_0",
+        "used_1",
+    }
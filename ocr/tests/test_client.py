@@ -0,0 +1,170 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator
+
+import pytest
+from pytest import raises
+
+from ocr.client import CircuitBreaker, OCRClient
+
+# The time the slow endpoint of the fake server takes to answer
+SLOW_DELAY = 1
+
+
+class FakeOCRSpaceHandler(BaseHTTPRequestHandler):
+    """Answers like OCR.space, depending on the path of the request."""
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Answer the request and count it per path."""
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+
+        status, exit_code = 200, 1
+        if self.path == "/error":
+            status = 500
+        elif self.path == "/timeout":
+            exit_code = 6
+        elif self.path == "/slow":
+            time.sleep(SLOW_DELAY)
+
+        body = json.dumps({"OCRExitCode": exit_code, "path": self.path}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: str) -> None:
+        """Keep the test output clean."""
+        pass
+
+
+class FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Get the current time."""
+        return self.now
+
+
+@pytest.fixture
+def server() -> Iterator[ThreadingHTTPServer]:
+    """Run a fake OCR.space server for the duration of the test."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOCRSpaceHandler)
+    server.daemon_threads = True
+    server.hits: Dict[str, int] = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server: ThreadingHTTPServer, path: str) -> str:
+    """Get the URL of the given path on the fake server."""
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_breaker_opens_and_probes() -> None:
+    """Verify that the breaker lets a single probe through after the reset time."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert not breaker.allow_request()
+
+    clock.now = 60
+    assert breaker.allow_request()
+    # Only one probe is in flight at a time
+    assert not breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 120
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_client_falls_through(server: ThreadingHTTPServer) -> None:
+    """Verify that the next endpoint is used when one fails."""
+    client = OCRClient(
+        [_url(server, "/error"), _url(server, "/timeout"), _url(server, "/ok")]
+    )
+
+    response = client.post({"url": "AAA"})
+
+    assert response.json()["path"] == "/ok"
+    assert server.hits == {"/error": 1, "/timeout": 1, "/ok": 1}
+
+
+def test_client_skips_broken_endpoint(server: ThreadingHTTPServer) -> None:
+    """Verify that an endpoint is skipped while its breaker is open."""
+    clock = FakeClock()
+    client = OCRClient(
+        [_url(server, "/error"), _url(server, "/ok")],
+        failure_threshold=2,
+        reset_timeout=60,
+        clock=clock,
+    )
+
+    for _ in range(5):
+        assert client.post({"url": "AAA"}).json()["path"] == "/ok"
+    assert server.hits["/error"] == 2
+
+    # The endpoint is probed again after the reset time
+    clock.now = 60
+    client.post({"url": "AAA"})
+    assert server.hits["/error"] == 3
+
+
+def test_client_all_endpoints_down(server: ThreadingHTTPServer) -> None:
+    """Verify that no requests are sent at all once every endpoint is down."""
+    client = OCRClient([_url(server, "/error")], failure_threshold=1)
+
+    with raises(ConnectionError):
+        client.post({"url": "AAA"})
+    with raises(ConnectionError):
+        client.post({"url": "AAA"})
+
+    assert server.hits["/error"] == 1
+
+
+def test_client_hedged(server: ThreadingHTTPServer) -> None:
+    """Verify that hedged requests use the first good answer."""
+    client = OCRClient([_url(server, "/slow"), _url(server, "/ok")], hedged=True)
+
+    start = time.monotonic()
+    response = client.post({"url": "AAA"})
+
+    assert response.json()["path"] == "/ok"
+    assert time.monotonic() - start < SLOW_DELAY
+    assert server.hits["/ok"] == 1
+
+
+def test_client_hedged_falls_through(server: ThreadingHTTPServer) -> None:
+    """Verify that the remaining endpoints are tried if both hedged requests fail."""
+    client = OCRClient(
+        [_url(server, "/error"), _url(server, "/timeout"), _url(server, "/ok")],
+        hedged=True,
+    )
+
+    assert client.post({"url": "AAA"}).json()["path"] == "/ok"
+    assert server.hits == {"/error": 1, "/timeout": 1, "/ok": 1}
+
+
+def test_client_timeout(server: ThreadingHTTPServer) -> None:
+    """Verify that endpoints that do not answer in time are counted as failures."""
+    client = OCRClient([_url(server, "/slow"), _url(server, "/ok")], timeout=0.2)
+
+    assert client.post({"url": "AAA"}).json()["path"] == "/ok"
+    assert client.breakers[_url(server, "/slow")].failures == 1
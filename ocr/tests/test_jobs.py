@@ -0,0 +1,129 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+from pytest_django.fixtures import SettingsWrapper
+
+from api.models import Transcription
+from ocr.jobs import (
+    MAX_ATTEMPTS,
+    RETRY_DELAY,
+    enqueue_ocr_jobs,
+    lease_job,
+    process_jobs,
+)
+from ocr.models import OCRJob
+from utils.test_helpers import create_submission
+
+JobStatus = OCRJob.OCRJobStatus
+
+
+@pytest.fixture
+def enable_ocr(settings: SettingsWrapper) -> None:
+    """Enable the OCR for images from example.com."""
+    settings.ENABLE_OCR = True
+    settings.IMAGE_DOMAINS = ["example.com"]
+
+
+@pytest.mark.usefixtures("enable_ocr")
+class TestOCRJobs:
+    """Tests validating the processing of the OCR jobs."""
+
+    def test_job_created_for_images(self) -> None:
+        """Verify that only new image submissions get an OCR job."""
+        image = create_submission(content_url="http://example.com/a.jpg")
+        create_submission(content_url="http://other.com/a.html", original_id="a")
+        create_submission(
+            content_url="http://example.com/b.jpg", cannot_ocr=True, original_id="b"
+        )
+
+        job = OCRJob.objects.get()
+        assert job.submission == image
+        assert job.status == JobStatus.PENDING
+
+        # Saving the submission again does not queue another job
+        image.save()
+        assert OCRJob.objects.count() == 1
+
+    def test_jobs_enqueued_at_once(self) -> None:
+        """Verify that the jobs of many submissions can be queued at once."""
+        image = create_submission(content_url="http://example.com/a.jpg")
+        other = create_submission(
+            content_url="http://example.com/b.jpg", original_id="b"
+        )
+        OCRJob.objects.filter(submission=other).delete()
+        page = create_submission(content_url="http://other.com/a.html", original_id="c")
+
+        assert enqueue_ocr_jobs([image, other, page]) == 2
+
+        assert OCRJob.objects.filter(submission=image).count() == 1
+        assert OCRJob.objects.filter(submission=other).count() == 1
+        assert not OCRJob.objects.filter(submission=page).exists()
+
+    def test_job_creates_transcription(self) -> None:
+        """Verify that a successful job creates the OCR transcription."""
+        submission = create_submission(content_url="http://example.com/a.jpg")
+
+        with patch("api.models.process_image", return_value={"text": "AAA"}):
+            assert process_jobs("test") == 1
+
+        job = OCRJob.objects.get()
+        assert job.status == JobStatus.DONE
+        assert job.complete_time is not None
+        assert job.worker is None
+        assert Transcription.objects.get(submission=submission).text == "AAA"
+
+    def test_job_retried_with_backoff(self) -> None:
+        """Verify that jobs are retried later if the OCR API is unreachable."""
+        submission = create_submission(content_url="http://example.com/a.jpg")
+
+        with patch("api.models.process_image", side_effect=ConnectionError):
+            assert process_jobs("test") == 1
+            # The job is not due yet
+            assert process_jobs("test") == 0
+
+        job = OCRJob.objects.get()
+        assert job.status == JobStatus.PENDING
+        assert job.attempts == 1
+        assert job.available_time > timezone.now() + RETRY_DELAY / 2
+        submission.refresh_from_db()
+        assert not submission.cannot_ocr
+
+    def test_job_fails_after_max_attempts(self) -> None:
+        """Verify that submissions are marked with cannot_ocr when giving up."""
+        submission = create_submission(content_url="http://example.com/a.jpg")
+        OCRJob.objects.update(attempts=MAX_ATTEMPTS - 1)
+
+        with patch("api.models.process_image", side_effect=ConnectionError):
+            process_jobs("test")
+
+        job = OCRJob.objects.get()
+        assert job.status == JobStatus.FAILED
+        assert "ConnectionError" in job.last_error
+        submission.refresh_from_db()
+        assert submission.cannot_ocr
+
+    def test_expired_lease_taken_over(self) -> None:
+        """Verify that jobs of dead workers are picked up again."""
+        create_submission(content_url="http://example.com/a.jpg")
+        job = lease_job("dead")
+        assert lease_job("alive") is None
+
+        OCRJob.objects.update(lease_expire_time=timezone.now() - timedelta(seconds=1))
+        taken_over = lease_job("alive")
+
+        assert taken_over.id == job.id
+        assert taken_over.worker == "alive"
+        assert taken_over.lease_expire_time > timezone.now()
+
+    def test_ocr_disabled(self, settings: SettingsWrapper) -> None:
+        """Verify that no jobs are processed while the OCR is disabled."""
+        create_submission(content_url="http://example.com/a.jpg")
+        settings.ENABLE_OCR = False
+
+        with patch("api.models.process_image") as mock:
+            assert process_jobs("test") == 0
+
+        mock.assert_not_called()
+        assert OCRJob.objects.get().status == JobStatus.PENDING
@@ -0,0 +1,167 @@
+import gc
+import os
+import threading
+import weakref
+from typing import List, Tuple
+from unittest.mock import patch
+
+import pytest
+
+from utils.workers import DROP, INLINE, WorkerPool, send_to_worker
+
+# The number of seconds to wait for the threads of a test before giving up
+TIMEOUT = 5
+
+
+def _blocked_pool(policy: str) -> Tuple[WorkerPool, threading.Event]:
+    """Create a pool whose single thread is busy and whose queue is full.
+
+    :return: the pool and the event that lets its thread continue.
+    """
+    release = threading.Event()
+    pool = WorkerPool(size=1, max_queue_size=1, policy=policy)
+    started = threading.Event()
+
+    def _block() -> None:
+        started.set()
+        release.wait(TIMEOUT)
+
+    pool.submit(_block)
+    started.wait(TIMEOUT)
+    pool.submit(lambda: None)
+    return pool, release
+
+
+def test_threads_started_lazily() -> None:
+    """Verify that no threads are started before the first task is submitted."""
+    pool = WorkerPool(size=2, max_queue_size=10)
+    assert pool.stats()["threads"] == 0
+
+    pool.submit(lambda: None)
+    assert pool.stats()["threads"] == 2
+    assert pool.shutdown(TIMEOUT)
+
+
+def test_tasks_run_concurrently() -> None:
+    """Verify that a slow task does not block the other tasks."""
+    pool = WorkerPool(size=2, max_queue_size=10)
+    # Only passes if both tasks run at the same time
+    barrier = threading.Barrier(3, timeout=TIMEOUT)
+
+    pool.submit(barrier.wait)
+    pool.submit(barrier.wait)
+    barrier.wait()
+
+    assert pool.shutdown(TIMEOUT)
+    assert pool.stats()["completed"] == 2
+
+
+def test_full_queue_drops_tasks() -> None:
+    """Verify that tasks are dropped when the queue is full with the drop policy."""
+    pool, release = _blocked_pool(DROP)
+    ran = threading.Event()
+
+    pool.submit(ran.set)
+    release.set()
+
+    assert pool.shutdown(TIMEOUT)
+    assert not ran.is_set()
+    stats = pool.stats()
+    assert stats["dropped"] == 1
+    assert stats["completed"] == 2
+
+
+def test_full_queue_runs_inline() -> None:
+    """Verify that tasks run in the calling thread when the queue is full."""
+    pool, release = _blocked_pool(INLINE)
+    threads: List[threading.Thread] = []
+
+    pool.submit(lambda: threads.append(threading.current_thread()))
+    release.set()
+
+    assert threads == [threading.current_thread()]
+    assert pool.shutdown(TIMEOUT)
+    assert pool.stats()["inlined"] == 1
+
+
+def test_failures_counted() -> None:
+    """Verify that failing tasks are counted and do not stop the threads."""
+    pool = WorkerPool(size=1, max_queue_size=10)
+
+    pool.submit(lambda: 1 / 0)
+    pool.submit(lambda: None)
+
+    assert pool.shutdown(TIMEOUT)
+    stats = pool.stats()
+    assert stats["failed"] == 1
+    assert stats["completed"] == 2
+    assert stats["queue_depth"] == 0
+
+
+def test_failed_report_survived() -> None:
+    """Verify that the threads keep running if reporting a failure fails."""
+    pool = WorkerPool(size=1, max_queue_size=10)
+
+    with patch("utils.workers._report_exception", side_effect=ConnectionError):
+        pool.submit(lambda: 1 / 0)
+        pool.submit(lambda: None)
+        assert pool.shutdown(TIMEOUT)
+
+    stats = pool.stats()
+    assert stats["failed"] == 1
+    assert stats["completed"] == 2
+
+
+def test_shutdown_drains_queue() -> None:
+    """Verify that the queued tasks are run before the threads stop."""
+    pool = WorkerPool(size=1, max_queue_size=10)
+    results: List[int] = []
+
+    for index in range(5):
+        pool.submit(results.append, index)
+    assert pool.shutdown(TIMEOUT)
+
+    assert results == [0, 1, 2, 3, 4]
+    # Tasks submitted after the shutdown are run right away
+    pool.submit(results.append, 5)
+    assert results[-1] == 5
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Requires os.fork.")
+def test_pool_usable_after_fork() -> None:
+    """Verify that a forked child gets working threads of its own."""
+    pool = WorkerPool(size=1, max_queue_size=10)
+    pool.submit(lambda: None)
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        ran = threading.Event()
+        pool.submit(ran.set)
+        os._exit(0 if ran.wait(TIMEOUT) and pool.shutdown(TIMEOUT) else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    assert pool.shutdown(TIMEOUT)
+
+
+def test_pool_garbage_collected() -> None:
+    """Verify that an unused pool is not kept alive by the fork hook."""
+    pool = WorkerPool(size=1, max_queue_size=10)
+    pool_ref = weakref.ref(pool)
+
+    del pool
+    gc.collect()
+
+    assert pool_ref() is None
+
+
+def test_send_to_worker_test_mode() -> None:
+    """Verify that the worker is bypassed in test mode."""
+    threads: List[threading.Thread] = []
+
+    @send_to_worker
+    def _task() -> None:
+        threads.append(threading.current_thread())
+
+    _task(worker_test_mode=True)
+    assert threads == [threading.current_thread()]
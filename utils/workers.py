@@ -2,41 +2,272 @@
 
 import atexit
 import logging
+import os
 import queue
 import threading
-from typing import Any, Callable
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional
 
 from django.conf import settings
+from django.db import connections
 
 log = logging.getLogger(__name__)
 
+# What to do with a task when the queue of the pool is full
+BLOCK = "block"  # wait until there is room in the queue
+DROP = "drop"  # discard the task
+INLINE = "inline"  # run the task in the calling thread
+POLICIES = [BLOCK, DROP, INLINE]
 
-def _worker() -> None:
-    """Create worker for background tasks."""
-    while True:
-        func, args, kwargs = _queue.get()
+# Tells a worker thread to exit
+_STOP = object()
+
+# All pools of the process, to drain them when it exits and to reset them in
+# a forked child
+_pools: "weakref.WeakSet[WorkerPool]" = weakref.WeakSet()
+
+
+def _report_exception() -> None:
+    """Send the exception that is being handled to Slack and the log."""
+    import traceback
+
+    # prevent circular dependency
+    from api.slack import client
+
+    details = traceback.format_exc()
+    message = f"Background worker exception: ```{details}```"
+    log.error(message)
+    if settings.ENABLE_SLACK:
+        client.chat_postMessage(
+            channel=settings.SLACK_DEFAULT_CHANNEL,
+            text=message,
+        )
+
+
+class WorkerPool:
+    """A pool of threads that run background tasks from a bounded queue.
+
+    The threads are only started when the first task is submitted, so that a
+    process that forks after importing this module (e.g. gunicorn with
+    `--preload`) does not end up with a queue without threads. A forked child
+    starts with an empty pool of its own.
+    """
+
+    def __init__(
+        self,
+        name: str = "blossom",
+        size: Optional[int] = None,
+        max_queue_size: Optional[int] = None,
+        policy: Optional[str] = None,
+    ) -> None:
+        """Create the pool, falling back to the settings for its configuration.
+
+        :param name: The prefix of the names of the threads.
+        :param size: The number of threads.
+        :param max_queue_size: The number of tasks that can wait for a thread.
+        :param policy: What to do with a task when the queue is full, one of
+            `POLICIES`.
+        """
+        self.name = name
+        self._size = size
+        self._max_queue_size = max_queue_size
+        self._policy = policy
+        self._reset()
+        _pools.add(self)
+
+    def _reset(self) -> None:
+        """Forget the threads and tasks, e.g. those of the parent process."""
+        self._lock = threading.Lock()
+        self._queue: Optional[queue.Queue] = None
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.inlined = 0
+        self.dequeued = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.total_run_time = 0.0
+
+    @property
+    def policy(self) -> str:
+        """Get the policy for tasks submitted while the queue is full."""
+        policy = self._policy or settings.WORKER_QUEUE_POLICY
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown worker queue policy {policy}.")
+        return policy
+
+    def _start(self) -> queue.Queue:
+        """Start the threads of the pool in this process, if needed."""
+        with self._lock:
+            if self._queue is None:
+                self._queue = queue.Queue(
+                    maxsize=self._max_queue_size or settings.WORKER_QUEUE_SIZE
+                )
+                self._threads = [
+                    threading.Thread(
+                        target=self._work,
+                        args=(self._queue,),
+                        name=f"{self.name}-worker-{index}",
+                        daemon=True,
+                    )
+                    for index in range(self._size or settings.WORKER_POOL_SIZE)
+                ]
+                for thread in self._threads:
+                    thread.start()
+            return self._queue
+
+    def _run(self, func: Callable, args: tuple, kwargs: dict) -> None:
+        """Run a task, reporting its exception instead of raising it."""
+        start = time.monotonic()
         try:
             func(*args, **kwargs)
         except:  # noqa: E722
-            import traceback
+            with self._lock:
+                self.failed += 1
+            try:
+                _report_exception()
+            except Exception:
+                # Slack being down must not take the thread down with it
+                log.exception(f"{self.name} worker could not report an exception.")
+        finally:
+            run_time = time.monotonic() - start
+            with self._lock:
+                self.completed += 1
+                self.total_run_time += run_time
+            log.debug(f"{self.name} worker ran {func.__name__} in {run_time:.3f}s.")
 
-            # prevent circular dependency
-            from api.slack import client
+    def _work(self, tasks: queue.Queue) -> None:
+        """Run the tasks of the queue until told to stop."""
+        while True:
+            task = tasks.get()
+            try:
+                if task is _STOP:
+                    return
+                func, args, kwargs, enqueue_time = task
+                wait_time = time.monotonic() - enqueue_time
+                with self._lock:
+                    self.dequeued += 1
+                    self.total_wait_time += wait_time
+                    self.max_wait_time = max(self.max_wait_time, wait_time)
+                self._run(func, args, kwargs)
+            finally:
+                # Every thread has its own database connections, don't leave
+                # them open between the tasks
+                connections.close_all()
+                tasks.task_done()  # so we can join at exit
 
-            details = traceback.format_exc()
-            message = f"Background worker exception: ```{details}```"
-            if settings.ENABLE_SLACK:
-                client.chat_postMessage(
-                    channel=settings.SLACK_DEFAULT_CHANNEL, text=message,
-                )
-            log.error(message)
-        finally:
-            _queue.task_done()  # so we can join at exit
+    def submit(self, func: Callable, *args: Any, **kwargs: Any) -> None:
+        """Run the function in the background.
+
+        If the queue is full, the policy of the pool decides whether to wait
+        for room, drop the task or run it in the calling thread.
+        """
+        tasks = self._start()
+        with self._lock:
+            self.submitted += 1
+            closed = self._closed
+
+        if closed:
+            # The pool is shutting down, nobody would pick the task up
+            with self._lock:
+                self.inlined += 1
+            self._run(func, args, kwargs)
+            return
+
+        task = (func, args, kwargs, time.monotonic())
+        policy = self.policy
+        if policy == BLOCK:
+            tasks.put(task)
+            return
+        try:
+            tasks.put_nowait(task)
+        except queue.Full:
+            if policy == DROP:
+                with self._lock:
+                    self.dropped += 1
+                log.warning(f"Worker queue is full, dropped {func.__name__}.")
+            else:
+                with self._lock:
+                    self.inlined += 1
+                self._run(func, args, kwargs)
+
+    def stats(self) -> Dict:
+        """Get the counters of the pool in the current process."""
+        with self._lock:
+            return {
+                "threads": len(self._threads),
+                "queue_depth": self._queue.qsize() if self._queue else 0,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "inlined": self.inlined,
+                "average_wait_time": (
+                    self.total_wait_time / self.dequeued if self.dequeued else 0.0
+                ),
+                "max_wait_time": self.max_wait_time,
+                "average_run_time": (
+                    self.total_run_time / self.completed if self.completed else 0.0
+                ),
+            }
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """Run the queued tasks and stop the threads.
+
+        Tasks submitted afterwards are run in the calling thread.
+
+        :param timeout: The number of seconds to wait for the queue to drain.
+        :return: Whether all threads have stopped in time.
+        """
+        with self._lock:
+            if self._queue is None or self._closed:
+                return True
+            self._closed = True
+            tasks, threads = self._queue, self._threads
+
+        if timeout is None:
+            timeout = settings.WORKER_SHUTDOWN_TIMEOUT
+        deadline = time.monotonic() + timeout
+        for _ in threads:
+            # Queued after the remaining tasks, so those are run first
+            try:
+                tasks.put(_STOP, timeout=max(deadline - time.monotonic(), 0))
+            except queue.Full:
+                break
+        for thread in threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+
+        stopped = not any(thread.is_alive() for thread in threads)
+        if not stopped:
+            log.warning(
+                f"Worker pool did not drain in {timeout} seconds, "
+                f"{tasks.qsize()} task(s) are lost."
+            )
+        return stopped
+
+
+pool = WorkerPool()
+
+
+def shutdown_pools() -> None:
+    """Run the queued tasks of all pools and stop their threads."""
+    for worker_pool in list(_pools):
+        worker_pool.shutdown()
+
+
+def _reset_pools() -> None:
+    """Forget the threads and tasks of all pools in a forked child."""
+    for worker_pool in list(_pools):
+        worker_pool._reset()
 
 
 def send_to_worker(func: Callable) -> Callable:
     """
-    Pass decorated function to background thread.
+    Pass decorated function to the background worker pool.
 
     Note that any function passed to it should not expect to return any data.
     If communication is needed outside the function, then it should write to
@@ -52,19 +283,15 @@ def send_to_worker(func: Callable) -> Callable:
             del kwargs["worker_test_mode"]
             return func(*args, **kwargs)
 
-        _queue.put((func, args, kwargs))
+        pool.submit(func, *args, **kwargs)
 
     return decorator
 
 
-_queue = queue.Queue()
-_thread = threading.Thread(target=_worker)
-_thread.daemon = True
-_thread.start()
-
-
 def _cleanup() -> None:
-    _queue.join()  # so we don't exit too soon
+    shutdown_pools()  # so we don't exit too soon
 
 
 atexit.register(_cleanup)
+# The threads of the parent are not copied into a forked child
+os.register_at_fork(after_in_child=_reset_pools)